@@ -6,36 +6,88 @@
 # Redistribution and use in source and binary forms, with or without
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
-
-# NIX object classes
-from .file import File
-from .block import Block
-from .group import Group
-from .data_array import DataArray
-from .tag import Tag
-from .multi_tag import MultiTag
-from .source import Source
-from .section import Section, S
-from .property import Property, OdmlType
-from .feature import Feature
-from .data_frame import DataFrame
-from .dimensions import SampledDimension, RangeDimension, SetDimension, IndexMode
-from . import validator
-
-# enums
-from .file import FileMode
-from .data_array import DataSliceMode
-from .datatype import DataType
-from .dimension_type import DimensionType
-from .link_type import LinkType
-from .compression import Compression
-from .tag import SliceMode
+import importlib
+from typing import TYPE_CHECKING
 
 # version
 from .info import VERSION
 
-# cmd
-from .cmd.upgrade import file_upgrade
+if TYPE_CHECKING:
+    # the lazily imported names of __all__, for static analysis
+    from .file import File, FileMode
+    from .block import Block
+    from .group import Group
+    from .data_array import DataArray, DataSliceMode
+    from .data_frame import DataFrame
+    from .tag import Tag, SliceMode
+    from .multi_tag import MultiTag
+    from .source import Source
+    from .section import Section, S
+    from .property import Property, OdmlType
+    from .feature import Feature
+    from .dimensions import (SampledDimension, RangeDimension, SetDimension,
+                             IndexMode)
+    from .datatype import DataType
+    from .dimension_type import DimensionType
+    from .link_type import LinkType
+    from .compression import Compression
+
+# The NIX object classes, enums and submodules are imported on first access
+# (PEP 562) so that importing the package (e.g., for the command line tools)
+# does not load h5py and all entity modules.
+_LAZY_ATTRS = {
+    # NIX object classes
+    "File": ".file",
+    "Block": ".block",
+    "Group": ".group",
+    "DataArray": ".data_array",
+    "Tag": ".tag",
+    "MultiTag": ".multi_tag",
+    "Source": ".source",
+    "Section": ".section",
+    "S": ".section",
+    "Property": ".property",
+    "OdmlType": ".property",
+    "Feature": ".feature",
+    "DataFrame": ".data_frame",
+    "SampledDimension": ".dimensions",
+    "RangeDimension": ".dimensions",
+    "SetDimension": ".dimensions",
+    "IndexMode": ".dimensions",
+    # enums
+    "FileMode": ".file",
+    "DataSliceMode": ".data_array",
+    "DataType": ".datatype",
+    "DimensionType": ".dimension_type",
+    "LinkType": ".link_type",
+    "Compression": ".compression",
+    "SliceMode": ".tag",
+    # cmd
+    "file_upgrade": ".cmd.upgrade",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+    elif not name.startswith("_"):
+        # submodules, e.g. nixio.validator or nixio.util
+        try:
+            value = importlib.import_module("." + name, __name__)
+        except ModuleNotFoundError as exc:
+            if exc.name != "{}.{}".format(__name__, name):
+                raise
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name)) from None
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | {"validator"})
+
 
 __all__ = ("File", "Block", "Group", "DataArray", "DataFrame", "Tag",
            "MultiTag", "Source", "Section", "S", "Feature", "Property",
@@ -192,13 +192,23 @@ class Block(Entity):
 
     def create_data_array(self, name="", array_type="", dtype=None, shape=None,
                           data=None, compression=Compression.Auto,
-                          copy_from=None, keep_copy_id=True, label=None, unit=None):
+                          copy_from=None, keep_copy_id=True, label=None, unit=None,
+                          quantize=None):
         """
         Create/copy a new data array for this block. Either ``shape``
         or ``data`` must be given. If both are given their shape must agree.
         If ``dtype`` is not specified it will default to 64-bit floating
         points.
 
+        With ``quantize`` floating point ``data`` is stored as integers:
+        the values are scaled to the integer type and the scaling is stored
+        as the calibration (``polynom_coefficients`` and
+        ``expansion_origin``) of the DataArray, so that reading returns the
+        calibrated values. The maximum absolute error introduced by the
+        quantization is available from
+        :attr:`~nixio.DataArray.quantization_error`. Only the initial data
+        is quantized, later writes store the given values as they are.
+
         :param name: The name of the data array to create/copy.
         :type name: str
         :param array_type: The type of the data array.
@@ -219,6 +229,11 @@ class Block(Entity):
         :type label: str
         :param unit: The unit of the stored data. Defaults to None.
         :type unit: str 
+        :param quantize: Integer type and resolution (value of one integer
+                         step) used to store ``data``. If the resolution is
+                         None, it is chosen such that the data spans the full
+                         integer range.
+        :type quantize: tuple of (:class:`numpy.dtype`, float or None)
 
         :returns: The newly created data array.
         :rtype: :class:`~nixio.DataArray`
@@ -230,6 +245,16 @@ class Block(Entity):
             objid = self._copy_objects(copy_from, "data_arrays", keep_copy_id, name)
             return self.data_arrays[objid]
 
+        calibration = None
+        if quantize is not None:
+            if data is None:
+                raise ValueError("Quantization requires data")
+            qdtype, resolution = quantize
+            if dtype is not None and np.dtype(dtype) != np.dtype(qdtype):
+                raise ValueError("dtype must match the quantization type")
+            data, offset, resolution, qerror = util.quantize(data, qdtype,
+                                                             resolution)
+            calibration = (offset, resolution)
         if data is None:
             if shape is None:
                 raise ValueError("Either shape and or data must not be None")
@@ -250,10 +275,17 @@ class Block(Entity):
             raise exceptions.DuplicateName("create_data_array")
         if compression == Compression.Auto:
             compression = self._compr
+        # arrays with an empty dimension are meant to grow: keep them chunked
+        contiguous = self.file.contiguous and all(shape)
         da = DataArray.create_new(self.file, self, data_arrays, name, array_type,
-                                  dtype, shape, compression)
+                                  dtype, shape, compression, contiguous)
         if data is not None:
             da.write_direct(data)
+        if calibration is not None:
+            da.polynom_coefficients = calibration
+            da.expansion_origin = 0.0
+            da._h5group.get_dataset("data").set_attr("quantization_error",
+                                                     qerror)
         da.unit = unit
         da.label = label
         return da
@@ -367,7 +399,8 @@ class Block(Entity):
                 df.write_direct(arr)
         return df
 
-    def find_sources(self, filtr=lambda _: True, limit=None):
+    def find_sources(self, filtr=lambda _: True, limit=None, name=None,
+                     type_=None, attrs=None):
         """
         Get all sources in this block recursively.
 
@@ -381,13 +414,21 @@ class Block(Entity):
         :type filtr:  function
         :param limit: The maximum depth of traversal
         :type limit:  int
+        :param name: Condition on the name: a value, a compiled regular
+                     expression that is searched for, or a function of
+                     the name.
+        :param type_: Condition on the type, see name.
+        :param attrs: Conditions on further HDF5 attributes (e.g.,
+                      definition), see name.
+        :type attrs: dict
 
         :returns: A list containing the matching sources.
         :rtype: list of nixio.Source
         """
         if limit is None:
             limit = maxsize
-        return finders._find_sources(self, filtr, limit)
+        preds = finders._predicates(name, type_, attrs)
+        return finders._find_sources(self, filtr, limit, preds)
 
     def pprint(self, indent=2, max_length=120, extra=True, start_depth=0):
         """
@@ -488,6 +529,8 @@ class Block(Entity):
                             "provide a new name when copying destination "
                             "is the same as the source parent")
         obj_copy = obj._parent._h5group.copy(source=src, dest=self._h5group, name=name, cls=clsname, keep_id=keep_id)
+        # the copy keeps its metadata and source links
+        self.file._refindex = None
         return obj_copy.attrs["entity_id"]
 
     @property
@@ -581,8 +624,10 @@ class Block(Entity):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
         self._h5group.create_link(sect, "metadata")
+        self.file._update_reference(self, "metadata", sect.id)
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
             self._h5group.delete("metadata")
+            self.file._update_reference(self, "metadata", None)
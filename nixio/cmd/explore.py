@@ -21,7 +21,14 @@ import nixio as nix
 import numpy as np
 import glob
 import datetime as dt
+import io
+import json
+import sqlite3
 import sys
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+from ..util.metadata_index import MetadataIndex
 
 try:
     import nixworks as nw
@@ -62,6 +69,13 @@ DUMP_OUTFILE_HELP = """
 Name of a file into which the data should be dumped. If not given data will be dumped to stdout.
 """
 
+DUMP_FORMAT_HELP = """
+Output format of the dump. "text" (default) writes the data together with the dimension information, "npy" and "raw"
+write the bare data in the numpy file format or as raw bytes (C order, native byte order) to the outfile, which is
+required in these modes. When several DataArrays are dumped in a binary format, the id of each but the first one is
+appended to the name of the outfile.
+"""
+
 PLOT_PARSER_HELP = """
 Create basic plots of the stored data. This command is only available if nixworks is installed.
 """
@@ -116,6 +130,117 @@ def assemble_files(arguments):
     return all_files
 
 
+class ResultCache:
+    """
+    Cache of the output of explore commands, stored in an SQLite database.
+
+    Results are keyed by the path of the scanned file and the query (command
+    and options) and are only valid as long as the modification time and
+    size of the file did not change.
+    """
+
+    def __init__(self, path):
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS results (path TEXT, query TEXT, mtime INTEGER, "
+                         "size INTEGER, output TEXT, PRIMARY KEY (path, query))")
+
+    @staticmethod
+    def default_path():
+        cachedir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(cachedir, "nixio", "explore.sqlite")
+
+    @staticmethod
+    def fingerprint(filename):
+        stat = os.stat(filename)
+        return os.path.abspath(filename), stat.st_mtime_ns, stat.st_size
+
+    def get(self, fingerprint, query):
+        path, mtime, size = fingerprint
+        row = self._db.execute("SELECT output FROM results WHERE path = ? AND query = ? AND mtime = ? AND size = ?",
+                               (path, query, mtime, size)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, fingerprint, query, output):
+        path, mtime, size = fingerprint
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                             (path, query, mtime, size, output))
+
+    def close(self):
+        self._db.close()
+
+
+def query_key(func, arguments):
+    """
+    Returns the key of the explore command and options in the result cache.
+    """
+    options = {key: value for key, value in vars(arguments).items()
+               if key not in ("file", "jobs", "cache", "func")}
+    options["command"] = func.__name__
+    options["nixio"] = nix.__version__
+    return json.dumps(options, sort_keys=True, default=str)
+
+
+def scan_file(func, filename, arguments):
+    """
+    Runs the display function for a single file and returns its output.
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        func(filename, arguments)
+    return output.getvalue()
+
+
+def scan_files(func, arguments):
+    """
+    Runs the display function for all files selected by the arguments,
+    optionally in a pool of arguments.jobs processes and using the result
+    cache. The output is printed in the order of the files as soon as it is
+    available.
+    """
+    files = assemble_files(arguments)
+    jobs = getattr(arguments, "jobs", 1) or 1
+    cache_path = getattr(arguments, "cache", None)
+    if jobs < 2 and cache_path is None:
+        for nf in files:
+            func(nf, arguments)
+        return
+
+    cache = ResultCache(cache_path) if cache_path is not None else None
+    query = query_key(func, arguments)
+    fingerprints = dict()
+    cached = dict()
+    if cache is not None:
+        for nf in files:
+            fingerprints[nf] = ResultCache.fingerprint(nf)
+            output = cache.get(fingerprints[nf], query)
+            if output is not None:
+                cached[nf] = output
+    todo = [nf for nf in files if nf not in cached]
+    executor = ProcessPoolExecutor(jobs) if jobs > 1 and len(todo) > 1 else None
+    try:
+        if executor is not None:
+            results = executor.map(scan_file, [func] * len(todo), todo, [arguments] * len(todo))
+        else:
+            results = (scan_file(func, nf, arguments) for nf in todo)
+        for nf in files:
+            output = cached.get(nf)
+            if output is None:
+                output = next(results)
+                if cache is not None:
+                    cache.put(fingerprints[nf], query, output)
+            sys.stdout.write(output)
+            sys.stdout.flush()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if cache is not None:
+            cache.close()
+
+
 def disp_file_structure(nix_file, verbosity):
     def block_content(nix_file, verbosity):
         def array_content(block, verbosity):
@@ -267,7 +392,7 @@ def disp_file_structure(nix_file, verbosity):
 def disp_file_info(filename, arguments):
     nf = open_nix_file(filename)
     if nf is None:
-        pass
+        return
 
     print(" File: %s" % (filename.split(os.sep)[-1]))
     print("  format: %s \n  version: %s " % (nf.format, nf.version))
@@ -280,45 +405,42 @@ def disp_file_info(filename, arguments):
     nf.close()
 
 
-def find_section(nix_file, pattern, case_sensitive=False, full_match=False):
-    def type_lambda(typ, full_match):
-        if full_match:
-            return lambda s: typ.lower() == s.type.lower()
-        else:
-            return lambda s: typ.lower() in s.type.lower()
-
-    def name_lambda(name, full_match):
-        if full_match:
-            return lambda s: name.lower() == s.name.lower()
-        else:
-            return lambda s: name.lower() in s.name.lower()
-
-    def name_lambda_cs(name, full_match):
-        if full_match:
-            return lambda s: name == s.name
-        else:
-            return lambda s: name in s.name
-
-    secs = nix_file.find_sections(type_lambda(pattern, full_match))
+def find_section(nix_file, pattern, case_sensitive=False, full_match=False,
+                 index_path=None):
+    # section types are always matched case insensitive
+    secs = nix_file.search_metadata(type_=pattern, full_match=full_match,
+                                    index_path=index_path)
     if len(secs) == 0:
-        secs = nix_file.find_sections(name_lambda_cs(pattern, full_match) if case_sensitive
-                                      else name_lambda(pattern, full_match))
+        secs = nix_file.search_metadata(name=pattern,
+                                        case_sensitive=case_sensitive,
+                                        full_match=full_match,
+                                        index_path=index_path)
     return secs
 
 
-def find_props(nix_file, pattern, case_sensitive=False, full_match=False):
-    name = pattern if case_sensitive else pattern.lower()
+def find_props(nix_file, pattern, case_sensitive=False, full_match=False,
+               index_path=None):
     props = {}
-    for sec in nix_file.find_sections(lambda s: True):
-        for prop in sec.props:
-            pname = prop.name if case_sensitive else prop.name.lower()
-            if name == pname if full_match else name in pname:
-                if sec not in props.keys():
-                    props[sec] = []
-                props[sec].append(prop)
+    for prop in nix_file.search_metadata(name=pattern, kind="properties",
+                                         case_sensitive=case_sensitive,
+                                         full_match=full_match,
+                                         index_path=index_path):
+        props.setdefault(prop._parent, []).append(prop)
     return props
 
 
+def metadata_index_path(filename, arguments):
+    if not arguments.index:
+        return None
+    index_path = MetadataIndex.sidecar_path(filename)
+    try:
+        sqlite3.connect(index_path).close()
+    except sqlite3.Error as exc:
+        print("WARNING: can not store the search index in '{}': {}".format(index_path, exc))
+        return None
+    return index_path
+
+
 def disp_metadata(filename, arguments):
     case_sensitive = arguments.case_sensitive
     full_match = arguments.full_match
@@ -326,6 +448,7 @@ def disp_metadata(filename, arguments):
     if nf is None:
         return
     print("%s: " % (filename.split(os.sep)[-1]), end="\n")
+    index_path = metadata_index_path(filename, arguments)
     if arguments.pattern is None or len(arguments.pattern) == 0:
         for sec in nf.sections:
             sec.pprint(max_depth=arguments.depth)
@@ -333,7 +456,7 @@ def disp_metadata(filename, arguments):
         for patt in arguments.pattern:
             if "/" in patt:
                 parts = patt.split("/")
-                sections = find_section(nf, parts[0], case_sensitive)
+                sections = find_section(nf, parts[0], case_sensitive, index_path=index_path)
                 for sec in sections:
                     for prop in sec.props:
                         part = parts[1] if case_sensitive else parts[1].lower()
@@ -343,9 +466,9 @@ def disp_metadata(filename, arguments):
                                   (sec.name, sec.type, sec.id), end="")
                             prop.pprint()
             else:
-                sections = find_section(nf, patt, case_sensitive)
+                sections = find_section(nf, patt, case_sensitive, index_path=index_path)
                 if len(sections) == 0:
-                    props = find_props(nf, patt, case_sensitive)
+                    props = find_props(nf, patt, case_sensitive, index_path=index_path)
                     for sec in props.keys():
                         for prop in props[sec]:
                             print("[section: %s, type: %s, id: %s] >> " %
@@ -360,9 +483,7 @@ def disp_metadata(filename, arguments):
 
 
 def mdata_worker(arguments):
-    files = assemble_files(arguments)
-    for nf in files:
-        disp_metadata(nf, arguments)
+    scan_files(disp_metadata, arguments)
 
 
 def find_data_entity(nix_file, arguments):
@@ -372,8 +493,8 @@ def find_data_entity(nix_file, arguments):
     for block in nix_file.blocks:
         for cls in classes:
             for entity in getattr(block, cls):
-                ename = entity.name() if arguments.case_sensitive else entity.name.lower()
-                etype = entity.type() if arguments.case_sensitive else entity.type.lower()
+                ename = entity.name if arguments.case_sensitive else entity.name.lower()
+                etype = entity.type if arguments.case_sensitive else entity.type.lower()
                 if arguments.full_match:
                     if ename == name_or_type or etype == name_or_type:
                         entities.append(entity)
@@ -383,6 +504,12 @@ def find_data_entity(nix_file, arguments):
     return entities
 
 
+# number of values read from a DataArray and formatted at once when dumping
+DUMP_CHUNK_SIZE = 2 ** 20
+# buffer size of the text file the data are dumped to
+DUMP_BUFFER_SIZE = 2 ** 22
+
+
 def get_ticks(dimension, extent):
     ticks = None
     dim_type = dimension.dimension_type
@@ -401,6 +528,22 @@ def get_ticks(dimension, extent):
     return ticks
 
 
+def tick_reader(dimension, extent):
+    """
+    Returns a function that returns the ticks of the dimension between a start
+    and a stop index. Ticks of SampledDimensions are calculated for the
+    requested range only, all other ticks are read once.
+    """
+    if dimension.dimension_type == nix.DimensionType.Sample:
+        offset = dimension.offset or 0.0
+        interval = dimension.sampling_interval
+        return lambda start, stop: np.arange(start, stop) * interval + offset
+    ticks = get_ticks(dimension, extent)
+    if ticks is None or len(ticks) != extent:
+        return None
+    return lambda start, stop: ticks[start:stop]
+
+
 def get_dim_label_and_unit(dimension):
     dim_label = getattr(dimension, "label") if hasattr(dimension, "label") \
         and getattr(dimension, "label") else ""
@@ -409,78 +552,125 @@ def get_dim_label_and_unit(dimension):
     return dim_label, dim_unit
 
 
+def value_format(values, fmt):
+    """
+    Returns the format for the values: fmt for floating point numbers,
+    plain string conversion for everything else.
+    """
+    return fmt if np.asarray(values).dtype.kind == "f" else "%s"
+
+
+def format_rows(row_format, *columns):
+    """
+    Formats a block of rows at once, like np.savetxt does: the row format is
+    repeated once per row and applied to all values of the block.
+
+    :param row_format: The format of a single row including the line break.
+    :type row_format: str
+    :param columns: The columns of the block; 1D arrays are single columns,
+                    the columns of 2D arrays are added as they are.
+
+    :returns: The formatted rows.
+    :rtype: str
+    """
+    columns = [np.asarray(col).reshape(len(col), -1) for col in columns]
+    nrows = len(columns[0])
+    if len(set(col.dtype for col in columns)) == 1:
+        table = np.hstack(columns)
+    else:
+        table = np.empty((nrows, sum(col.shape[1] for col in columns)), dtype=object)
+        pos = 0
+        for col in columns:
+            table[:, pos:pos + col.shape[1]] = col
+            pos += col.shape[1]
+    return (row_format * nrows) % tuple(table.ravel().tolist())
+
+
+def chunk_ranges(total, chunk_rows):
+    for start in range(0, total, chunk_rows):
+        yield start, min(start + chunk_rows, total)
+
+
+def rows_per_chunk(shape):
+    row_size = int(np.prod(shape[1:])) if len(shape) > 1 else 1
+    return max(1, DUMP_CHUNK_SIZE // max(row_size, 1))
+
+
 def dump_oned(data, dimension, label, unit, outfile, fmt="%.6f", end="\n\n",
               forgiving=True, show_progress=False):
+    """
+    Dumps 1D data, read in chunks, together with the dimension ticks. The data
+    can be a DataArray or a numpy array.
+    """
     if len(data.shape) > 1:
         raise ValueError("data dimensionality is too deep, "
                          "expected 1D data, got %iD" % len(data.shape))
-    ticks = get_ticks(dimension, data.shape[0])
-    if len(ticks) != len(data):
+    total = data.shape[0]
+    ticks = tick_reader(dimension, total)
+    if ticks is None:
         if not forgiving:
             print("Cannot dump data, could not read the dimension values on dimension "
                   "%i (type: %s)!" % (dimension.index, dimension.dimension_type))
             return
         else:
-            ticks = np.arange(len(data))
+            ticks = np.arange
     dim_label, dim_unit = get_dim_label_and_unit(dimension)
-    if isinstance(ticks[-1], str):
-        max_tick_len = max([len(ticks[-1]), len(dim_label)])
-    else:
-        max_tick_len = max([len(fmt % ticks[-1]), len(dim_label)])
+    last_tick = ticks(total - 1, total)[0] if total else ""
+    max_tick_len = max([len(value_format([last_tick], fmt) % last_tick), len(dim_label)])
 
-    numeric_dim_ticks = isinstance(ticks[0], (int, float))
-    numeric_data = isinstance(data[0], (int, float))
-    data_conv_func = (lambda x: fmt % x) if numeric_data else str
-    dim_ticks_conv_func = (lambda x: fmt % x) if numeric_dim_ticks else str
-
-    if dimension.dimension_type == nix.DimensionType.Range and dimension.has_link:
+    linked = dimension.dimension_type == nix.DimensionType.Range and dimension.has_link
+    if linked:
         print("# %s" % dim_label, file=outfile)
         print("# %s" % dim_unit, file=outfile)
-        for idx, tick in enumerate(ticks):
-            print(data_conv_func(tick), file=outfile)
-            if show_progress and idx % 1000 == 0:
-                progress(idx, data.shape[0], status='')
     else:
         padding = " " * (max_tick_len - len(dim_label) if dim_label else 0)
         print("# %s%s%s" % (dim_label, padding, label), file=outfile)
         padding = " " * (max_tick_len - len(dim_unit) if dim_unit else 0)
         print("# %s%s%s" % (dim_unit, padding, unit), file=outfile)
 
-        for idx in range(data.shape[0]):
-            if show_progress and idx % 1000 == 0:
-                progress(idx, data.shape[0], status='')
-            print(dim_ticks_conv_func(ticks[idx]) + "   " + data_conv_func(data[idx]),
-                  file=outfile)
+    row_format = None
+    for start, stop in chunk_ranges(total, rows_per_chunk(data.shape)):
+        values = np.asarray(data[start:stop])
+        if linked:
+            # the ticks are the data
+            row_format = row_format or value_format(values, fmt) + "\n"
+            outfile.write(format_rows(row_format, values))
+        else:
+            tick_values = ticks(start, stop)
+            row_format = row_format or "{}   {}\n".format(value_format(tick_values, fmt),
+                                                         value_format(values, fmt))
+            outfile.write(format_rows(row_format, tick_values, values))
+        if show_progress:
+            progress(stop, total, status='')
     if show_progress:
-        progress(data.shape[0], data.shape[0], "Done")
+        progress(total, total, "Done")
     print(end, file=outfile)
 
 
 def dump_twod(data, dimensions, label, unit, outfile, fmt="%.6f", end="\n\n",
-              show_progress=False):
-    if len(data.shape) != 2 or len(dimensions) != 2:
+              show_progress=False, index=()):
+    """
+    Dumps 2D data, read in blocks of rows, together with the dimension ticks.
+    The data can be a DataArray or a numpy array; with index, the 2D plane
+    data[:, :, index] of higher dimensional data is dumped.
+    """
+    shape = data.shape[:len(data.shape) - len(index)]
+    if len(shape) != 2 or len(dimensions) != 2:
         raise ValueError("data must be 2 dimensional and exactly two dimensions must be passed "
                          "in order to dump the content properly.")
-    first_dim_ticks = get_ticks(dimensions[0], data.shape[0])
-    second_dim_ticks = get_ticks(dimensions[1], data.shape[1])
-    if len(first_dim_ticks) != data.shape[0] or len(second_dim_ticks) != data.shape[1]:
+    first_dim_ticks = tick_reader(dimensions[0], shape[0])
+    second_dim_ticks = tick_reader(dimensions[1], shape[1])
+    if first_dim_ticks is None or second_dim_ticks is None:
         raise ValueError("dimension ticks for first or second dimension "
                          "do not match the data shape.")
+    second_dim_ticks = second_dim_ticks(0, shape[1])
 
     first_dim_label, first_dim_unit = get_dim_label_and_unit(dimensions[0])
     second_dim_label, second_dim_unit = get_dim_label_and_unit(dimensions[1])
 
-    numeric_1st_dim_ticks = isinstance(first_dim_ticks[0], (int, float))
-    numeric_2nd_dim_ticks = isinstance(second_dim_ticks[0], (int, float))
-    numeric_data = isinstance(data[0, 0], (int, float))
-    data_conv_func = (lambda x: fmt % x) if numeric_data else str
-    dim_ticks_conv_func1 = (lambda x: fmt %
-                            x) if numeric_1st_dim_ticks else str
-    dim_ticks_conv_func2 = (lambda x: fmt %
-                            x) if numeric_2nd_dim_ticks else str
-
+    last_tick = first_dim_ticks(shape[0] - 1, shape[0])
     max_tick_len = max(
-        [len(dim_ticks_conv_func1(first_dim_ticks[-1])), len(first_dim_label)])
+        [len(value_format(last_tick, fmt) % last_tick[0]), len(first_dim_label)])
     print("# data label: %s" % label, file=outfile)
     print("# data unit: %s\n" % unit, file=outfile)
     padding = " " * (max_tick_len - (len(first_dim_label)
@@ -490,16 +680,21 @@ def dump_twod(data, dimensions, label, unit, outfile, fmt="%.6f", end="\n\n",
                      if first_dim_unit else 0))
     print("# %s%s%s" % (first_dim_unit, padding, second_dim_unit), file=outfile)
     # first line contains 2nd dim ticks
-    print(" " * max_tick_len + "   " + (" " * max_tick_len + "  ").join(map(dim_ticks_conv_func2, second_dim_ticks)),
-          file=outfile)
+    header_format = (" " * max_tick_len + "  ").join([value_format(second_dim_ticks, fmt)] * shape[1])
+    print(" " * max_tick_len + "   " + header_format % tuple(second_dim_ticks.tolist()), file=outfile)
     # now dump the rest
-    for i in range(len(first_dim_ticks)):
-        print(dim_ticks_conv_func1(first_dim_ticks[i]) + "    " + "   ".join(map(data_conv_func, data[i, :])),
-              file=outfile)
-        if show_progress and i % 500 == 0:
-            progress(i, data.shape[0], status='')
+    row_format = None
+    for start, stop in chunk_ranges(shape[0], rows_per_chunk(shape)):
+        values = np.asarray(data[(slice(start, stop), slice(None)) + tuple(index)])
+        tick_values = first_dim_ticks(start, stop)
+        if row_format is None:
+            row_format = (value_format(tick_values, fmt) + "    " +
+                          "   ".join([value_format(values, fmt)] * shape[1]) + "\n")
+        outfile.write(format_rows(row_format, tick_values, values))
+        if show_progress:
+            progress(stop, shape[0], status='')
     if show_progress:
-        progress(data.shape[0], data.shape[0], "Done")
+        progress(shape[0], shape[0], "Done")
     print(end, file=outfile)
 
 
@@ -514,12 +709,39 @@ def dump_threed(data, dimensions, label, unit, outfile, fmt="%.6f", end="\n\n",
     for i in range(data.shape[2]):
         print("# data[:, :, %i]: %s" % (i, dim_label + "%s%s" % (ticks[i], dim_unit)
                                         if dim_unit else ""), file=outfile)
-        dump_twod(data[:, :, i], [dimensions[0], dimensions[1]], label, unit, outfile, fmt,
-                  end="\n", show_progress=show_progress)
+        dump_twod(data, [dimensions[0], dimensions[1]], label, unit, outfile, fmt,
+                  end="\n", show_progress=show_progress, index=(i,))
 
     print(end, file=outfile)
 
 
+def dump_binary(array, outfile, binary_format, show_progress=False):
+    """
+    Streams the data of a DataArray in chunks into a binary file, either in
+    the npy format or as raw bytes in C order.
+
+    :param array: The DataArray.
+    :type array: nixio.DataArray
+    :param outfile: The binary file object to write to.
+    :param binary_format: "npy" or "raw".
+    :type binary_format: str
+    """
+    shape = array.shape
+    # calibrated data are read as double, not in the stored data type
+    dtype = np.dtype(nix.DataType.Double if array._get_calibration() else array.dtype)
+    if binary_format == "npy":
+        header = {"descr": np.lib.format.dtype_to_descr(dtype),
+                  "fortran_order": False, "shape": shape}
+        np.lib.format.write_array_header_2_0(outfile, header)
+    total = shape[0] if shape else 0
+    for start, stop in chunk_ranges(total, rows_per_chunk(shape)):
+        outfile.write(array.read(np.s_[start:stop], dtype=dtype).tobytes())
+        if show_progress:
+            progress(stop, total, status='')
+    if show_progress:
+        progress(total, total, "Done")
+
+
 def dump_data_array(array, filename, outfile, show_progress=False):
     print("# File: %s\n# entity: %s\n# type: %s\n# id: %s" % (filename, array.name, array.type, array.id),
           file=outfile)
@@ -527,30 +749,56 @@ def dump_data_array(array, filename, outfile, show_progress=False):
                                                         str(dt.datetime.fromtimestamp(array.updated_at))),
           file=outfile)
     dims = len(array.shape)
-    data = array[:]
     if dims == 1:
-        dump_oned(data, array.dimensions[0], array.label, array.unit, outfile,
+        dump_oned(array, array.dimensions[0], array.label, array.unit, outfile,
                   show_progress=show_progress)
     elif dims == 2:
-        dump_twod(data, array.dimensions, array.label, array.unit, outfile,
+        dump_twod(array, array.dimensions, array.label, array.unit, outfile,
                   show_progress=show_progress)
     elif dims == 3:
-        dump_threed(data, array.dimensions, array.label, array.unit, outfile,
+        dump_threed(array, array.dimensions, array.label, array.unit, outfile,
                     show_progress=show_progress)
     else:
         print("Sorry, cannot dump data with more than 3 dimensions!")
 
 
-def data_dump(filename, arguments, outfile, show_progress=False):
+def binary_outfile_name(outfile, array, count):
+    """
+    Returns the name of the binary file for the count-th dumped DataArray: the
+    given outfile for the first one, the outfile with the id of the DataArray
+    appended to its name for all others.
+    """
+    if count == 0:
+        return outfile
+    base, ext = os.path.splitext(outfile)
+    return "{}_{}{}".format(base, array.id, ext)
+
+
+def data_dump(filename, arguments, outfile, show_progress=False, count=0):
+    """
+    Dumps all DataArrays of the file matching the pattern. In binary mode,
+    each DataArray is written to a separate file. Returns the number of
+    DataArrays dumped so far.
+    """
     nix_file = open_nix_file(filename)
     entities = find_data_entity(nix_file, arguments)
+    binary_format = getattr(arguments, "format", "text")
     for ent in entities:
         if isinstance(ent, nix.DataArray):
-            sys.stderr.write("Dumping %s to %s...\n" %
-                             (ent.name, arguments.outfile))
-            dump_data_array(ent, filename, outfile, show_progress)
+            if binary_format == "text":
+                sys.stderr.write("Dumping %s to %s...\n" %
+                                 (ent.name, arguments.outfile or "stdout"))
+                dump_data_array(ent, filename, outfile, show_progress)
+            else:
+                binname = binary_outfile_name(arguments.outfile, ent, count)
+                sys.stderr.write("Dumping %s (shape: %s, dtype: %s) to %s...\n" %
+                                 (ent.name, ent.shape, ent.dtype, binname))
+                with open(binname, "wb") as binfile:
+                    dump_binary(ent, binfile, binary_format, show_progress)
+            count += 1
             sys.stderr.write("\n")
     nix_file.close()
+    return count
 
 
 def data_plotter(filename, arguments):
@@ -592,14 +840,15 @@ def data_worker(arguments):
 
 
 def file_worker(arguments):
-    files = assemble_files(arguments)
-    for nf in files:
-        disp_file_info(nf, arguments)
+    scan_files(disp_file_info, arguments)
 
 
 def dump_worker(arguments):
     files = assemble_files(arguments)
-    func = data_dump
+    binary = arguments.format != "text"
+    if binary and not arguments.outfile:
+        print("... binary data dump needs an outfile.")
+        return
     if len(arguments.outfile) > 0:
         if os.path.exists(arguments.outfile):
             response = input(
@@ -607,14 +856,18 @@ def dump_worker(arguments):
             if response.lower() != "y":
                 print("... data dump aborted.")
                 return
-        out_file = open(arguments.outfile, 'w')
         to_file = True
     else:
-        out_file = sys.stdout
         to_file = False
     show_progress = to_file
-    for out_file in files:
-        func(out_file, arguments, out_file, show_progress)
+    if binary:
+        count = 0
+        for nf in files:
+            count = data_dump(nf, arguments, None, show_progress, count)
+        return
+    out_file = open(arguments.outfile, 'w', buffering=DUMP_BUFFER_SIZE) if to_file else sys.stdout
+    for nf in files:
+        data_dump(nf, arguments, out_file, show_progress)
     if to_file:
         out_file.close()
 
@@ -641,6 +894,14 @@ def add_default_args(parent_parser):
                                help="names and types must be full matches, by default a partial match is sufficient")
 
 
+def add_scan_args(parent_parser):
+    parent_parser.add_argument("-j", "--jobs", type=int, default=1,
+                               help="number of processes scanning files in parallel (default: %(default)s)")
+    parent_parser.add_argument("--cache", type=str, nargs="?", const=ResultCache.default_path(), default=None,
+                               help=("reuse the results of earlier runs for files that did not change since; the "
+                                     "results are stored in the given database (default: %(const)s)"))
+
+
 def create_metadata_parser(parent_parser):
     meta_parser = parent_parser.add_parser("metadata", help="Filter and display metadata",
                                            aliases=["mdata"],
@@ -649,8 +910,12 @@ def create_metadata_parser(parent_parser):
                              help=METADATA_PATTERN_HELP)
     meta_parser.add_argument("-d", "--depth", type=int, default=-1,
                              help="maximum depth of metadata tree output, default is %(default)s, full depth")
+    meta_parser.add_argument("-i", "--index", action="store_true",
+                             help=("store the metadata search index next to each file (FILE.nixidx) and reuse it "
+                                   "for later searches as long as the file does not change"))
     add_default_args(meta_parser)
     add_default_file_args(meta_parser)
+    add_scan_args(meta_parser)
     meta_parser.set_defaults(func=mdata_worker)
     # add value search?
     # add option to specify directly if one looks for a property which would increase performance
@@ -675,6 +940,8 @@ def create_dump_parser(parent_parser):
         "-p", "--pattern", default="", type=str, help=DUMP_PATTERN_HELP)
     dump_parser.add_argument(
         "-o", "--outfile", default="", type=str, help=DUMP_OUTFILE_HELP)
+    dump_parser.add_argument(
+        "-f", "--format", default="text", choices=["text", "npy", "raw"], help=DUMP_FORMAT_HELP)
     add_default_args(dump_parser)
     add_default_file_args(dump_parser)
     dump_parser.set_defaults(func=dump_worker)
@@ -699,6 +966,7 @@ def create_file_parser(parent_parser):
     file_parser.add_argument("-v", "--verbosity", action="count",
                              help="increase output verbosity, use -v, -vv, -vvv for more verbose output")
     add_default_file_args(file_parser)
+    add_scan_args(file_parser)
     file_parser.set_defaults(func=file_worker)
 
 
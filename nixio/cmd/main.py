@@ -9,7 +9,27 @@ Command line interface for nixio tools.
 """
 import sys
 import argparse
-from . import explore, validate, upgrade
+import importlib
+
+# sub command name -> (module, help); the module of a sub command is only
+# imported when the command is run or its help is requested
+SUBCOMMANDS = {
+    "explore": ("nixio.cmd.explore",
+                "Print file information, data, or metadata, with support for filtering and plotting."),
+    "validate": ("nixio.cmd.validate",
+                 "Check NIX files for missing or inconsistent objects and annotations."),
+    "upgrade": ("nixio.cmd.upgrade", "Update older files to the newest file format."),
+}
+
+
+def selected_subcommand(argv):
+    """
+    Returns the name of the sub command in the command line arguments or None.
+    """
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg if arg in SUBCOMMANDS else None
+    return None
 
 
 def main():
@@ -24,27 +44,22 @@ def main():
         subcmds = parser.add_subparsers(title="commands", required=True,
                                         dest="cmd")
 
-    # nixio explore
-    explore_cmd = subcmds.add_parser("explore", help=explore.__doc__)
-    explore.create_subcmd_parsers(explore_cmd)
-
-    # nixio validate
-    validate_cmd = subcmds.add_parser("validate", help=validate.__doc__)
-    validate.create_subcmd_parser(validate_cmd)
-
-    # nixio upgrade
-    upgrade_cmd = subcmds.add_parser("upgrade", help=upgrade.__doc__)
-    upgrade.create_subcmd_parser(upgrade_cmd)
-
-    cmdmap = {
-        "explore": explore.main,
-        "validate": validate.main,
-        "upgrade": upgrade.main
-    }
+    selected = selected_subcommand(sys.argv[1:])
+    module = None
+    for name, (modname, helptext) in SUBCOMMANDS.items():
+        subcmd = subcmds.add_parser(name, help=helptext)
+        if name != selected:
+            continue
+        module = importlib.import_module(modname)
+        subcmd.description = module.__doc__
+        subcmd.formatter_class = argparse.RawDescriptionHelpFormatter
+        if name == "explore":
+            module.create_subcmd_parsers(subcmd)
+        else:
+            module.create_subcmd_parser(subcmd)
 
     args = parser.parse_args()
-    cmd = args.cmd
-    cmdmap[cmd](args)
+    module.main(args)
 
 
 if __name__ == "__main__":
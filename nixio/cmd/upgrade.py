@@ -1,6 +1,8 @@
 """
 Upgrade NIX files to newest file format version.
 """
+from concurrent.futures import ProcessPoolExecutor
+
 import h5py
 import nixio as nix
 
@@ -10,109 +12,102 @@ def get_file_version(fname):
         return tuple(hfile.attrs["version"])
 
 
-def has_valid_file_id(fname):
-    with h5py.File(fname, mode="r") as hfile:
-        fileid = hfile.attrs.get("id")
-        if fileid and nix.util.is_uuid(fileid):
-            return True
+def has_valid_file_id(hfile):
+    fileid = hfile.attrs.get("id")
+    if fileid and nix.util.is_uuid(fileid):
+        return True
     return False
 
 
-def add_file_id(fname):
+def add_file_id(hfile):
     """
-    Returns a closure that binds the filename if a file ID is required. When
-    the return value is called, it adds a UUID to the file header.
+    Returns a function if a file ID is required. When the return value is
+    called with the file opened for writing, it adds a UUID to the file
+    header.
     """
-    if has_valid_file_id(fname):
+    if has_valid_file_id(hfile):
         return None
 
-    def add_id():
+    def add_id(hfile):
         "Add a UUID to the file header"
-        with h5py.File(fname, mode="a") as hfile:
-            if has_valid_file_id(fname):
-                return
-            hfile.attrs["id"] = nix.util.create_id()
+        if has_valid_file_id(hfile):
+            return
+        hfile.attrs["id"] = nix.util.create_id()
     return add_id
 
 
-def update_property_values(fname):
+def update_property_values(hfile):
     """
-    Returns a closure that binds the filename if at least one Property update
-    is required. When the return value is called, it rewrites all the metadata
-    Property objects to the new format.
+    Returns a function if at least one Property update is required. When the
+    return value is called with the file opened for writing, it rewrites all
+    the metadata Property objects to the new format.
     """
     props = list()
 
-    with h5py.File(fname, mode="r") as hfile:
-        sections = hfile["metadata"]
-
+    if "metadata" in hfile:
         def find_props(_, group):
             if isinstance(group, h5py.Dataset) and len(group.dtype):
                 # structured/compound dtypes have non-zero length
                 props.append(group.name)
 
-        sections.visititems(find_props)
+        hfile["metadata"].visititems(find_props)
 
     if not props:
         return None
 
-    def update_props():
+    def update_props(hfile):
+        # all properties are rewritten with the same timestamp
+        now = nix.util.time_to_str(nix.util.now_int())
         for propname in props:
-            with h5py.File(fname, mode="a") as hfile:
-                prop = hfile[propname]
-                if not (isinstance(prop, h5py.Dataset) and len(prop.dtype)):
-                    # File was possibly changed since the tasks were
-                    # collected.  File may have been submitted twice or
-                    # multiple instances of the script could be running.
-                    # skip this prop
-                    continue
-
-                # pull out the old extra attributes
-                uncertainty = prop["uncertainty"]
-                reference = prop["reference"]
-                filename = prop["filename"]
-                encoder = prop["encoder"]
-                checksum = prop["checksum"]
-
-                # replace base prop
-                values = prop["value"]
-                definition = prop.attrs.get("definition")
-                unit = prop.attrs.get("unit")
-                dt = values.dtype
-                del hfile[propname]
-                newprop = create_property(hfile, propname,
-                                          dtype=dt, data=values,
-                                          definition=definition,
-                                          unit=unit)
-
-                # Create properties for any extra attrs that are set
-                if len(set(uncertainty)) > 1:
-                    # multiple values, make new prop
-                    create_property(hfile, propname + ".uncertainty",
-                                    dtype=float, data=uncertainty)
-                elif any(uncertainty):
-                    # single, unique, non-zero value; add to main prop attr
-                    newprop.attrs["uncertainty"] = uncertainty[0]
-
-                if any(reference):
-                    create_property(hfile, propname + ".reference",
-                                    dtype=nix.util.vlen_str_dtype,
-                                    data=reference)
-
-                if any(filename):
-                    create_property(hfile, propname + ".filename",
-                                    dtype=nix.util.vlen_str_dtype,
-                                    data=filename)
-
-                if any(encoder):
-                    create_property(hfile, propname + ".encoder",
-                                    dtype=nix.util.vlen_str_dtype,
-                                    data=encoder)
+            prop = hfile.get(propname)
+            if not (isinstance(prop, h5py.Dataset) and len(prop.dtype)):
+                # File was possibly changed since the tasks were
+                # collected.  File may have been submitted twice or
+                # multiple instances of the script could be running.
+                # skip this prop
+                continue
 
-                if any(checksum):
-                    create_property(hfile, propname + ".checksum",
+            # read the old compound values, including the extra attributes,
+            # at once
+            olddata = prop[()]
+            uncertainty = olddata["uncertainty"]
+            reference = olddata["reference"]
+            filename = olddata["filename"]
+            encoder = olddata["encoder"]
+            checksum = olddata["checksum"]
+
+            # replace base prop
+            values = olddata["value"]
+            definition = prop.attrs.get("definition")
+            unit = prop.attrs.get("unit")
+            dt = prop.dtype["value"]
+            # create the new datasets in the parent group instead of
+            # resolving the full path for each of them
+            parent = prop.parent
+            basename = propname.split("/")[-1]
+            del parent[basename]
+            newprop = create_property(parent, basename,
+                                      dtype=dt, data=values,
+                                      definition=definition,
+                                      unit=unit, time=now)
+
+            # Create properties for any extra attrs that are set
+            if len(set(uncertainty)) > 1:
+                # multiple values, make new prop
+                create_property(parent, basename + ".uncertainty",
+                                dtype=float, data=uncertainty, time=now)
+            elif any(uncertainty):
+                # single, unique, non-zero value; add to main prop attr
+                newprop.attrs["uncertainty"] = uncertainty[0]
+
+            for extra, extradata in (("reference", reference),
+                                     ("filename", filename),
+                                     ("encoder", encoder),
+                                     ("checksum", checksum)):
+                if any(extradata):
+                    create_property(parent, basename + "." + extra,
                                     dtype=nix.util.vlen_str_dtype,
-                                    data=checksum)
+                                    data=extradata, time=now)
 
     psuffix = "ies" if len(props) > 1 else "y"
     update_props.__doc__ = "Update {} propert{}".format(len(props), psuffix)
@@ -133,57 +128,55 @@ def create_h5group(parent, name):
     return h5py.Group(gid)
 
 
-def update_alias_range_dimension(fname):
+def update_alias_range_dimension(hfile):
     """
-    Returns a closure that binds the filename if at least one
-    AliasRangeDimension is found. When the return value is called, it converts
-    all AliasRangeDimensions to a RangeDimension with a DimensionLink to the
+    Returns a function if at least one AliasRangeDimension is found. When the
+    return value is called with the file opened for writing, it converts all
+    AliasRangeDimensions to a RangeDimension with a DimensionLink to the
     DataArray.
     """
     dims = list()
-    with h5py.File(fname, mode="r") as hfile:
-        for block in hfile["data"].values():
-            if "data_arrays" not in block:
-                continue
+    for block in hfile["data"].values():
+        if "data_arrays" not in block:
+            continue
 
-            for data_array in block["data_arrays"].values():
-                if "dimensions" not in data_array:
-                    continue
-                for dimension in data_array["dimensions"].values():
-                    daid = data_array.attrs["entity_id"]
-                    if ("ticks" not in dimension and "link" not in dimension
-                            and daid in dimension):
-                        # found alias range dimension
-                        dims.append(dimension.name)
+        for data_array in block["data_arrays"].values():
+            if "dimensions" not in data_array:
+                continue
+            for dimension in data_array["dimensions"].values():
+                daid = data_array.attrs["entity_id"]
+                if ("ticks" not in dimension and "link" not in dimension
+                        and daid in dimension):
+                    # found alias range dimension
+                    dims.append(dimension.name)
 
     if not dims:
         return None
 
-    def update_alias_dims():
+    def update_alias_dims(hfile):
+        now = nix.util.time_to_str(nix.util.now_int())
         for dimname in dims:
-            with h5py.File(fname, mode="a") as hfile:
-                dim = hfile[dimname]
-                parentda = dim.parent.parent
-                daid = parentda.attrs["entity_id"]
-                if ("ticks" in dim or "link" in dim and daid not in dim):
-                    # File was possibly changed since the tasks were
-                    # collected.  File may have been submitted twice or
-                    # multiple instances of the script could be running.
-                    # skip this prop
-                    continue
-
-                # create link object
-                link = create_h5group(dim, "link")
-                link.attrs["entity_id"] = nix.util.create_id()
-                link.attrs["data_object_type"] = "DataArray"
-                link[daid] = parentda  # creates link
-                link.attrs["index"] = [-1]
-                now = nix.util.time_to_str(nix.util.now_int())
-                link.attrs["created_at"] = now
-                link.attrs["updated_at"] = now
-
-                # delete old alias link
-                del dim[daid]
+            dim = hfile[dimname]
+            parentda = dim.parent.parent
+            daid = parentda.attrs["entity_id"]
+            if ("ticks" in dim or "link" in dim and daid not in dim):
+                # File was possibly changed since the tasks were
+                # collected.  File may have been submitted twice or
+                # multiple instances of the script could be running.
+                # skip this prop
+                continue
+
+            # create link object
+            link = create_h5group(dim, "link")
+            link.attrs["entity_id"] = nix.util.create_id()
+            link.attrs["data_object_type"] = "DataArray"
+            link[daid] = parentda  # creates link
+            link.attrs["index"] = [-1]
+            link.attrs["created_at"] = now
+            link.attrs["updated_at"] = now
+
+            # delete old alias link
+            del dim[daid]
 
     plural = "s" if len(dims) > 1 else ""
     update_alias_dims.__doc__ = ("Convert {} alias range dimension{s} "
@@ -191,12 +184,15 @@ def update_alias_range_dimension(fname):
     return update_alias_dims
 
 
-def create_property(hfile, name, dtype, data, definition=None, unit=None):
+def create_property(hfile, name, dtype, data, definition=None, unit=None,
+                    time=None):
+    if time is None:
+        time = nix.util.time_to_str(nix.util.now_int())
     prop = hfile.create_dataset(name, dtype=dtype, data=data, chunks=True)
     prop.attrs["name"] = name.split("/")[-1]
     prop.attrs["entity_id"] = nix.util.create_id()
-    prop.attrs["created_at"] = nix.util.time_to_str(nix.util.now_int())
-    prop.attrs["updated_at"] = nix.util.time_to_str(nix.util.now_int())
+    prop.attrs["created_at"] = time
+    prop.attrs["updated_at"] = time
     if definition:
         prop.attrs["definition"] = definition
     if unit:
@@ -204,43 +200,51 @@ def create_property(hfile, name, dtype, data, definition=None, unit=None):
     return prop
 
 
-def update_format_version(fname):
+def update_format_version():
     """
-    Returns a closure that binds the filename. When the return value is
-    called, it updates the version in the header to the version in the library.
+    Returns a function that, when called with the file opened for writing,
+    updates the version in the header to the version in the library.
     """
-    def update_ver():
-        with h5py.File(fname, mode="a") as hfile:
-            hfile.attrs["version"] = nix.file.HDF_FF_VERSION
+    def update_ver(hfile):
+        hfile.attrs["version"] = nix.file.HDF_FF_VERSION
     lib_verstr = ".".join(str(v) for v in nix.file.HDF_FF_VERSION)
     update_ver.__doc__ = f"Update the file format version to {lib_verstr}"
     return update_ver
 
 
 def collect_tasks(fname):
+    """
+    Opens the file once to check which upgrade steps are required.
+
+    :returns: The list of tasks, the version of the file and the version of
+              the library. Each task is a function that is called with the
+              file opened for writing.
+    :rtype: tuple
+    """
     tasks = list()
-    file_ver = get_file_version(fname)
-    file_verstr = ".".join(str(v) for v in file_ver)
     lib_verstr = ".".join(str(v) for v in nix.file.HDF_FF_VERSION)
-    if file_ver >= nix.file.HDF_FF_VERSION:
-        return tasks, file_verstr, lib_verstr
+    with h5py.File(fname, mode="r") as hfile:
+        file_ver = tuple(hfile.attrs["version"])
+        file_verstr = ".".join(str(v) for v in file_ver)
+        if file_ver >= nix.file.HDF_FF_VERSION:
+            return tasks, file_verstr, lib_verstr
 
-    # even if the version string indicates the file is old, check format
-    # details before scheduling tasks
-    id_task = add_file_id(fname)
-    if id_task:
-        tasks.append(id_task)
+        # even if the version string indicates the file is old, check format
+        # details before scheduling tasks
+        id_task = add_file_id(hfile)
+        if id_task:
+            tasks.append(id_task)
 
-    props_task = update_property_values(fname)
-    if props_task:
-        tasks.append(props_task)
+        props_task = update_property_values(hfile)
+        if props_task:
+            tasks.append(props_task)
 
-    alias_task = update_alias_range_dimension(fname)
-    if alias_task:
-        tasks.append(alias_task)
+        alias_task = update_alias_range_dimension(hfile)
+        if alias_task:
+            tasks.append(alias_task)
 
     # always update the format last
-    tasks.append(update_format_version(fname))
+    tasks.append(update_format_version())
 
     return tasks, file_verstr, lib_verstr
 
@@ -248,6 +252,8 @@ def collect_tasks(fname):
 def create_subcmd_parser(parser):
     parser.add_argument("-f", "--force", action="store_true",
                         help="overwrite existing files without prompting")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of files upgraded in parallel (default: %(default)s)")
     parser.add_argument("file", type=str, nargs="+",
                         help="path to file to upgrade (at least one)")
     return parser
@@ -262,14 +268,36 @@ def print_tasks(fname, tasklist, fileversion, libversion):
 
 
 def process_tasks(fname, tasklist, quiet=True):
+    """
+    Runs all tasks of a file within a single open file handle.
+    """
     if not quiet:
         print(f"Processing {fname} ", end="", flush=True)
-    for task in tasklist:
-        task()
+    if tasklist:
+        with h5py.File(fname, mode="a") as hfile:
+            for task in tasklist:
+                task(hfile)
     if not quiet:
         print("done")
 
 
+def try_process_tasks(fname, tasklist=None):
+    """
+    Runs the tasks of a file like process_tasks, collecting them first if
+    they are not given (e.g., in a worker process).
+
+    :returns: None if the upgrade succeeded, the error message otherwise.
+    :rtype: str
+    """
+    try:
+        if tasklist is None:
+            tasklist, _, _ = collect_tasks(fname)
+        process_tasks(fname, tasklist)
+    except Exception as exc:
+        return str(exc) or type(exc).__name__
+    return None
+
+
 def file_upgrade(fname, quiet=True):
     """
     Upgrades a file from an old format version to the current version.
@@ -329,6 +357,21 @@ MAKE SURE YOUR FILES AND DATA ARE BACKED UP BEFORE CONTINUING.
     else:
         conf = "yes"
 
-    if conf in ("y", "yes"):
+    if conf not in ("y", "yes"):
+        return
+
+    def report(fname, error):
+        if error is None:
+            print(f"Processing {fname} done")
+        else:
+            print(f"Processing {fname} failed: {error}")
+
+    if args.jobs > 1 and len(tasks) > 1:
+        # the tasks are collected again by the worker processes
+        fnames = list(tasks)
+        with ProcessPoolExecutor(args.jobs) as executor:
+            for fname, error in zip(fnames, executor.map(try_process_tasks, fnames)):
+                report(fname, error)
+    else:
         for fname, tasklist in tasks.items():
-            process_tasks(fname, tasklist, quiet=False)
+            report(fname, try_process_tasks(fname, tasklist))
@@ -1,8 +1,12 @@
 """
 Validate NIX files for missing or inconsistent objects and annotations.
 """
+import json
 import os
+from datetime import datetime
+
 import nixio as nix
+from nixio import util
 
 
 def format_obj(obj):
@@ -14,10 +18,40 @@ def print_header(text):
     print("  " + "-"*len(text))
 
 
-def validate(filename):
+def stamp_path(filename):
+    return "{}.nixvalidation".format(filename)
+
+
+def read_stamp(nf, filename):
+    """
+    Returns the time of the last successful validation of the file or None.
+    """
+    try:
+        with open(stamp_path(filename)) as stampfile:
+            stamp = json.load(stampfile)
+    except (OSError, ValueError):
+        return None
+    if stamp.get("id") != nf.id:
+        return None
+    return stamp.get("stamp")
+
+
+def write_stamp(nf, filename, time):
+    try:
+        with open(stamp_path(filename), "w") as stampfile:
+            json.dump({"id": nf.id, "stamp": time}, stampfile)
+    except OSError as exc:
+        print("warning: can not save validation stamp: {}".format(exc))
+
+
+def validate(filename, jobs=1, incremental=False):
     nf = nix.File(filename, mode=nix.FileMode.ReadOnly)
-    results = nf.validate()
+    since = read_stamp(nf, filename) if incremental else None
+    start = util.now_int()
+    results = nf.validate(jobs=jobs, since=since)
     print("Results for '{}'".format(filename))
+    if since is not None:
+        print("  (objects updated since {})".format(datetime.fromtimestamp(since)))
     errors = results["errors"]
     if errors:
         plural = "s" if len(errors) > 1 else ""
@@ -37,11 +71,22 @@ def validate(filename):
                 print("    {}".format(msg))
 
     print()
+    if incremental and not errors:
+        write_stamp(nf, filename, start)
+    nf.close()
 
 
 def create_subcmd_parser(parser):
     parser.add_argument("file", type=str, nargs="+",
                         help="path to file to validate (at least one)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of processes validating the blocks of a file in parallel "
+                             "(default: %(default)s)")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help=("only validate objects updated since the last validation without errors; "
+                              "the time of the validation is stored next to the file (FILE.nixvalidation). "
+                              "Changes of dimensions do not update the timestamp of their DataArray and "
+                              "are only found by a full validation"))
     return parser
 
 
@@ -50,6 +95,6 @@ def main(args):
 
     for nixfn in filenames:
         if os.path.exists(nixfn):
-            validate(nixfn)
+            validate(nixfn, args.jobs, args.incremental)
         else:
             print("error: No such file '{}'".format(nixfn))
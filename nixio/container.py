@@ -1,9 +1,12 @@
+import re
+
 from .entity import Entity
 try:
     from collections.abc import Iterable
 except ImportError:
     from collections import Iterable
 from . import util
+from .util.find import _attr_matches
 
 
 class Container:
@@ -30,6 +33,9 @@ class Container:
         self._parent = parent
         self._name = name
 
+    # the children are stored under their names (not their ids)
+    _links_are_names = True
+
     def _inst_item(self, item):
         return self._itemclass(self._file, self._parent, item)
 
@@ -37,6 +43,9 @@ class Container:
         return len(self._backend)
 
     def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._inst_item(self._backend.get_by_name(link))
+                    for link in self._backend.link_names()[item]]
         if isinstance(item, int):
             if item < 0:
                 item = len(self) + item
@@ -47,7 +56,7 @@ class Container:
             item = self._backend.get_by_id_or_name(item)
         return self._inst_item(item)
 
-    def __delitem__(self, item):
+    def _check_item(self, item):
         if not isinstance(item, Entity):
             item = self[item]
 
@@ -56,8 +65,21 @@ class Container:
                 "Wrong item type: {} required or the name or ID of one".format(
                     self._itemclass.__name__)
             )
+        return item
+
+    def __delitem__(self, item):
+        self.delete_many([item])
 
-        self._file._h5group.delete_all([item.id])
+    def delete_many(self, items):
+        """
+        Deletes several items of the container at once, together with all
+        links referring to them (see File.delete_entities).
+
+        :param items: The items to delete or their names or ids.
+        :type items: list
+        """
+        ids = [self._check_item(item).id for item in items]
+        self._file.delete_entities(ids)
 
     def __iter__(self):
         for group in self._backend:
@@ -98,51 +120,63 @@ class Container:
             item = self._inst_item(group)
             yield item.id, item
 
+    def filter(self, name=None, type_=None, name_regex=None):
+        """
+        Returns the items matching all given conditions. The conditions are
+        evaluated on the raw attributes of the stored objects and items are
+        only created for the matches, which is considerably faster than
+        iterating over the container.
+
+        :param name: The name of the items or a callable returning True for
+                     matching names.
+        :param type_: The type of the items or a callable returning True for
+                      matching types.
+        :param name_regex: Regular expression (str or compiled pattern) that
+                           must be found in the names of the items.
+
+        :returns: The matching items in the order of the container.
+        :rtype: list
+        """
+        if isinstance(name_regex, str):
+            name_regex = re.compile(name_regex)
+        group = self._backend.group
+        result = []
+        for link in self._backend.link_names():
+            h5obj = None
+            if name is not None or name_regex is not None:
+                if self._links_are_names:
+                    itemname = link
+                else:
+                    h5obj = group[link]
+                    itemname = h5obj.attrs.get("name")
+                if name is not None and not _attr_matches(itemname, name):
+                    continue
+                if (name_regex is not None and
+                        not _attr_matches(itemname, name_regex)):
+                    continue
+            if type_ is not None:
+                if h5obj is None:
+                    h5obj = group[link]
+                if not _attr_matches(h5obj.attrs.get("type"), type_):
+                    continue
+            result.append(self._inst_item(self._backend.get_by_name(link)))
+        return result
+
 
 class SectionContainer(Container):
     """
-    SectionContainer extends Container with a new __delitem__ method.
-    When a Section is deleted, all child sections need to be deleted
-    individually to make sure all their references are removed.
+    SectionContainer is a Container for Sections. When a Section is deleted,
+    all its child sections are deleted as well and all references to them
+    are removed.
     """
-    def __delitem__(self, item):
-        if not isinstance(item, Entity):
-            item = self[item]
-
-        if not isinstance(item, self._itemclass):
-            raise TypeError(
-                "Wrong item type: {} required or the name or ID of one".format(
-                    self._itemclass.__name__)
-            )
-
-        # collect all IDs under item and send them for deletion, starting from
-        # the root block
-        secids = [s.id for s in item.find_sections()]
-
-        self._file._h5group.delete_all(secids)
 
 
 class SourceContainer(Container):
     """
-    SourceContainer extends Container with a new __delitem__ method.
-    When a Source is deleted, all child sources need to be deleted individually
-    to make sure all their references are removed.
+    SourceContainer is a Container for Sources. When a Source is deleted, all
+    its child sources are deleted as well and all references to them are
+    removed.
     """
-    def __delitem__(self, item):
-        if not isinstance(item, Entity):
-            item = self[item]
-
-        if not isinstance(item, self._itemclass):
-            raise TypeError(
-                "Wrong item type: {} required or the name or ID of one".format(
-                    self._itemclass.__name__)
-            )
-
-        # collect all IDs under item and send them for deletion, starting from
-        # the root block
-        srcids = [s.id for s in item.find_sources()]
-        srcids.append(item.id)
-        self._file._h5group.delete_all(srcids)
 
 
 class LinkContainer(Container):
@@ -174,22 +208,33 @@ class LinkContainer(Container):
                       are stored and linked to.
     """
 
+    # the links are named by the ids of the linked objects
+    _links_are_names = False
+
     def __init__(self, name, parent, itemclass, itemstore):
         super(LinkContainer, self).__init__(name, parent.file,
                                             parent, itemclass)
         self._itemstore = itemstore
 
     def __delitem__(self, item):
-        if not isinstance(item, Entity):
-            item = self[item]
-
-        if not isinstance(item, self._itemclass):
-            raise TypeError(
-                "Wrong item type: {} required or the name or ID of one".format(
-                    self._itemclass.__name__)
-            )
-
+        item = self._check_item(item)
+        key = self._backend.group.name
         self._backend.delete(item.id)
+        if self._backend.group is None:
+            # the emptied link group is removed, which restarts the creation
+            # order of its links
+            self._file._name_indexes.pop(key, None)
+
+    def delete_many(self, items):
+        """
+        Removes several items from the container at once. The linked objects
+        themselves are not deleted.
+
+        :param items: The items to remove or their names or ids.
+        :type items: list
+        """
+        for item in [self._check_item(item) for item in items]:
+            del self[item]
 
     def append(self, item):
         if util.is_uuid(item):
@@ -203,6 +248,37 @@ class LinkContainer(Container):
 
         self._backend.create_link(item, item.id)
 
+    def _name_index(self):
+        """
+        Returns a dictionary mapping the names of the linked objects to their
+        ids. The index is kept by the file for each link group and rebuilt
+        when links were added or removed since it was built.
+        """
+        stamp = self._backend.link_stamp()
+        key = self._backend.group.name
+        indexes = self._file._name_indexes
+        cached = indexes.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        group = self._backend.group
+        index = dict()
+        for link in self._backend.link_names():
+            name = group[link].attrs.get("name")
+            if isinstance(name, bytes):
+                name = name.decode()
+            # keep the first of several linked objects with the same name
+            index.setdefault(name, link)
+        indexes[key] = (stamp, index)
+        return index
+
+    def _find_by_name(self, name):
+        """
+        Returns the id of the linked object with the given name or None.
+        """
+        if self._backend.group is None:
+            return None
+        return self._name_index().get(name)
+
     def extend(self, items):
         if not isinstance(items, Iterable):
             raise TypeError("{} object is not iterable".format(type(items)))
@@ -210,7 +286,7 @@ class LinkContainer(Container):
             self.append(item)
 
     def __getitem__(self, identifier):
-        if isinstance(identifier, int):
+        if isinstance(identifier, (int, slice)):
             return super(LinkContainer, self).__getitem__(identifier)
         else:
             if util.is_uuid(identifier):
@@ -218,9 +294,9 @@ class LinkContainer(Container):
                 item = self._backend.get_by_name(identifier)
                 return self._inst_item(item)
             else:
-                for grp in self._backend:
-                    if identifier == grp.get_attr("name"):
-                        return self._inst_item(grp)
+                link = self._find_by_name(identifier)
+                if link is not None:
+                    return self._inst_item(self._backend.get_by_name(link))
 
                 raise KeyError("Item not found '{}'".format(identifier))
 
@@ -238,11 +314,8 @@ class LinkContainer(Container):
         if util.is_uuid(item):
             return item in self._backend
 
-        # assume it's a name and scan through LinkContainer
-        for grp in self._backend:
-            if item == grp.get_attr("name"):
-                return True
-        return False
+        # assume it's a name and look it up in the name index
+        return self._find_by_name(item) is not None
 
     def _inst_item(self, item):
         return self._itemclass(self._file, self._itemstore._parent, item)
@@ -7,7 +7,7 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 import warnings
-from numbers import Number
+from numbers import Number, Integral
 from enum import Enum
 import numpy as np
 
@@ -20,11 +20,83 @@ from .dimensions import (Dimension, IndexMode, SampledDimension, RangeDimension,
                          SetDimension, DimensionType, DimensionContainer)
 from . import util
 from .compression import Compression
+from .hdf5.h5references import _address
 
 from .exceptions import IncompatibleDimensions
 from .section import Section
 
 
+# number of elements processed at once when calibrating data
+READ_BLOCK_SIZE = 1 << 20
+
+
+def _normalize_selection(slc, shape):
+    """
+    Converts a selection of integers, slices and Ellipsis into a tuple with
+    one normalized entry (integer or slice with positive step) per data
+    dimension and returns it together with the shape of the selected data.
+    Returns None for selections that need advanced indexing.
+    """
+    if slc is None:
+        slc = (Ellipsis,)
+    elif not isinstance(slc, tuple):
+        slc = (slc,)
+    nell = sum(1 for s in slc if s is Ellipsis)
+    if nell > 1:
+        return None
+    if nell:
+        idx = next(i for i, s in enumerate(slc) if s is Ellipsis)
+        padding = (slice(None),) * (len(shape) - len(slc) + 1)
+        slc = slc[:idx] + padding + slc[idx + 1:]
+    if len(slc) > len(shape):
+        return None
+    slc = slc + (slice(None),) * (len(shape) - len(slc))
+
+    srcsel = list()
+    selshape = list()
+    for sel, dimlen in zip(slc, shape):
+        if isinstance(sel, (Integral, np.integer)) and not isinstance(sel, (bool, np.bool_)):
+            sel = int(sel)
+            if sel < 0:
+                sel += dimlen
+            if not 0 <= sel < dimlen:
+                raise IndexError("Index ({}) out of range for dimension of "
+                                 "length {}".format(sel, dimlen))
+            srcsel.append(sel)
+        elif isinstance(sel, slice):
+            start, stop, step = sel.indices(dimlen)
+            if step < 1:
+                return None
+            count = len(range(start, stop, step))
+            srcsel.append(slice(start, start + count * step, step))
+            selshape.append(count)
+        else:
+            return None
+    return tuple(srcsel), tuple(selshape)
+
+
+def _iter_blocks(srcsel, shape):
+    """
+    Splits a normalized selection along its first selected dimension into
+    blocks of at most READ_BLOCK_SIZE elements and yields the source and
+    destination selection of each block.
+    """
+    axis = next((i for i, s in enumerate(srcsel) if isinstance(s, slice)),
+                None)
+    if axis is None:
+        yield srcsel, Ellipsis
+        return
+    rowsize = int(np.prod(shape[1:]))
+    nrows = max(1, READ_BLOCK_SIZE // max(rowsize, 1))
+    sel = srcsel[axis]
+    for first in range(0, shape[0], nrows):
+        last = min(first + nrows, shape[0])
+        block = slice(sel.start + first * sel.step,
+                      sel.start + last * sel.step, sel.step)
+        yield (srcsel[:axis] + (block,) + srcsel[axis + 1:],
+               (slice(first, last),) + (Ellipsis,))
+
+
 class DataSliceMode(Enum):
     Index = 1
     Data = 2
@@ -36,34 +108,220 @@ class DataArray(Entity, DataSet):
         super(DataArray, self).__init__(nixfile, nixparent, h5group)
         self._sources = None
         self._dimensions = None
+        # cached data set handle and its dtype; the data extent is kept by
+        # the file, so changes made through other objects are seen
+        self._h5dataset = None
+        self._dataset_key = None
+        self._dtype = None
 
     @classmethod
     def create_new(cls, nixfile, nixparent, h5parent, name, type_,
-                   data_type, shape, compression):
+                   data_type, shape, compression, contiguous=False):
         newentity = super(DataArray, cls).create_new(nixfile, nixparent,
                                                      h5parent, name, type_)
         datacompr = False
         if compression == Compression.DeflateNormal:
             datacompr = True
-        newentity._h5group.create_dataset("data", shape, data_type, datacompr)
+        newentity._h5group.create_dataset("data", shape, data_type, datacompr,
+                                          contiguous)
         return newentity
 
-    def _read_data(self, sl=None):
+    def _dataset(self):
+        if self._h5dataset is None or not self._h5dataset.dataset.id.valid:
+            # first access or the file was closed and reopened
+            self._h5dataset = self._h5group.get_dataset("data")
+            self._dataset_key = _address(self._h5dataset.dataset)
+            self._dtype = self._h5dataset.dataset.dtype
+            self.file._data_extents.pop(self._dataset_key, None)
+        return self._h5dataset
+
+    @property
+    def data_extent(self):
+        """
+        The size of the data.
+
+        :type: tuple of int
+        """
+        dataset = self._dataset()
+        extents = self.file._data_extents
+        extent = extents.get(self._dataset_key)
+        if extent is None:
+            extent = extents[self._dataset_key] = dataset.shape
+        return extent
+
+    @data_extent.setter
+    def data_extent(self, extent):
+        dataset = self._dataset()
+        self.file._data_extents.pop(self._dataset_key, None)
+        dataset.shape = extent
+
+    def _get_calibration(self):
+        """
+        Returns the calibration as a tuple of polynomial coefficients and
+        expansion origin, or None if the data is not calibrated. The values
+        are read from the file on every call, so changes made through other
+        objects of the same DataArray are picked up.
+        """
         coeff = self.polynom_coefficients
         origin = self.expansion_origin
+        if len(coeff) or origin:
+            return coeff, origin or 0.0
+        return None
+
+    def read(self, slc=None, out=None, dtype=None, unit=None):
+        """
+        Reads (a slice of) the data and applies the calibration, if any.
+
+        Large selections are processed block by block: each block is read
+        straight into the output array, converting to the output data type
+        in the HDF5 library, and then calibrated in place. No full size
+        temporary arrays are created, so e.g. int16 recordings can be
+        calibrated into a float32 array of the same shape.
+
+        If a unit is given, the data is converted from the unit of the
+        DataArray to that unit. The scaling factor is merged into the
+        calibration polynomial, so the conversion takes no extra pass over
+        the data.
+
+        :param slc: The selection to read (integers, slices and Ellipsis).
+                    Defaults to all data.
+        :param out: Optional C-contiguous, writeable array into which the
+                    data is read. Its shape must match the selection.
+        :type out: :class:`numpy.ndarray`
+        :param dtype: The data type of the returned array. Defaults to the
+                      stored data type or double for calibrated data.
+                      Ignored if ``out`` is given.
+        :param unit: The unit of the returned data. Must be a scaled version
+                     of the unit of the DataArray (e.g., "V" for data in mV).
+        :type unit: str
+
+        :returns: The (calibrated) data.
+        :rtype: :class:`numpy.ndarray`
+        """
+        calibration = self._get_calibration()
+        if unit is not None:
+            calibration = self._scale_calibration(calibration, unit)
+        dataset = self._dataset()
+        selection = _normalize_selection(slc, dataset.shape)
+        if selection is None or dataset.dataset.dtype.hasobject:
+            # advanced indexing or variable length data: no direct reads
+            data = self._read_indexed(slc, calibration)
+            if out is None:
+                return data if dtype is None else data.astype(dtype)
+            out[...] = data
+            return out
+        srcsel, shape = selection
+        if not shape:
+            # single value retrieval as length-1 array
+            shape = (1,)
+
+        if out is None:
+            if dtype is None:
+                dtype = DataType.Double if calibration else dataset.dtype
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError("Shape of output array {} does not match the "
+                             "selection {}".format(out.shape, shape))
+        if calibration and not np.issubdtype(out.dtype, np.inexact):
+            raise TypeError("Reading calibrated data requires a floating "
+                            "point output array, got {}".format(out.dtype))
+        if not out.size:
+            return out
+
+        for srcblock, outblock in _iter_blocks(srcsel, shape):
+            dataset.read_direct(out, srcblock, outblock)
+            if calibration:
+                util.apply_polynomial(calibration[0], calibration[1],
+                                      out[outblock])
+        return out
+
+    def _scale_calibration(self, calibration, unit):
+        """
+        Returns the calibration that additionally converts the data from the
+        unit of the DataArray to the given unit.
+
+        :raises: InvalidUnit if the units can not be scaled.
+        """
+        factor = util.units.scaling(self.unit, util.units.sanitizer(unit))
+        if factor == 1.0:
+            return calibration
+        if calibration is None:
+            return (0.0, factor), 0.0
+        coeff, origin = calibration
+        if not len(coeff):
+            # only an expansion origin: the identity polynomial
+            coeff = (0.0, 1.0)
+        return tuple(c * factor for c in coeff), origin
+
+    def _read_data(self, sl=None):
+        return self.read(sl)
+
+    def _read_indexed(self, sl, calibration):
         data = np.array(super(DataArray, self)._read_data(sl))
         if not len(data.shape):
             # single value retrieval as length-1 array
             data.shape = (1,)
-        if len(coeff) or origin:
-            if not origin:
-                origin = 0.0
-
+        if calibration:
             # when there are coefficients or exp origin, convert the dtype of the returned data array to double
             data = data.astype(DataType.Double)
-            util.apply_polynomial(coeff, origin, data)
+            util.apply_polynomial(calibration[0], calibration[1], data)
         return data
 
+    def _read_direct(self, data, source_sel=None, dest_sel=None):
+        calibration = self._get_calibration()
+        if calibration and not np.issubdtype(data.dtype, np.inexact):
+            raise TypeError("Reading calibrated data requires a floating "
+                            "point destination array, got {}".format(data.dtype))
+        super(DataArray, self)._read_direct(data, source_sel, dest_sel)
+        if calibration:
+            # apply the calibration in place on the region that was read
+            if dest_sel is None:
+                dest_sel = Ellipsis
+            region = np.asarray(data[dest_sel])
+            util.apply_polynomial(calibration[0], calibration[1], region)
+            if not np.may_share_memory(region, data):
+                # integer indices select a copy, not a view
+                data[dest_sel] = region
+
+    def as_memmap(self):
+        """
+        Returns a read-only :class:`numpy.memmap` of the raw data stored in the
+        DataArray. The data is mapped directly from the file without being
+        copied through the HDF5 library.
+
+        This is only possible for DataArrays with a contiguous storage layout
+        (see the ``contiguous`` option of :class:`~nixio.File`), a fixed size
+        numeric data type, and without calibration (polynomial coefficients
+        or expansion origin), since the raw values are returned as stored.
+
+        :returns: A read-only memory map of the data.
+        :rtype: :class:`numpy.memmap`
+
+        :raises: ValueError: if the data is chunked or filtered, the data type
+                 is not fixed size, or the DataArray is calibrated.
+        :raises: RuntimeError: if no data has been written yet.
+        """
+        dataset = self._dataset()
+        if not dataset.is_contiguous:
+            raise ValueError("Cannot memory-map DataArray {}: data is stored "
+                             "chunked or filtered".format(self.name))
+        if self.polynom_coefficients or self.expansion_origin is not None:
+            raise ValueError("Cannot memory-map DataArray {}: raw data "
+                             "requires calibration".format(self.name))
+        dtype = dataset.dataset.dtype
+        if dtype.hasobject:
+            raise ValueError("Cannot memory-map DataArray {}: data type is "
+                             "not fixed size".format(self.name))
+        offset = dataset.offset
+        if offset is None:
+            raise RuntimeError("Cannot memory-map DataArray {}: no data has "
+                               "been written yet".format(self.name))
+        h5file = dataset.dataset.file
+        if h5file.mode != "r":
+            h5file.flush()
+        return np.memmap(h5file.filename, mode="r", dtype=dtype,
+                         offset=offset, shape=dataset.shape)
+
     @property
     def sources(self):
         """
@@ -224,7 +482,8 @@ class DataArray(Entity, DataSet):
         :return: The data type
         :rtype: nixio.DataType
         """
-        return self._h5group.group["data"].dtype
+        self._dataset()
+        return self._dtype
 
     @property
     def polynom_coefficients(self):
@@ -266,6 +525,18 @@ class DataArray(Entity, DataSet):
         if self.file.auto_update_timestamps:
             self.force_updated_at()
 
+    @property
+    def quantization_error(self):
+        """
+        The maximum absolute error introduced when floating point data was
+        quantized to integers on creation (see the ``quantize`` option of
+        :meth:`~nixio.Block.create_data_array`), or None if the data was not
+        quantized. This is a read only property.
+
+        :type: float
+        """
+        return self._dataset().get_attr("quantization_error")
+
     @property
     def label(self):
         """
@@ -436,8 +707,10 @@ class DataArray(Entity, DataSet):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
         self._h5group.create_link(sect, "metadata")
+        self.file._update_reference(self, "metadata", sect.id)
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
             self._h5group.delete("metadata")
+            self.file._update_reference(self, "metadata", None)
@@ -63,7 +63,7 @@ class DataSet:
         """
         return np.dtype(self._get_dtype())
 
-    def write_direct(self, data):
+    def write_direct(self, data, source_sel=None, dest_sel=None):
         """
         Directly write all of ``data`` to the
         :class:`~nixio.data_array.DataSet`.  The supplied data must be a
@@ -71,12 +71,21 @@ class DataSet:
         C-style contiguous memory layout (see :attr:`numpy.ndarray.flags` and
         :class:`~numpy.ndarray` for more information).
 
+        Optionally, only a region of ``data`` can be written into a region of
+        the DataSet by specifying the selections ``source_sel`` and
+        ``dest_sel`` (e.g., using :data:`numpy.s_`). Both selections must
+        select the same number of elements.
+
         :param data: The array which contents is being written
         :type data: :class:`numpy.ndarray`
+        :param source_sel: The region of ``data`` to write
+        :type source_sel: tuple of slices or indices
+        :param dest_sel: The region of the DataSet to write to
+        :type dest_sel: tuple of slices or indices
         """
-        self._write_data(data)
+        self._write_direct(data, source_sel, dest_sel)
 
-    def read_direct(self, data):
+    def read_direct(self, data, source_sel=None, dest_sel=None):
         """
         Directly read all data stored in the :class:`~nixio.data_array.DataSet`
         into ``data``. The supplied data must be a :class:`numpy.ndarray` that
@@ -84,10 +93,20 @@ class DataSet:
         and must be writeable (see :attr:`numpy.ndarray.flags` and
         :class:`~numpy.ndarray` for more information).
 
+        The data is read into ``data`` without creating a temporary copy.
+        Optionally, only a region of the DataSet can be read into a region of
+        ``data`` by specifying the selections ``source_sel`` and ``dest_sel``
+        (e.g., using :data:`numpy.s_`). Both selections must select the same
+        number of elements.
+
         :param data: The array where data is being read into
         :type data: :class:`numpy.ndarray`
+        :param source_sel: The region of the DataSet to read
+        :type source_sel: tuple of slices or indices
+        :param dest_sel: The region of ``data`` to read into
+        :type dest_sel: tuple of slices or indices
         """
-        data[:] = self._read_data()
+        self._read_direct(data, source_sel, dest_sel)
 
     def append(self, data, axis=0):
         """
@@ -116,12 +135,23 @@ class DataSet:
         slc = tuple(slice(o, c+o) for o, c in zip(offset, count))
         self._write_data(data, slc)
 
+    def _dataset(self):
+        return self._h5group.get_dataset("data")
+
     def _write_data(self, data, slc=None):
-        dataset = self._h5group.get_dataset("data")
+        dataset = self._dataset()
         dataset.write_data(data,  slc)
 
     def _read_data(self, slc=None):
-        return self._h5group.get_dataset("data").read_data(slc)
+        return self._dataset().read_data(slc)
+
+    def _write_direct(self, data, source_sel=None, dest_sel=None):
+        dataset = self._dataset()
+        dataset.write_direct(data, source_sel, dest_sel)
+
+    def _read_direct(self, data, source_sel=None, dest_sel=None):
+        dataset = self._dataset()
+        dataset.read_direct(data, source_sel, dest_sel)
 
     @property
     def data_extent(self):
@@ -130,12 +160,12 @@ class DataSet:
 
         :type: tuple of int
         """
-        dataset = self._h5group.get_dataset("data")
+        dataset = self._dataset()
         return dataset.shape
 
     @data_extent.setter
     def data_extent(self, extent):
-        dataset = self._h5group.get_dataset("data")
+        dataset = self._dataset()
         dataset.shape = extent
 
     @property
@@ -149,5 +179,5 @@ class DataSet:
         return self._get_dtype()
 
     def _get_dtype(self):
-        dataset = self._h5group.get_dataset("data")
+        dataset = self._dataset()
         return dataset.dtype
@@ -56,6 +56,9 @@ class DataView(DataSet):
         self.array = da
         self._h5group = self.array._h5group
 
+    def _dataset(self):
+        return self.array._dataset()
+
     @property
     def valid(self):
         return self._valid
@@ -98,6 +101,56 @@ class DataView(DataSet):
             tsl = self._transform_coordinates(sl)
         return self.array._read_data(tsl)
 
+    def _write_direct(self, data, source_sel=None, dest_sel=None):
+        if not self.valid:
+            raise InvalidSlice(
+                "Write Data failed due to an invalid slice."
+                "Reason is: {}".format(self._error_message)
+            )
+        tsl = self._slices
+        if dest_sel is not None:
+            tsl = self._transform_coordinates(dest_sel)
+        self.array._write_direct(data, source_sel, tsl)
+
+    def _read_direct(self, data, source_sel=None, dest_sel=None):
+        if not self.valid:
+            raise InvalidSlice(
+                "Read Data failed due to an invalid slice."
+                "Reason is: {}".format(self._error_message)
+            )
+        tsl = self._slices
+        if source_sel is not None:
+            tsl = self._transform_coordinates(source_sel)
+        self.array._read_direct(data, tsl, dest_sel)
+
+    def read(self, slc=None, out=None, dtype=None, unit=None):
+        """
+        Reads (a slice of) the data of the DataView, applying the
+        calibration of the DataArray and, optionally, converting the data to
+        the given unit (see :meth:`nixio.DataArray.read`).
+
+        :param slc: The selection within the DataView (integers, slices and
+                    Ellipsis). Defaults to all data of the DataView.
+        :param out: Optional C-contiguous, writeable array into which the
+                    data is read. Its shape must match the selection.
+        :type out: :class:`numpy.ndarray`
+        :param dtype: The data type of the returned array.
+        :param unit: The unit of the returned data.
+        :type unit: str
+
+        :returns: The (calibrated) data.
+        :rtype: :class:`numpy.ndarray`
+        """
+        if not self.valid:
+            raise InvalidSlice(
+                "Read Data failed due to an invalid slice."
+                "Reason is: {}".format(self._error_message)
+            )
+        tsl = self._slices
+        if slc is not None:
+            tsl = self._transform_coordinates(slc)
+        return self.array.read(tsl, out, dtype, unit)
+
     def _transform_coordinates(self, user_slices):
         """
         Takes a series (tuple) of slices or indices passed to the DataView and
@@ -7,7 +7,6 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 from numbers import Integral, Real
-from packaging import version
 
 import numpy as np
 
@@ -26,7 +25,7 @@ class DataType:
     Int64 = np.int64
     Float = np.float32
     Double = np.double
-    if version.parse(np.__version__) < version.parse("2.0"):
+    if np.lib.NumpyVersion(np.__version__) < "2.0.0":
         String = np.unicode_
     else:
         String = np.str_
@@ -76,7 +76,8 @@ class DimensionLink:
     """
 
     def __init__(self, nixfile, nixparent, h5group):
-        util.check_entity_id(h5group.get_attr("entity_id"))
+        if not nixfile._trusted:
+            util.check_entity_id(h5group.get_attr("entity_id"))
         self._h5group = h5group
         self._parent = nixparent
         self._file = nixfile
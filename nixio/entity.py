@@ -13,13 +13,15 @@ from . import util
 class Entity:
 
     def __init__(self, nixfile, nixparent, h5group):
-        util.check_entity_id(h5group.get_attr("entity_id"))
+        if not nixfile._trusted:
+            util.check_entity_id(h5group.get_attr("entity_id"))
         self._h5group = h5group
         self._parent = nixparent
         self._file = nixfile
 
     @classmethod
-    def create_new(cls, nixfile, nixparent, h5parent, name=None, type_=None):
+    def create_new(cls, nixfile, nixparent, h5parent, name=None, type_=None,
+                   time=None):
         if name and type_:
             id_ = util.create_id()
         if not name:
@@ -33,8 +35,8 @@ class Entity:
         h5group.set_attr("entity_id", id_)
 
         newentity = cls(nixfile, nixparent, h5group)
-        newentity.force_created_at()
-        newentity.force_updated_at()
+        newentity.force_created_at(time)
+        newentity.force_updated_at(time)
         return newentity
 
     @property
@@ -16,7 +16,8 @@ from .util import util
 class Feature:
 
     def __init__(self, nixfile, nixparent, h5group):
-        util.check_entity_id(h5group.get_attr("entity_id"))
+        if not nixfile._trusted:
+            util.check_entity_id(h5group.get_attr("entity_id"))
         self._h5group = h5group
         self._parent = nixparent
         self._file = nixfile
@@ -98,6 +99,8 @@ class Feature:
         if "data" in self._h5group:
             del self._h5group["data"]
         self._h5group.create_link(dataobj, "data")
+        # the data lookup index of the containing tag is outdated
+        self.file._name_indexes.pop(self._h5group._parent.name, None)
         if self.file.auto_update_timestamps:
             time = util.now_int()
             self._h5group.set_attr("updated_at", util.time_to_str(time))
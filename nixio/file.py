@@ -9,6 +9,8 @@
 
 import gc
 import pathlib
+import re
+from collections import deque
 from sys import maxsize
 from typing import Union
 from warnings import warn
@@ -18,16 +20,28 @@ import numpy as np
 
 from . import util, validator
 from .block import Block
+from .data_array import DataArray
+from .group import Group
+from .multi_tag import MultiTag
+from .source import Source
+from .tag import Tag
 from .compression import Compression
 from .container import Container, SectionContainer
 from .exceptions import DuplicateName, InvalidFile
+from .hdf5.h5dataset import H5DataSet, MAX_COMPACT_ATTRS, MIN_DENSE_ATTRS
 from .hdf5.h5group import H5Group
+from .hdf5.h5references import H5ReferenceIndex, _address
+from .property import Property
 from .section import Section
 from .util import find as finders
 
 FILE_FORMAT = "nix"
 HDF_FF_VERSION = (1, 2, 1)
 
+# HDF5 paths of Sections and Properties in the metadata tree
+_METADATA_PATH = re.compile(r"(?P<section>/metadata/[^/]+(?:/sections/[^/]+)*)"
+                            r"(?P<property>/properties/[^/]+)?")
+
 
 def can_write(nixfile):
     filever = nixfile.version
@@ -76,6 +90,7 @@ def make_fcpl():
     fcpl = h5py.h5p.create(h5py.h5p.FILE_CREATE)
     flags = h5py.h5p.CRT_ORDER_TRACKED | h5py.h5p.CRT_ORDER_INDEXED
     fcpl.set_link_creation_order(flags)
+    fcpl.set_attr_phase_change(MAX_COMPACT_ATTRS, MIN_DENSE_ATTRS)
     return fcpl
 
 
@@ -83,7 +98,9 @@ class File:
 
     def __init__(self, path: Union[str, pathlib.Path], mode=FileMode.ReadWrite,
                  compression=Compression.Auto,
-                 auto_update_timestamps=True):
+                 auto_update_timestamps=True, contiguous=False,
+                 cache_property_values=False, compact_properties=False,
+                 trusted=False):
         """
         Open a NIX file, or create it if it does not exist.
 
@@ -93,6 +110,22 @@ class File:
         :param compression: No, DeflateNormal, Auto (default: Auto)
         :param auto_update_timestamps: Enable/disable automatic updating of
                     'updated_at' timestamp. (default: True)
+        :param contiguous: Store the data of new uncompressed DataArrays with
+                    a fixed shape contiguously instead of chunked. Contiguous
+                    data can be memory-mapped (see DataArray.as_memmap) but
+                    can not be resized. (default: False)
+        :param cache_property_values: Keep the values of Properties in memory
+                    after they have been read once. The cache is updated when
+                    the values are changed through nixio but not when the file
+                    is modified by other means. (default: False)
+        :param compact_properties: Store the values of new small Properties
+                    in the HDF5 object header of their dataset instead of a
+                    separate chunk. A Property is converted to chunked
+                    storage when the number of its values changes.
+                    (default: False)
+        :param trusted: Do not validate the ids of the entities read from a
+                    file opened in ReadOnly mode. Only use this for files
+                    written by nixio. (default: False)
 
         :return: nixio.File object
         """
@@ -119,6 +152,16 @@ class File:
 
         self._h5group = self._root  # to match behaviour of other objects
         self._auto_update_timestamps = auto_update_timestamps
+        self._contiguous = contiguous
+        self._compact_properties = compact_properties
+        # entity ids are only validated when they can not be trusted
+        self._trusted = trusted and mode == FileMode.ReadOnly
+        self._version = None
+        self._property_values = dict() if cache_property_values else None
+        # properties with space reserved by buffered appends
+        self._property_buffers = dict()
+        # extents of the data of DataArrays by the address of the dataset
+        self._data_extents = dict()
         self._check_header(mode)
         self.mode = mode
         self._data = self._root.open_group("data", create=True)
@@ -133,13 +176,25 @@ class File:
         # make container props but don't initialise
         self._blocks = None
         self._sections = None
+        self._refindex = None
+        self._metadata_index = None
+        # HDF5 paths of the Sections changed since the metadata search index
+        # was updated, mapped to whether their subsections changed as well;
+        # None if the index must be rebuilt
+        self._metadata_changes = dict()
+        # lookup indexes of LinkContainers and FeatureContainers by group
+        self._name_indexes = dict()
 
     @classmethod
     def open(cls, path, mode=FileMode.ReadWrite, compression=Compression.Auto,
-             backend=None, auto_update_timestamps=True):
+             backend=None, auto_update_timestamps=True, contiguous=False,
+             cache_property_values=False, compact_properties=False,
+             trusted=False):
         if backend is not None:
             warn("Backend selection is deprecated. Ignoring value.")
-        return cls(path, mode, compression, auto_update_timestamps)
+        return cls(path, mode, compression, auto_update_timestamps,
+                   contiguous, cache_property_values, compact_properties,
+                   trusted)
 
 
     def _create_header(self):
@@ -192,6 +247,13 @@ class File:
         """
         return tuple(self._root.get_attr("version"))
 
+    @property
+    def _format_version(self):
+        # the version of an open file does not change, read it only once
+        if self._version is None:
+            self._version = self.version
+        return self._version
+
     def _set_version(self):
         # file format version should only be set on creation, so do nothing
         # if it's already set
@@ -235,6 +297,20 @@ class File:
         """
         self._auto_update_timestamps = enable
 
+    @property
+    def contiguous(self):
+        """
+        If enabled, new uncompressed DataArrays with a fixed shape are stored
+        contiguously instead of chunked.
+
+        :type: bool
+        """
+        return self._contiguous
+
+    @contiguous.setter
+    def contiguous(self, enable):
+        self._contiguous = enable
+
     @property
     def created_at(self):
         """
@@ -297,8 +373,22 @@ class File:
         except ValueError:
             return False
 
-    def validate(self):
-        return validator.check_file(self)
+    def validate(self, jobs=1, since=None):
+        """
+        Validates the file and all contained objects (see
+        nixio.validator.check_file).
+
+        :param jobs: The number of worker processes used for validating the
+                     Blocks of a file opened read-only.
+        :type jobs: int
+        :param since: Only validate objects updated after this time (POSIX
+                      time).
+        :type since: int
+
+        :returns: Dictionaries of errors and warnings indexed by object.
+        :rtype: dict
+        """
+        return validator.check_file(self, jobs, since)
 
     def pprint(self, indent=2, max_length=120, extra=True, max_depth=3):
         """
@@ -356,9 +446,13 @@ class File:
             raise NameError("Name already exist. Possible solution is to "
                             "provide a new name when copying destination "
                             "is the same as the source parent")
+        # the reserved space of buffered Properties is not copied
+        obj.file._trim_property_buffers()
         obj._parent._h5group.copy(source=src, dest=self._h5group,
                                   name=name, cls=clsname,
                                   shallow=not children, keep_id=keep_id)
+        self._refindex = None
+        self._metadata_modified(self._metadata.group[name], subtree=True)
 
         if not children:
             for prop in obj.props:
@@ -366,7 +460,13 @@ class File:
 
         return self.sections[obj.name]
 
+    def _trim_property_buffers(self):
+        for dataset, length in self._property_buffers.values():
+            dataset.shape = (length,)
+        self._property_buffers.clear()
+
     def flush(self):
+        self._trim_property_buffers()
         self._h5file.flush()
 
     def close(self):
@@ -374,10 +474,147 @@ class File:
         Closes an open file.
         """
         gc.collect()  # should handle refs better instead of calling collect()
+        if self._metadata_index is not None:
+            self._metadata_index.close()
+            self._metadata_index = None
+        self._trim_property_buffers()
         # Flush is probably unnecessary
         self._h5file.flush()
         self._h5file.close()
 
+    # reverse references
+    def _reference_index(self):
+        if self._refindex is None:
+            self._refindex = H5ReferenceIndex(self._h5file)
+        return self._refindex
+
+    def _update_reference(self, referrer, link, target_id, remove=False):
+        """
+        Updates the reverse reference index, if it has been built, after a
+        metadata, Section or source link of referrer was changed.
+
+        :param referrer: The entity holding the link.
+        :param link: "metadata", "link" (Section links) or "sources".
+        :param target_id: The id of the linked entity. For metadata and
+                          Section links, None means the link was removed.
+        :param remove: True if a source link was removed.
+        """
+        if self._refindex is None:
+            return
+        if link in ("metadata", "link"):
+            self._refindex.set_link(referrer._h5group, link, target_id)
+        elif remove:
+            self._refindex.remove_source(referrer._h5group, target_id)
+        else:
+            self._refindex.add_source(referrer._h5group, target_id)
+
+    def _update_parent(self, child, parent_id):
+        """
+        Records a newly created Section or Source in the reverse reference
+        index, if it has been built.
+        """
+        if self._refindex is not None:
+            self._refindex.add_child(child._h5group, parent_id)
+
+    def _parent_entity(self, child, kind):
+        """
+        Returns the parent of the Section or Source, using the reverse
+        reference index, or None for root entities.
+        """
+        index = self._reference_index()
+        if index.ambiguous(child.id):
+            h5obj = self._scan_parent(child, kind)
+        else:
+            path = index.parent(child.id)
+            h5obj = None if path is None else self._h5file[path]
+        if h5obj is None:
+            return None
+        h5group = H5Group.create_from_h5obj(h5obj)
+        if kind == "sections":
+            return Section(self, None, h5group)
+        block = self.blocks[h5obj.name.strip("/").split("/")[1]]
+        return Source(self, block, h5group)
+
+    def _scan_parent(self, child, kind):
+        """
+        Searches the Section or Source trees for the HDF5 group of the parent
+        of the child. Used for ids that the reference index can not resolve
+        because several copies of the entity exist.
+        """
+        addr = _address(child._h5group.group)
+        if kind == "sections":
+            roots = [self._metadata.group]
+        else:
+            roots = [blk["sources"] for blk in self._data.group.values()
+                     if "sources" in blk]
+        fifo = deque(obj for root in roots for obj in root.values()
+                     if isinstance(obj, h5py.Group))
+        while fifo:
+            h5obj = fifo.popleft()
+            children = h5obj.get(kind)
+            if not isinstance(children, h5py.Group):
+                continue
+            groups = [obj for obj in children.values()
+                      if isinstance(obj, h5py.Group)]
+            # the child may have been reached through a link with another
+            # name, so it is identified by its address
+            if any(_address(obj) == addr for obj in groups):
+                return h5obj
+            fifo.extend(groups)
+        return None
+
+    def _referring_entities(self, target_id, kind):
+        """
+        Returns all entities of the given kind that link to the Section or
+        Source with the given id, using the reverse reference index.
+        """
+        classes = {"groups": Group, "data_arrays": DataArray, "tags": Tag,
+                   "multi_tags": MultiTag, "sources": Source}
+        entities = []
+        for path in self._reference_index().referrers(target_id, kind):
+            block = self.blocks[path.strip("/").split("/")[1]]
+            if kind == "blocks":
+                entities.append(block)
+                continue
+            h5group = H5Group.create_from_h5obj(self._h5file[path])
+            entities.append(classes[kind](self, block, h5group))
+        return entities
+
+    def delete_entities(self, ids):
+        """
+        Deletes the entities with the given ids and all links referring to
+        them from the file. Child Sections and Sources of deleted Sections and
+        Sources are deleted as well.
+
+        Deleting several entities at once is considerably faster than
+        deleting them one by one: Sections and Sources are removed using the
+        reverse reference index, all other entities in a single pass over the
+        file.
+
+        :param ids: The ids of the entities to delete.
+        :type ids: list of str
+        """
+        # the addresses of deleted datasets may be reused by new ones
+        self._trim_property_buffers()
+        index = self._reference_index()
+        ids = index.descendants(ids)
+        paths = index.link_paths(ids)
+        if paths is None:
+            paths = self._h5group.delete_all(ids)
+        else:
+            self._h5group.delete_links(paths)
+        index.forget(ids)
+        for path in paths:
+            path = "/" + path.lstrip("/")
+            if path.startswith("/metadata/"):
+                self._metadata_modified(path, subtree=True)
+        # emptied link groups restart the creation order of their links,
+        # which the stamps of the lookup indexes do not notice
+        self._name_indexes.clear()
+        self._data_extents.clear()
+        if self._property_values is not None:
+            self._property_values.clear()
+
     # Block
     def create_block(self, name="", type_="", compression=Compression.Auto,
                      copy_from=None, keep_copy_id=True):
@@ -410,6 +647,8 @@ class File:
                                 "is the same as the source parent")
             blk = copy_from._parent._h5group.copy(source=src, dest=self._h5group, name=name, cls=clsname,
                                                   keep_id=keep_copy_id)
+            # the copy keeps its metadata and source links
+            self._refindex = None
             entity_id = blk.attrs["entity_id"]
             return self.blocks[entity_id]
 
@@ -441,6 +680,284 @@ class File:
         sec = Section.create_new(self, self, self._metadata, name, type_, oid)
         return sec
 
+    def import_metadata(self, tree):
+        """
+        Creates metadata Sections with their Properties and subsections from
+        nested dictionaries in a single pass. All new entities share the same
+        creation time and the values of each Property are written at once.
+
+        The dictionary of a Section may contain the keys ``type``, ``id``,
+        ``definition``, ``reference``, ``repository``, ``properties`` (mapping
+        Property names to values) and ``sections`` (mapping subsection names to
+        Section dictionaries). The values of a Property are given either
+        directly, as a single value or a list, or as a dictionary with the
+        key ``values`` and the optional attributes of the Property
+        (``unit``, ``definition``, ``uncertainty``, ...), as returned by
+        :meth:`nixio.Section.export_dict`. Empty Properties need a ``dtype``.
+
+        Example::
+
+            nixfile.import_metadata({
+                "session": {
+                    "type": "recording",
+                    "properties": {"date": "2024-01-01", "trials": 40},
+                    "sections": {
+                        "amplifier": {
+                            "type": "hardware",
+                            "properties": {"gain": {"values": 100,
+                                                    "unit": "dB"}}
+                        }
+                    }
+                }
+            })
+
+        :param tree: Maps the names of new root Sections to their
+                     dictionaries.
+        :type tree: dict
+
+        :returns: The new root Sections.
+        :rtype: list of nixio.Section
+        """
+        for name in tree:
+            if name in self._metadata:
+                raise DuplicateName("import_metadata")
+        time = util.now_int()
+        sections = list()
+        # the root Section being imported
+        current = None
+        try:
+            for secname, sectree in tree.items():
+                current = secname
+                sections.append(Section._import_dict(
+                    self, self, self._metadata, secname, sectree, time
+                ))
+                current = None
+        except Exception:
+            # do not leave partially imported trees behind
+            if current is not None and current in self._metadata:
+                sections.append(current)
+            self.sections.delete_many(sections)
+            raise
+        return sections
+
+    def _raw_property_values(self, h5props, name):
+        # values of a Property, decoded as in Property.values, read through
+        # the low level h5py API; None if the Property does not exist
+        if self._property_buffers:
+            # the datasets must not contain the space reserved for appends
+            self._trim_property_buffers()
+        if not h5props.id.links.exists(name.encode("utf-8")):
+            return None
+        if self._format_version < (1, 1, 1):
+            h5dataset = H5DataSet.create_from_h5obj(h5props[name])
+            return Property(self, None, h5dataset).values
+        dsid = h5py.h5d.open(h5props.id, name.encode("utf-8"))
+        data = np.empty(dsid.shape, dtype=dsid.dtype)
+        if data.size:
+            dsid.read(h5py.h5s.ALL, h5py.h5s.ALL, data)
+        if data.dtype.kind == "S":
+            return tuple(np.char.decode(data).tolist())
+        if data.dtype.kind == "O":
+            return tuple(val.decode() if isinstance(val, bytes) else val
+                         for val in data)
+        return tuple(data.tolist())
+
+    def metadata_table(self, section_type=None, properties=None, block=None,
+                       name="metadata"):
+        """
+        Collects the values of Properties across all Sections of the file
+        into a table with one row per Section.
+
+        The metadata tree is traversed once on the HDF5 level; only the
+        datasets of the requested Properties are read and no Section or
+        Property entities are created.
+
+        The table has the columns ``section_id`` and ``section_name`` followed
+        by one column per Property. Columns in which every Section has
+        exactly one value are returned as plain numpy arrays. Otherwise the
+        column is an object array holding None for Sections without the
+        Property and tuples for Properties with several values.
+
+        :param section_type: Only include Sections of this type. Regular
+                             expressions and callables are supported as in
+                             find_sections. None includes all Sections.
+        :type section_type: str
+        :param properties: The names of the Properties to include. None
+                           includes every Property name found.
+        :type properties: list of str
+        :param block: If given, the table is stored as a DataFrame in this
+                      Block. All Property columns must then hold exactly one
+                      value per Section.
+        :type block: nixio.Block
+        :param name: The name of the DataFrame created in block.
+        :type name: str
+
+        :returns: The columns of the table or the new DataFrame.
+        :rtype: dict of str to numpy.ndarray or nixio.DataFrame
+        """
+        preds = finders._predicates(type_=section_type)
+        props = None if properties is None else list(properties)
+        if props is not None:
+            for pname in ("section_id", "section_name"):
+                if pname in props:
+                    raise ValueError("Property name '{}' is reserved for "
+                                     "the Section columns".format(pname))
+
+        def decode(attr):
+            return attr.decode() if isinstance(attr, bytes) else attr
+
+        ids, names, cells = list(), list(), dict()
+        h5sections = finders._section_groups(self._metadata.group, preds)
+        for nrow, h5sec in enumerate(h5sections):
+            ids.append(decode(h5sec.attrs["entity_id"]))
+            names.append(decode(h5sec.attrs["name"]))
+            h5props = h5sec.get("properties")
+            if h5props is None:
+                continue
+            for pname in (h5props if props is None else props):
+                values = self._raw_property_values(h5props, pname)
+                if values is not None:
+                    cells.setdefault(pname, dict())[nrow] = values
+
+        if props is None:
+            props = list(cells)
+        table = {"section_id": np.array(ids, dtype=object),
+                 "section_name": np.array(names, dtype=object)}
+        for pname in props:
+            column = cells.get(pname, dict())
+            if (len(column) == len(ids) and
+                    all(len(vals) == 1 for vals in column.values())):
+                table[pname] = np.array([column[row][0]
+                                         for row in range(len(ids))])
+            else:
+                values = np.empty(len(ids), dtype=object)
+                for row, vals in column.items():
+                    values[row] = vals[0] if len(vals) == 1 else vals
+                table[pname] = values
+
+        if block is None:
+            return table
+        for pname in props:
+            if table[pname].dtype == object:
+                raise ValueError("Property '{}' does not have exactly one "
+                                 "value in every Section".format(pname))
+        columns = list(table)
+        dtypes = [str, str] + [table[pname].dtype.type for pname in props]
+        data = list(zip(*(table[col] for col in columns)))
+        return block.create_data_frame(name, "nix.metadata_table",
+                                       col_names=columns, col_dtypes=dtypes,
+                                       data=data)
+
+    def _metadata_search_index(self, index_path=None):
+        index = self._metadata_index
+        created = index is None or index.path != index_path
+        if created:
+            if index is not None:
+                index.close()
+            # imported on first use to keep sqlite3 out of the file import
+            from .util.metadata_index import MetadataIndex
+            index = self._metadata_index = MetadataIndex(self, index_path)
+        changes = self._metadata_changes
+        self._metadata_changes = dict()
+        if changes is None or (created and changes):
+            # changes made through this handle do not show in the
+            # fingerprint of the file before it is flushed
+            index.rebuild()
+        elif changes:
+            index.update_sections(changes)
+        elif created or self.mode == FileMode.ReadOnly:
+            index.update()
+        return index
+
+    def _metadata_modified(self, target, subtree=False):
+        """
+        Records a change of a Section or Property for the next update of the
+        metadata search index.
+
+        :param target: The HDF5 object of the Section or Property or its
+                       path.
+        :param subtree: Whether the subsections of the Section changed too.
+        """
+        if self._metadata_index is None:
+            # the index is built from scratch when it is created
+            self._metadata_changes = None
+        if self._metadata_changes is None:
+            return
+        path = target if isinstance(target, str) else target.name
+        match = _METADATA_PATH.fullmatch(path)
+        if match is None:
+            # e.g., Sections reached through the links of data objects
+            self._metadata_changes = None
+            return
+        section = match.group("section")
+        subtree = subtree and match.group("property") is None
+        changes = self._metadata_changes
+        changes[section] = changes.get(section, False) or subtree
+
+    def search_metadata(self, name=None, type_=None, value=None,
+                        kind="sections", case_sensitive=False,
+                        full_match=False, index_path=None):
+        """
+        Searches the metadata of the file using a search index of the names
+        and types of all Sections and the names and values of all
+        Properties. The index is built in a single pass over the metadata
+        tree.
+
+        If the file is opened read-only, the index is built once and reused
+        for all searches. With ``index_path``, it is stored in an SQLite
+        database at this location (see
+        ``nixio.util.metadata_index.MetadataIndex.sidecar_path``) and reused
+        across sessions as long as the file does not change. Changes of the
+        metadata made through this File are applied to the index at the
+        next search, by indexing the changed Sections again. Changes of
+        Sections reached through the links of data objects (e.g.,
+        ``DataArray.metadata``) can not be located in the metadata tree and
+        lead to a full rebuild of the index.
+
+        By default, the patterns are case insensitive partial matches.
+
+        :param name: Pattern for the name of the Sections or Properties.
+        :type name: str
+        :param type_: Pattern for the type of the Sections; for Properties,
+                      the type of the Section containing them.
+        :type type_: str
+        :param value: Pattern for one of the values of the Properties
+                      (compared as strings). Only used for Properties.
+        :type value: str
+        :param kind: "sections" or "properties".
+        :type kind: str
+        :param case_sensitive: Match the case of names, types and values.
+        :type case_sensitive: bool
+        :param full_match: Patterns must match the whole name, type or value.
+        :type full_match: bool
+        :param index_path: Path of the SQLite database storing the index or
+                           None to keep the index in memory.
+        :type index_path: str
+
+        :returns: The matching Sections or Properties.
+        :rtype: list of nixio.Section or list of nixio.Property
+        """
+        if kind not in ("sections", "properties"):
+            raise ValueError("kind must be 'sections' or 'properties'")
+        index = self._metadata_search_index(index_path)
+        if kind == "sections":
+            if value is not None:
+                raise ValueError("Sections can not be searched by value")
+            return [Section(self, None,
+                            H5Group.create_from_h5obj(self._h5file[path]))
+                    for path in index.sections(name, type_, case_sensitive,
+                                               full_match)]
+        props = list()
+        for path in index.properties(name, value, type_, case_sensitive,
+                                     full_match):
+            h5dataset = self._h5file[path]
+            section = Section(self, None, H5Group.create_from_h5obj(
+                h5dataset.parent.parent
+            ))
+            props.append(Property(self, section,
+                                  H5DataSet.create_from_h5obj(h5dataset)))
+        return props
+
     @property
     def blocks(self):
         """
@@ -454,7 +971,8 @@ class File:
             self._blocks = Container("data", self, self, Block)
         return self._blocks
 
-    def find_sections(self, filtr=lambda _: True, limit=None):
+    def find_sections(self, filtr=lambda _: True, limit=None, name=None,
+                     type_=None, attrs=None):
         """
         Get all sections and their child sections recursively.
 
@@ -468,13 +986,21 @@ class File:
         :type filtr:  function
         :param limit: The maximum depth of traversal
         :type limit:  int
+        :param name: Condition on the name: a value, a compiled regular
+                     expression that is searched for, or a function of
+                     the name.
+        :param type_: Condition on the type, see name.
+        :param attrs: Conditions on further HDF5 attributes (e.g.,
+                      definition), see name.
+        :type attrs: dict
 
         :returns: A list containing the matching sections.
         :rtype: list of nixio.Section
         """
         if limit is None:
             limit = maxsize
-        return finders._find_sections(self, filtr, limit)
+        preds = finders._predicates(name, type_, attrs)
+        return finders._find_sections(self, filtr, limit, preds)
 
     @property
     def sections(self):
@@ -125,8 +125,10 @@ class Group(Entity):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
         self._h5group.create_link(sect, "metadata")
+        self.file._update_reference(self, "metadata", sect.id)
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
             self._h5group.delete("metadata")
+            self.file._update_reference(self, "metadata", None)
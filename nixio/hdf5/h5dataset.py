@@ -6,10 +6,39 @@
 # Redistribution and use in source and binary forms, with or without
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
+import h5py
 import numpy as np
 from ..datatype import DataType
 from .. import util
 
+
+# NIX entities carry more attributes than the HDF5 default limit of 8 for
+# compact attribute storage; keep up to MAX_COMPACT_ATTRS attributes in the
+# object header instead of a separate heap and B-tree per object
+MAX_COMPACT_ATTRS = 32
+MIN_DENSE_ATTRS = 24
+
+# datasets of at most COMPACT_MAX_BYTES can be stored in the object header
+COMPACT_MAX_BYTES = 4096
+# variable length values (e.g. strings) are kept in the global heap; the
+# dataset stores a reference of VLEN_ITEM_BYTES for each of them
+VLEN_ITEM_BYTES = 16
+
+
+def stored_itemsize(dtype):
+    """
+    Returns the number of bytes per element that a dataset of the given type
+    keeps in its own storage, i.e., the size of the heap references for
+    variable length types.
+
+    :rtype: int
+    """
+    dtype = np.dtype(dtype)
+    if dtype.hasobject:
+        return VLEN_ITEM_BYTES
+    return dtype.itemsize
+
+
 def ensure_str(s):
     if isinstance(s, bytes):
         return s.decode()
@@ -17,24 +46,41 @@ def ensure_str(s):
         return s
 
 
+def make_dcpl(compact=False):
+    dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+    dcpl.set_attr_phase_change(MAX_COMPACT_ATTRS, MIN_DENSE_ATTRS)
+    if compact:
+        dcpl.set_layout(h5py.h5d.COMPACT)
+    return dcpl
+
+
 class H5DataSet:
 
     def __init__(self, parent, name, dtype=None, shape=None,
-                 compression=False):
+                 compression=False, contiguous=False, compact=False):
         self._parent = parent
         self.name = name
         if (dtype is None) or (shape is None):
             self.dataset = self._parent[name]
         else:
-            maxshape = (None,) * len(shape)
             if dtype == DataType.String:
                 dtype = util.vlen_str_dtype
-            comprargs = dict()
+            layoutargs = {"chunks": True, "maxshape": (None,) * len(shape),
+                          "dcpl": make_dcpl()}
             if compression:
-                comprargs = {"compression": "gzip", "compression_opts": 6}
+                layoutargs["compression"] = "gzip"
+                layoutargs["compression_opts"] = 6
+            elif compact:
+                # compact datasets are stored in the object header; they have
+                # a fixed shape and need no separate data allocation
+                layoutargs = {"chunks": None, "maxshape": None,
+                              "dcpl": make_dcpl(compact=True)}
+            elif contiguous:
+                # contiguous datasets have a fixed shape and no chunk index
+                layoutargs = {"chunks": None, "maxshape": None,
+                              "dcpl": make_dcpl()}
             self.dataset = self._parent.require_dataset(
-                name, shape=shape, dtype=dtype, chunks=True, maxshape=maxshape,
-                **comprargs
+                name, shape=shape, dtype=dtype, **layoutargs
             )
         self.h5obj = self.dataset
 
@@ -55,8 +101,12 @@ class H5DataSet:
     def read_data(self, slc=None):
         if slc is None:
             slc = slice(None, None, None)
+        dataset = self.dataset
+        if dataset.dtype == util.vlen_str_dtype:
+            # decode all strings at once instead of element by element
+            dataset = dataset.asstr()
         try:
-            data = self.dataset[slc]
+            data = dataset[slc]
         except ValueError as ve_exc:
             # h5py throws ValueError for out-of-bounds index
             # Let's change it to IndexError
@@ -65,12 +115,43 @@ class H5DataSet:
             # h5py 2.10 in Python2 throws TypeError for out-of-bounds index
             # Let's change it to IndexError
             raise IndexError(te_exc)
-        if data.dtype == util.vlen_str_dtype:
+        if dataset is self.dataset and data.dtype == util.vlen_str_dtype:
+            # string column of a compound dataset
             data = np.reshape(np.array(list(map(ensure_str, data.ravel())), dtype=object), data.shape)
         elif data.dtype.fields:
             data = self._convert_string_cols(data)
         return data
 
+    def read_direct(self, dest, source_sel=None, dest_sel=None):
+        """
+        Reads the data selected by ``source_sel`` directly into the region
+        ``dest_sel`` of the preallocated array ``dest`` without creating an
+        intermediate array. Datasets holding variable length strings can not
+        be read directly and are copied into ``dest`` instead.
+        """
+        if self.dataset.dtype.hasobject or dest.dtype.hasobject:
+            data = self.read_data(source_sel)
+            if dest_sel is None:
+                dest_sel = Ellipsis
+            dest[dest_sel] = data
+            return
+        self.dataset.read_direct(dest, source_sel, dest_sel)
+
+    def write_direct(self, data, source_sel=None, dest_sel=None):
+        """
+        Writes the region ``source_sel`` of the array ``data`` directly into
+        the dataset selection ``dest_sel``. Strings and other object data
+        are converted by h5py and written through a regular selection.
+        """
+        data = np.ascontiguousarray(data)
+        if (data.dtype.kind == "U" or data.dtype.hasobject or
+                self.dataset.dtype.hasobject):
+            if source_sel is not None:
+                data = data[source_sel]
+            self.write_data(data, dest_sel)
+            return
+        self.dataset.write_direct(data, source_sel, dest_sel)
+
     @staticmethod
     def _convert_string_cols(data):
         str_cols = list()
@@ -110,8 +191,81 @@ class H5DataSet:
 
     @shape.setter
     def shape(self, shape):
+        if self.dataset.chunks is None:
+            raise ValueError("Cannot resize contiguous dataset {}: "
+                             "only chunked datasets can change "
+                             "shape".format(self.dataset.name))
         self.dataset.resize(shape)
 
+    @property
+    def is_compact(self):
+        """
+        True if the data is stored in the object header of the dataset.
+        """
+        return (self.dataset.id.get_create_plist().get_layout() ==
+                h5py.h5d.COMPACT)
+
+    def make_chunked(self):
+        """
+        Replaces a contiguous or compact dataset by a chunked and resizable
+        copy with the same name, data and attributes. The copy keeps the
+        position of the dataset in the creation order of its group.
+        """
+        if self.dataset.chunks is not None:
+            return
+        later = self._later_links()
+        old = self.dataset
+        tmpname = "{}.chunked".format(self.name)
+        new = self._parent.create_dataset(
+            tmpname, shape=old.shape, dtype=old.dtype, chunks=True,
+            maxshape=(None,) * len(old.shape), dcpl=make_dcpl()
+        )
+        if old.size:
+            new[...] = old[...]
+        for key in old.attrs:
+            attr = old.attrs.get_id(key)
+            new.attrs.create(key, old.attrs[key], dtype=attr.dtype)
+        del self._parent[self.name]
+        self._parent.move(tmpname, self.name)
+        self.dataset = self.h5obj = self._parent[self.name]
+        # the copy was created last; recreate the links that followed the
+        # original so that they follow the copy again
+        for name in later:
+            self._parent[tmpname] = self._parent[name]
+            del self._parent[name]
+            self._parent.move(tmpname, name)
+
+    def _later_links(self):
+        """
+        Returns the names of the links created after the dataset in its
+        group, if the group tracks the creation order.
+        """
+        gcpl = self._parent.id.get_create_plist()
+        if not gcpl.get_link_creation_order() & h5py.h5p.CRT_ORDER_TRACKED:
+            return []
+        names = []
+        self._parent.id.links.iterate(names.append,
+                                      idx_type=h5py.h5.INDEX_CRT_ORDER,
+                                      order=h5py.h5.ITER_INC)
+        names = [name.decode() for name in names]
+        return names[names.index(self.name) + 1:]
+
+    @property
+    def is_contiguous(self):
+        """
+        True if the dataset uses the contiguous storage layout, i.e., it is
+        neither chunked nor filtered nor stored in the object header.
+        """
+        return self.dataset.chunks is None and not self.is_compact
+
+    @property
+    def offset(self):
+        """
+        The byte offset of the raw data in the file or None if the dataset is
+        chunked or its storage has not been allocated yet.
+        """
+        return self.dataset.id.get_offset()
+
     @property
     def dtype(self):
         dtype = self.dataset.dtype
@@ -10,7 +10,7 @@
 import h5py
 import numpy as np
 
-from .h5dataset import H5DataSet
+from .h5dataset import H5DataSet, MAX_COMPACT_ATTRS, MIN_DENSE_ATTRS
 from ..datatype import DataType
 
 from .. import util
@@ -33,6 +33,7 @@ class H5Group:
             gcpl = h5py.h5p.create(h5py.h5p.GROUP_CREATE)
             flags = h5py.h5p.CRT_ORDER_TRACKED | h5py.h5p.CRT_ORDER_INDEXED
             gcpl.set_link_creation_order(flags)
+            gcpl.set_attr_phase_change(MAX_COMPACT_ATTRS, MIN_DENSE_ATTRS)
             name = self.name.encode("utf-8")
             gid = h5py.h5g.create(self._parent.id, name, gcpl=gcpl)
             self.group = h5py.Group(gid)
@@ -81,7 +82,8 @@ class H5Group:
         self._create_h5obj()
         return H5Group(self.group, name, create)
 
-    def create_dataset(self, name, shape, dtype, compression=False):
+    def create_dataset(self, name, shape, dtype, compression=False,
+                       contiguous=False, compact=False):
         """
         Creates a dataset object under the current group with a given name,
         shape, and type.
@@ -90,10 +92,17 @@ class H5Group:
         :param shape: tuple representing the shape of the dataset
         :param dtype: the type of the data for this dataset (DataType)
         :param compression: whether to compress the data (default: False)
+        :param contiguous: use the contiguous (fixed shape, unchunked) storage
+                           layout; ignored when compression is enabled
+                           (default: False)
+        :param compact: store the data in the object header of the dataset
+                        (fixed shape, for small datasets only); ignored when
+                        compression is enabled (default: False)
         :return: a new H5DataSet object
         """
         self._create_h5obj()
-        return H5DataSet(self.group, name, dtype, shape, compression)
+        return H5DataSet(self.group, name, dtype, shape, compression,
+                         contiguous, compact)
 
     def get_dataset(self, name):
         """
@@ -191,6 +200,44 @@ class H5Group:
                     return item
         raise KeyError("Item not found '{}'".format(id_))
 
+    def link_names(self):
+        """
+        Returns the names of all children in creation order. The names are
+        collected in a single iteration over the links of the group, without
+        opening the children.
+
+        :rtype: list of str
+        """
+        if not self.group:
+            return []
+        names = []
+        self.group.id.links.iterate(names.append,
+                                    idx_type=h5py.h5.INDEX_CRT_ORDER,
+                                    order=h5py.h5.ITER_INC)
+        return [name.decode() for name in names]
+
+    def link_stamp(self):
+        """
+        Returns the number of children and the creation order number of the
+        most recently created one. The creation order number grows with every
+        added link, so the stamp changes whenever links are added or removed
+        as long as the group is not emptied, which restarts the creation
+        order. It is used to check whether indexes of the children are
+        current.
+
+        :rtype: tuple
+        """
+        if not self.group:
+            return 0, None
+        count = len(self.group)
+        if not count:
+            return 0, None
+        links = self.group.id.links
+        last, _ = links.iterate(lambda n: n,
+                                idx_type=h5py.h5.INDEX_CRT_ORDER,
+                                order=h5py.h5.ITER_DEC)
+        return count, links.get_info(last).corder
+
     def get_by_pos(self, pos):
         if not self.group:
             raise IndexError
@@ -225,24 +272,41 @@ class H5Group:
         """
         Deletes all references to a given list of objects, identified by their
         entity_id, below the current object.
+
+        :returns: The paths of the deleted links.
+        :rtype: list of str
+        """
+        # Visit every link below the current group once and collect the ones
+        # pointing to one of the objects. Links are deleted after the visit,
+        # deepest first, so that links inside deleted objects are still
+        # reachable when they are removed.
+        eid = set(eid)
+        found = []
+
+        def find_links(name):
+            name = name.decode()
+            obj = self._group.get(name)
+            if obj is None:
+                return None
+            entity_id = obj.attrs.get("entity_id")
+            if isinstance(entity_id, bytes):
+                entity_id = entity_id.decode()
+            if entity_id in eid:
+                found.append(name)
+            return None
+
+        self._group.id.links.visit(find_links)
+        self.delete_links(found)
+        return found
+
+    def delete_links(self, paths):
+        """
+        Deletes the links with the given paths below the current group.
+        Nested paths are deleted first and missing paths are ignored.
         """
-        # Use visit_items to traverse groups and check their children.
-        # visit_items visits each item only once, so instead of checking
-        # whether each item is the one we're searching for, we check whether
-        # it *contains* the one we're searching for
-        # We delete the child as soon as we find it; this doesn't cause
-        # iteration issues since it's deleted before descending into the
-        # children of the current group
-
-        def delete_by_id(_, obj):
-            if not isinstance(obj, h5py.Group):
-                return
-            grp = self.create_from_h5obj(obj)
-            for child in grp:
-                if child.get_attr("entity_id") in eid:
-                    del grp[child.name]
-
-        self._group.visititems(delete_by_id)
+        for path in sorted(paths, key=lambda p: p.count("/"), reverse=True):
+            if path in self._group:
+                del self._group[path]
 
     def set_attr(self, name, value):
         self._create_h5obj()
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2024, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+import h5py
+
+
+# kinds of entities that can link to a metadata Section
+METADATA_REFERRERS = ("groups", "data_arrays", "data_frames", "tags",
+                      "multi_tags", "sources")
+# kinds of entities that can link to a Source
+SOURCE_REFERRERS = ("groups", "data_arrays", "tags", "multi_tags")
+
+
+def _entity_id(obj):
+    if not isinstance(obj, h5py.Group):
+        return None
+    eid = obj.attrs.get("entity_id")
+    if isinstance(eid, bytes):
+        eid = eid.decode()
+    return eid
+
+
+def _address(obj):
+    """
+    Returns the address of an HDF5 object in its file. Unlike the entity id
+    (which copies may share) and the path (an object reached through links
+    has several), it identifies the object uniquely.
+    """
+    return h5py.h5o.get_info(obj.id).addr
+
+
+def _referrer_kind(path):
+    """
+    Determines the kind of the entity at the given path ("blocks", "groups",
+    "data_arrays", ...). Entities reached through a link container (e.g., a
+    Tag in a Group) keep the name of their kind.
+    """
+    parts = path.strip("/").split("/")
+    if parts[0] == "metadata":
+        return "sections"
+    if len(parts) == 2:
+        return "blocks"
+    return parts[-2]
+
+
+class H5ReferenceIndex:
+    """
+    Reverse index of the links in a NIX file.
+
+    The index maps the id of a linked Section or Source to the entities
+    linking to it, grouped by the kind of the referring entity, and the id of
+    each Section and Source to its parent. Referring entities are identified
+    by the address of their HDF5 group, so copies that kept the id of the
+    original are told apart; ids of Sections and Sources that occur more
+    than once are reported by ``ambiguous`` and must be resolved by the
+    caller. It is built in a single pass over
+    the links below the data and metadata roots and kept up to date through
+    the ``set_link``, ``add_source``, ``remove_source``, ``add_child`` and
+    ``forget`` methods. Entities are stored with the HDF5 path they were
+    found at; paths that became invalid (e.g., by deleting the referrer) are
+    detected on lookup, in which case the index is rebuilt.
+    """
+
+    def __init__(self, h5file):
+        self._h5file = h5file
+        self._refs = dict()
+        self._links = dict()
+        self._tree = dict()
+        self._duplicates = set()
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Rebuilds the index from the links in the file.
+        """
+        self._refs = dict()
+        self._links = dict()
+        self._tree = dict()
+        self._duplicates = set()
+        if "metadata" in self._h5file:
+            self._visit_metadata(self._h5file["metadata"])
+        if "data" in self._h5file:
+            self._visit_data(self._h5file["data"])
+
+    def _visit_metadata(self, metadata):
+        def visit(name):
+            if isinstance(name, bytes):
+                name = name.decode()
+            parts = name.split("/")
+            if len(parts) > 1 and parts[-1] == "link":
+                # Section linking to another Section
+                referrer = metadata["/".join(parts[:-1])]
+                rid = _entity_id(referrer)
+                tid = _entity_id(metadata.get(name))
+                if rid is not None and tid is not None:
+                    path = "metadata/" + "/".join(parts[:-1])
+                    self._add(referrer, path, rid, tid, "link")
+                    return None
+            if len(parts) == 1:
+                parent = None
+            elif parts[-2] == "sections":
+                parent = _entity_id(metadata["/".join(parts[:-2])])
+                if parent is None:
+                    return None
+            else:
+                return None
+            eid = _entity_id(metadata.get(name))
+            if eid is not None:
+                container = "metadata" if parent is None else "sections"
+                self._add_node(eid, parent, container, parts[-1])
+            return None
+
+        metadata.id.links.visit(visit)
+
+    def _visit_data(self, data):
+        def visit(name):
+            if isinstance(name, bytes):
+                name = name.decode()
+            parts = name.split("/")
+            if len(parts) == 3 and parts[1] == "sources":
+                # root source of a block
+                eid = _entity_id(data.get(name))
+                if eid is not None:
+                    container = "data/{}/sources".format(parts[0])
+                    self._add_node(eid, None, container, parts[-1])
+                return None
+            if (len(parts) >= 5 and parts[-2] == "sources" and
+                    parts[-4] == "sources"):
+                # child source
+                parent = _entity_id(data["/".join(parts[:-2])])
+                eid = _entity_id(data.get(name))
+                if parent is not None and eid is not None:
+                    self._add_node(eid, parent, "sources", parts[-1])
+                return None
+            if parts[-1] == "metadata" and (
+                    len(parts) == 2 or
+                    (len(parts) >= 4 and parts[-3] in METADATA_REFERRERS)):
+                referrer = "/".join(parts[:-1])
+                link = "metadata"
+            elif (len(parts) >= 4 and parts[-2] == "sources" and
+                  parts[-4] in SOURCE_REFERRERS):
+                referrer = "/".join(parts[:-2])
+                link = "sources"
+            else:
+                return None
+            h5referrer = data[referrer]
+            rid = _entity_id(h5referrer)
+            tid = _entity_id(data.get(name))
+            if rid is None or tid is None:
+                # not an entity link, e.g. a Section named "metadata"
+                return None
+            self._add(h5referrer, "data/" + referrer, rid, tid, link)
+            return None
+
+        data.id.links.visit(visit)
+
+    def _add_node(self, eid, parent, container, name):
+        if eid in self._tree:
+            self._duplicates.add(eid)
+        self._tree[eid] = (parent, container, name)
+
+    def _add(self, h5obj, path, rid, tid, link, kind=None):
+        if kind is None:
+            kind = _referrer_kind(path)
+        addr = _address(h5obj)
+        kinds = self._refs.setdefault(tid, dict())
+        kinds.setdefault(kind, dict())[addr] = (rid, path, link)
+        if link != "sources":
+            self._links[(addr, link)] = (rid, tid)
+
+    def _remove(self, addr, tid):
+        for referrers in self._refs.get(tid, dict()).values():
+            referrers.pop(addr, None)
+
+    def set_link(self, h5group, link, target_id):
+        """
+        Records that the entity stored in h5group links to the given Section,
+        replacing its previous link of the same name.
+
+        :param h5group: The group of the referring entity.
+        :type h5group: nixio.hdf5.H5Group
+        :param link: "metadata" or "link" (a Section linking to another
+                     Section).
+        :type link: str
+        :param target_id: The id of the Section or None if the link was
+                          removed.
+        :type target_id: str
+        """
+        h5obj = h5group.group
+        addr = _address(h5obj)
+        old = self._links.pop((addr, link), None)
+        if old is not None:
+            self._remove(addr, old[1])
+        if target_id is not None:
+            kind = "sections" if link == "link" else None
+            rid = h5group.get_attr("entity_id")
+            self._add(h5obj, h5obj.name, rid, target_id, link, kind)
+
+    def add_source(self, h5group, source_id):
+        """
+        Records that the entity stored in h5group links to the given Source.
+        """
+        h5obj = h5group.group
+        rid = h5group.get_attr("entity_id")
+        self._add(h5obj, h5obj.name, rid, source_id, "sources")
+
+    def remove_source(self, h5group, source_id):
+        """
+        Records that the entity stored in h5group no longer links to the
+        given Source.
+        """
+        self._remove(_address(h5group.group), source_id)
+
+    def add_child(self, h5group, parent_id):
+        """
+        Records a newly created Section or Source.
+
+        :param h5group: The group of the new entity.
+        :type h5group: nixio.hdf5.H5Group
+        :param parent_id: The id of the parent Section or Source or None for
+                          root entities.
+        :type parent_id: str
+        """
+        eid = h5group.get_attr("entity_id")
+        container = h5group.group.parent.name.strip("/")
+        if parent_id is not None:
+            container = container.split("/")[-1]
+        self._add_node(eid, parent_id, container, h5group.name)
+
+    def forget(self, ids):
+        """
+        Removes deleted entities from the index, both as link targets and as
+        referrers.
+
+        :param ids: The ids of the deleted entities.
+        :type ids: iterable of str
+        """
+        ids = set(ids)
+        for eid in ids:
+            self._refs.pop(eid, None)
+            self._tree.pop(eid, None)
+            self._duplicates.discard(eid)
+        for kinds in self._refs.values():
+            for referrers in kinds.values():
+                for addr in [addr for addr, (rid, _, _) in referrers.items()
+                             if rid in ids]:
+                    del referrers[addr]
+        self._links = {key: (rid, tid)
+                       for key, (rid, tid) in self._links.items()
+                       if rid not in ids and tid not in ids}
+
+    def ambiguous(self, eid):
+        """
+        True if several Sections or Sources with the given id or the id of
+        one of its ancestors exist (e.g., copies that kept the id of the
+        original), in which case parents and link paths can not be resolved
+        by id.
+        """
+        while eid is not None:
+            if eid in self._duplicates:
+                return True
+            eid = self._tree.get(eid, (None,))[0]
+        return False
+
+    def _path(self, eid):
+        parent, container, name = self._tree[eid]
+        if parent is None:
+            return "{}/{}".format(container, name)
+        return "{}/{}/{}".format(self._path(parent), container, name)
+
+    def _parent_path(self, child_id):
+        parent = self._tree[child_id][0]
+        if parent is None:
+            return None
+        path = self._path(parent)
+        if not self._valid(parent, path):
+            raise KeyError(parent)
+        return path
+
+    def parent(self, child_id):
+        """
+        Returns the HDF5 path of the parent of the Section or Source with the
+        given id.
+
+        :param child_id: The id of the Section or Source.
+        :type child_id: str
+
+        :returns: The path of the parent or None for root entities and
+                  unknown ids.
+        :rtype: str
+        """
+        try:
+            return self._parent_path(child_id)
+        except KeyError:
+            self.rebuild()
+        try:
+            return self._parent_path(child_id)
+        except KeyError:
+            return None
+
+    def descendants(self, ids):
+        """
+        Returns the given ids together with the ids of all child Sections and
+        Sources below them.
+
+        :param ids: Entity ids.
+        :type ids: iterable of str
+
+        :rtype: set of str
+        """
+        children = dict()
+        for eid, (parent, _, _) in self._tree.items():
+            children.setdefault(parent, []).append(eid)
+        result = set()
+        todo = list(ids)
+        while todo:
+            eid = todo.pop()
+            if eid not in result:
+                result.add(eid)
+                todo.extend(children.get(eid, []))
+        return result
+
+    def _link_paths(self, ids):
+        paths = []
+        for tid in ids:
+            path = self._path(tid)
+            if not self._valid(tid, path):
+                raise KeyError(tid)
+            paths.append(path)
+            for referrers in self._refs.get(tid, dict()).values():
+                for rid, path, link in referrers.values():
+                    if not self._valid(rid, path):
+                        raise KeyError(rid)
+                    if link == "sources":
+                        link = "sources/" + tid
+                    paths.append("{}/{}".format(path, link))
+        return paths
+
+    def link_paths(self, ids):
+        """
+        Returns the HDF5 paths of all links to the Sections and Sources with
+        the given ids, including the links in their parent containers.
+
+        :param ids: Ids of Sections and Sources.
+        :type ids: iterable of str
+
+        :returns: The link paths or None if some of the ids are not Sections
+                  or Sources known to the index or are ambiguous.
+        :rtype: list of str
+        """
+        for attempt in range(2):
+            if not all(tid in self._tree for tid in ids):
+                return None
+            if any(self.ambiguous(tid) for tid in ids):
+                return None
+            try:
+                return self._link_paths(ids)
+            except KeyError:
+                if not attempt:
+                    self.rebuild()
+        return None
+
+    def _valid(self, rid, path):
+        obj = self._h5file.get(path)
+        return obj is not None and _entity_id(obj) == rid
+
+    def referrers(self, target_id, kind):
+        """
+        Returns the paths of all entities of the given kind that link to the
+        entity with the given id.
+
+        :param target_id: The id of the linked Section or Source.
+        :type target_id: str
+        :param kind: The kind of the referring entities, i.e., "blocks",
+                     "groups", "data_arrays", "tags", "multi_tags", "sources"
+                     or "sections".
+        :type kind: str
+
+        :returns: HDF5 paths of the referring entities.
+        :rtype: list of str
+        """
+        referrers = self._refs.get(target_id, dict()).get(kind, dict())
+        if not all(self._valid(rid, path)
+                   for rid, path, _ in referrers.values()):
+            self.rebuild()
+            referrers = self._refs.get(target_id, dict()).get(kind, dict())
+        return [path for _, path, _ in referrers.values()]
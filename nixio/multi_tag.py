@@ -152,16 +152,8 @@ class MultiTag(BaseTag):
             msg = "There are no features associated with this tag!"
             raise OutOfBounds(msg)
 
-        try:
-            feat = self.features[featidx]
-        except KeyError:
-            feat = None
-            for feature in self.features:
-                if feature.data.name == featidx or feature.data.id == featidx:
-                    feat = feature
-                    break
-            if feat is None:
-                raise
+        # also looks up features by the name or id of their data
+        feat = self.features[featidx]
         data = feat.data
         if data is None:
             raise UninitializedEntity()
@@ -220,8 +212,10 @@ class MultiTag(BaseTag):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
         self._h5group.create_link(sect, "metadata")
+        self.file._update_reference(self, "metadata", sect.id)
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
             self._h5group.delete("metadata")
+            self.file._update_reference(self, "metadata", None)
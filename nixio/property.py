@@ -17,6 +17,8 @@ import numpy as np
 
 from .datatype import DataType
 from .entity import Entity
+from .hdf5.h5dataset import COMPACT_MAX_BYTES, stored_itemsize
+from .hdf5.h5references import _address
 from . import util
 
 def ensure_str(s):
@@ -94,6 +96,15 @@ class OdmlType(Enum):
         raise TypeError("No available OdmlType for type '%s'" % dtype)
 
 
+def _values_consistent(values, dtype):
+    """
+    True if all values map to the given DataType. Values of the same Python
+    type map to the same DataType, so one value per type is checked.
+    """
+    return all(DataType.get_dtype(val) == dtype
+               for val in dict(zip(map(type, values), values)).values())
+
+
 class Property(Entity):
     """An odML Property"""
     def __init__(self, nixfile, nixparent, h5dataset):
@@ -102,13 +113,20 @@ class Property(Entity):
 
     @classmethod
     def create_new(cls, nixfile, nixparent, h5parent, name,
-                   dtype, shape=None, oid=None):
-        if shape is None or shape[0] == 0:
-            shape = (8, )
+                   dtype, shape=None, oid=None, time=None):
+        compact = False
         util.check_entity_name(name)
         dtype = cls._make_h5_dtype(dtype)
-
-        h5dataset = h5parent.create_dataset(name, shape=shape, dtype=dtype)
+        if shape is None or shape[0] == 0:
+            shape = (8, )
+        elif nixfile._compact_properties:
+            # small properties rarely change size; store their values in the
+            # object header and only switch to chunks when they are resized
+            nbytes = np.prod(shape) * stored_itemsize(dtype)
+            compact = nbytes <= COMPACT_MAX_BYTES
+
+        h5dataset = h5parent.create_dataset(name, shape=shape, dtype=dtype,
+                                            compact=compact)
         h5dataset.set_attr("name", name)
 
         if not util.is_uuid(oid):
@@ -117,11 +135,100 @@ class Property(Entity):
         h5dataset.set_attr("entity_id", oid)
 
         newentity = cls(nixfile, nixparent, h5dataset)
-        newentity.force_created_at()
-        newentity.force_updated_at()
+        newentity.force_created_at(time)
+        newentity.force_updated_at(time)
+        nixfile._metadata_modified(h5dataset.dataset)
 
         return newentity
 
+    # optional attributes written and read by _import_dict and _export_dict
+    _DICT_ATTRS = ("unit", "definition", "uncertainty", "reference",
+                   "dependency", "dependency_value", "value_origin")
+
+    @staticmethod
+    def _values_dtype(values):
+        """
+        Returns the DataType of a list of values, raising a TypeError if the
+        values are of inconsistent types.
+        """
+        dtype = DataType.get_dtype(values[0])
+        if not _values_consistent(values, dtype):
+            raise TypeError("Array contains inconsistent values.")
+        return dtype
+
+    @classmethod
+    def _import_dict(cls, nixfile, nixparent, h5parent, name, prop, time):
+        """
+        Creates a Property from a single value, a list of values or a
+        dictionary as returned by _export_dict. The values are written with
+        a single dataset write. For internal use.
+        """
+        attrs = dict(prop) if isinstance(prop, dict) else {"values": prop}
+        values = attrs.pop("values", [])
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        elif isinstance(values, str) or not isinstance(values, Iterable):
+            values = [values]
+        values = list(values)
+        dtype = attrs.pop("dtype", None)
+        if values:
+            dtype = cls._values_dtype(values)
+        elif dtype is None:
+            raise TypeError("Property '{}' has no values and no "
+                            "dtype.".format(name))
+        elif isinstance(dtype, str):
+            dtype = np.dtype(dtype).type
+        odml_type = attrs.pop("odml_type", None)
+        oid = attrs.pop("id", None)
+        unknown = set(attrs).difference(cls._DICT_ATTRS)
+        if unknown:
+            raise ValueError("Unknown Property attributes: {}".format(
+                ", ".join(sorted(unknown))))
+
+        prop = cls.create_new(nixfile, nixparent, h5parent, name, dtype,
+                              (len(values),), oid, time)
+        if values:
+            prop._h5dataset.write_data(np.array(values, dtype=dtype))
+        else:
+            prop._h5dataset.shape = (0,)
+        # the attributes are checked as in their setters and written
+        # directly; the timestamps were set by create_new
+        for key, value in attrs.items():
+            if value is None:
+                continue
+            if key == "uncertainty":
+                util.check_attr_type(value, Number)
+                value = float(value)
+            else:
+                util.check_attr_type(value, str)
+                if key == "unit":
+                    value = util.units.sanitizer(value) or None
+            prop._h5dataset.set_attr(key, value)
+        if odml_type is not None:
+            odml_type = OdmlType(odml_type)
+            if values and not odml_type.compatible(values[0]):
+                raise TypeError("Type '{}' is incompatible "
+                                "with property values".format(odml_type))
+            prop._h5dataset.set_attr("odml_type", str(odml_type))
+        return prop
+
+    def _export_dict(self):
+        """
+        Returns the values and the optional attributes of the Property as a
+        dictionary. For internal use.
+        """
+        values = self.values
+        result = {"id": self.id, "values": np.array(values).tolist()}
+        if not values:
+            result["dtype"] = np.dtype(self.data_type).name
+        for key in self._DICT_ATTRS:
+            value = getattr(self, key)
+            if value is not None:
+                result[key] = value.item() if hasattr(value, "item") else value
+        if self.odml_type is not None:
+            result["odml_type"] = self.odml_type.value
+        return result
+
     @property
     def name(self):
         return self._h5dataset.get_attr("name")
@@ -152,9 +259,7 @@ class Property(Entity):
 
     @property
     def uncertainty(self):
-        dataset = self._h5dataset
-        filever = tuple(dataset._parent.file.attrs["version"])
-        if filever < (1, 1, 1):
+        if self.file._format_version < (1, 1, 1):
             val = self._h5dataset.dataset[:]
             uncertainty = val[0]["uncertainty"]
             return uncertainty
@@ -168,9 +273,7 @@ class Property(Entity):
 
     @property
     def reference(self):
-        dataset = self._h5dataset
-        filever = tuple(dataset._parent.file.attrs["version"])
-        if filever < (1, 1, 1):
+        if self.file._format_version < (1, 1, 1):
             val = self._h5dataset.dataset[:]
             reference = val[0]["reference"]
             return reference
@@ -242,24 +345,47 @@ class Property(Entity):
 
     @property
     def values(self):
-        dataset = self._h5dataset
-        filever = tuple(dataset._parent.file.attrs["version"])
-        if filever < (1, 1, 1):
-            values = self._read_old_values()
+        cache = self.file._property_values
+        if cache is not None:
+            key = self._dataset_key()
+            values = cache.get(key)
+            if values is None:
+                values = cache[key] = self._read_values()
             return values
-        if not sum(dataset.shape):
-            return tuple()
+        return self._read_values()
 
-        data = dataset.read_data()
+    def _dataset_key(self):
+        # cached values and buffers are kept by the address of the dataset,
+        # since copies of a Property may keep its id
+        return _address(self._h5dataset.dataset)
 
-        def data_to_value(dat):
-            if isinstance(dat, bytes):
-                dat = dat.decode()
-            return dat
-
-        values = tuple(map(data_to_value, data))
+    def _read_values(self):
+        if self.file._format_version < (1, 1, 1):
+            return self._read_old_values()
+        dataset = self._h5dataset
+        length = self._length()
+        if not length:
+            return tuple()
 
-        return values
+        data = dataset.read_data(np.s_[:length])
+        if data.dtype.kind == "S":
+            return tuple(np.char.decode(data).tolist())
+        if data.dtype.kind == "O":
+            return tuple(ensure_str(dat) for dat in data)
+        return tuple(data)
+
+    def _length(self):
+        # number of values, excluding the space reserved by buffered appends
+        pending = self.file._property_buffers.get(self._dataset_key())
+        if pending is not None:
+            return pending[1]
+        return self._h5dataset.shape[0]
+
+    def _invalidate_values(self):
+        self.file._metadata_modified(self._h5dataset.dataset)
+        cache = self.file._property_values
+        if cache is not None:
+            cache.pop(self._dataset_key(), None)
 
     @values.setter
     def values(self, vals):
@@ -280,23 +406,52 @@ class Property(Entity):
         vtype = self._check_new_value_types(vals)
         if vtype == DataType.String:
             vals = [str(v) for v in vals]
-        self._h5dataset.shape = np.shape(vals)
+        self._invalidate_values()
+        self.file._property_buffers.pop(self._dataset_key(), None)
+        self._resize(np.shape(vals))
         data = np.array(vals, dtype=vtype)
         self._h5dataset.write_data(data)
 
-    def extend_values(self, data):
+    def extend_values(self, data, buffered=False):
         """
         Extends values to existing data.
         Suitable when new data is nested or original data is long.
+
+        :param data: A single value or a list of values to append.
+        :param buffered: Reserve space for further values by growing the
+                         underlying dataset geometrically instead of resizing
+                         it on every call. Appending many small chunks this
+                         way takes amortised constant time per value. The
+                         reserved space is trimmed by `flush` (or File.flush
+                         and File.close); until then, the file must not be
+                         read by other programs.
+        :type buffered: bool
         """
         vtype = self._check_new_value_types(data)
 
         arr = np.array(data, dtype=vtype).flatten('C')
+        self._invalidate_values()
         dataset = self._h5dataset
-        src_len = len(self.values)
-        dlen = len(arr)
-        dataset.shape = (src_len + dlen,)
-        dataset.write_data(arr, slc=np.s_[src_len: src_len + dlen])
+        buffers = self.file._property_buffers
+        src_len = self._length()
+        end = src_len + len(arr)
+        if buffered:
+            if end > dataset.shape[0]:
+                self._resize((max(end, 2 * dataset.shape[0]),))
+            buffers[self._dataset_key()] = (dataset, end)
+        else:
+            buffers.pop(self._dataset_key(), None)
+            self._resize((end,))
+        dataset.write_data(arr, slc=np.s_[src_len:end])
+
+    def flush(self):
+        """
+        Trims the space reserved by buffered calls to `extend_values`.
+        """
+        pending = self.file._property_buffers.pop(self._dataset_key(), None)
+        if pending is not None:
+            dataset, length = pending
+            dataset.shape = (length,)
 
     def _check_new_value_types(self, data):
         if isinstance(data, (Sequence, Iterable)) and not isinstance(data, str):
@@ -315,11 +470,10 @@ class Property(Entity):
 
         def check_new_data_consistent(vtype):
             # Check if each value in the new data has the same type
-            for val in data:
-                if DataType.get_dtype(val) != vtype:
-                    raise TypeError("Array contains inconsistent values. "
-                                    "Only values of type '{}' can be "
-                                    "assigned".format(vtype))
+            if not _values_consistent(data, vtype):
+                raise TypeError("Array contains inconsistent values. "
+                                "Only values of type '{}' can be "
+                                "assigned".format(vtype))
 
         if hasattr(data, "dtype"):
             # numpy array: no need to scan values, arrays are consistent but
@@ -340,7 +494,17 @@ class Property(Entity):
         return self._h5dataset.dtype
 
     def delete_values(self):
-        self._h5dataset.shape = (0,)
+        self._invalidate_values()
+        self.file._property_buffers.pop(self._dataset_key(), None)
+        self._resize((0,))
+
+    def _resize(self, shape):
+        dataset = self._h5dataset
+        if dataset.shape == tuple(shape):
+            return
+        # compact and contiguous datasets have a fixed shape
+        dataset.make_chunked()
+        dataset.shape = shape
 
     @staticmethod
     def _make_h5_dtype(valued_type):
@@ -15,7 +15,6 @@ except ImportError:
 import numpy as np
 
 from .container import Container, SectionContainer
-from .datatype import DataType
 from .entity import Entity
 from .property import Property
 from .util import find as finders
@@ -53,14 +52,90 @@ class Section(Entity):
         self._properties = None
 
     @classmethod
-    def create_new(cls, nixfile, nixparent, h5parent, name, type_, oid=None):
+    def create_new(cls, nixfile, nixparent, h5parent, name, type_, oid=None,
+                   time=None):
         newentity = super(Section, cls).create_new(nixfile, nixparent,
-                                                   h5parent, name, type_)
+                                                   h5parent, name, type_, time)
         if util.is_uuid(oid):
             newentity._h5group.set_attr("entity_id", oid)
+        parent_id = nixparent.id if isinstance(nixparent, Section) else None
+        nixfile._update_parent(newentity, parent_id)
+        nixfile._metadata_modified(newentity._h5group.group)
 
         return newentity
 
+    # attributes written and read by _import_dict and export_dict
+    _DICT_ATTRS = ("definition", "reference", "repository")
+
+    @classmethod
+    def _import_dict(cls, nixfile, nixparent, h5parent, name, tree, time):
+        """
+        Creates a Section with its Properties and subsections from a
+        dictionary as returned by export_dict. For internal use.
+        """
+        tree = dict(tree)
+        props = tree.pop("properties", None) or dict()
+        sections = tree.pop("sections", None) or dict()
+        type_ = tree.pop("type", "undefined")
+        oid = tree.pop("id", None)
+        unknown = set(tree).difference(cls._DICT_ATTRS)
+        if unknown:
+            raise ValueError("Unknown Section attributes: {}".format(
+                ", ".join(sorted(unknown))))
+        if name in h5parent:
+            raise exceptions.DuplicateName("import_metadata")
+
+        sec = cls.create_new(nixfile, nixparent, h5parent, name, type_, oid,
+                             time)
+        for key, value in tree.items():
+            util.check_attr_type(value, str)
+            sec._h5group.set_attr(key, value)
+        if props:
+            h5props = sec._h5group.open_group("properties", True)
+            for pname, prop in props.items():
+                util.check_entity_name(pname)
+                Property._import_dict(nixfile, sec, h5props, pname, prop, time)
+        if sections:
+            h5secs = sec._h5group.open_group("sections", True)
+            for sname, subtree in sections.items():
+                child = cls._import_dict(nixfile, sec, h5secs, sname, subtree,
+                                         time)
+                child._sec_parent = sec
+        return sec
+
+    def export_dict(self, depth=None):
+        """
+        Returns the Section, its Properties and its subsections as nested
+        dictionaries. Properties are exported as dictionaries with their
+        ``values`` as a list and their optional attributes (``unit``,
+        ``definition``, ...). The result can be imported into a file using
+        :meth:`nixio.File.import_metadata` (under the name of the Section).
+        Section links are not exported.
+
+        :param depth: The number of levels of subsections to export; None
+                      exports the whole subtree, 0 only the Section itself.
+        :type depth: int
+
+        :returns: The Section as a dictionary with the keys ``id``, ``type``,
+                  ``properties``, ``sections`` and the optional attributes of
+                  the Section.
+        :rtype: dict
+        """
+        result = {"id": self.id, "type": self.type}
+        for key in self._DICT_ATTRS:
+            value = self._h5group.get_attr(key)
+            if value is not None:
+                result[key] = value
+        result["properties"] = {prop.name: prop._export_dict()
+                                for prop in self.props}
+        sections = dict()
+        if depth is None or depth > 0:
+            depth = None if depth is None else depth - 1
+            for sec in self.sections:
+                sections[sec.name] = sec.export_dict(depth)
+        result["sections"] = sections
+        return result
+
     # Section
     def create_section(self, name, type_="undefined", oid=None):
         """
@@ -118,8 +193,11 @@ class Section(Entity):
                 raise NameError("Name already exist. Possible solution is to "
                                 "provide a new name when copying destination "
                                 "is the same as the source parent")
+            # the reserved space of buffered values is not copied
+            copy_from.flush()
             objcopy = copy_from._parent._h5group.copy(source=src, dest=self._h5group, name=name,
                                                       cls=clsname, keep_id=keep_copy_id)
+            self.file._metadata_modified(objcopy)
 
             id_ = objcopy.attrs["entity_id"]
             return self.props[id_]
@@ -142,24 +220,14 @@ class Section(Entity):
             raise TypeError("Please provide either a non empty value or a DataType.")
 
         else:
-            # Make sure all values are of the same data type
-            single_val = vals
-            if (isinstance(vals, (Sequence, Iterable)) and
-                    not isinstance(vals, str)):
-                single_val = vals[0]
-            else:
-                # Make sure the data will always be created with an array.
+            # Make sure the data will always be created with an array.
+            if (not isinstance(vals, (Sequence, Iterable)) or
+                    isinstance(vals, str)):
                 vals = [vals]
 
             # Will raise an error, if the datatype of the first value is not
-            # valid.
-            dtype = DataType.get_dtype(single_val)
-
-            # Check all values for data type consistency to ensure clean value
-            # add. Will raise an exception otherwise.
-            for val in vals:
-                if DataType.get_dtype(val) != dtype:
-                    raise TypeError("Array contains inconsistent values.")
+            # valid or if the values are of inconsistent types.
+            dtype = Property._values_dtype(vals)
         shape = (len(vals),)
 
         prop = Property.create_new(self.file, self, properties,
@@ -200,9 +268,13 @@ class Section(Entity):
             raise NameError("Name already exist. Possible solution is to "
                             "provide a new name when copying destination "
                             "is the same as the source parent")
+        # the reserved space of buffered Properties is not copied
+        obj.file._trim_property_buffers()
         sec = obj._parent._h5group.copy(source=src, dest=self._h5group,
                                         name=name, cls=clsname,
                                         keep_id=keep_id)
+        self.file._refindex = None
+        self.file._metadata_modified(sec, subtree=True)
 
         if not children:
             for prop in obj.props:
@@ -210,6 +282,12 @@ class Section(Entity):
 
         return self.sections[sec.attrs["entity_id"]]
 
+    @Entity.type.setter
+    def type(self, typ):
+        Entity.type.fset(self, typ)
+        # the types of Sections are part of the metadata search index
+        self.file._metadata_modified(self._h5group.group)
+
     @property
     def reference(self):
         return self._h5group.get_attr("reference")
@@ -233,12 +311,13 @@ class Section(Entity):
         if "link" not in self._h5group:
             return None
 
-        return Section(self.file, self, self._h5group.open_group("link"))
+        return Section(self.file, None, self._h5group.open_group("link"))
 
     @link.setter
     def link(self, id_or_sec):
         if id_or_sec is None:
             self._h5group.delete("link")
+            self.file._update_reference(self, "link", None)
         if isinstance(id_or_sec, Section):
             sec = id_or_sec
         else:
@@ -246,6 +325,7 @@ class Section(Entity):
             sec = rootsec.find_sections(filtr=lambda x: x.id == id_or_sec)
 
         self._h5group.create_link(sec, "link")
+        self.file._update_reference(self, "link", sec.id)
         if self.file.auto_update_timestamps:
             self.force_updated_at()
 
@@ -279,26 +359,16 @@ class Section(Entity):
         The parent section. This is a read-only property. For root sections
         this property is always None.
 
-        Accessing this property can be slow when the metadata tree is large.
-
         :type: nixio.Section
         """
         if self._sec_parent is not None:
             return self._sec_parent
-        # BFS
-        sections = list(self.file.sections)
-        if self in sections:
-            # Top-level section
-            return None
-
-        while sections:
-            sect = sections.pop(0)
-            if self in sect.sections:
-                self._sec_parent = sect
-                return sect
-            sections.extend(sect.sections)
-
-        return None
+        if isinstance(self._parent, Section):
+            # accessed through the parent's sections
+            self._sec_parent = self._parent
+        elif self._parent is not self.file:
+            self._sec_parent = self.file._parent_entity(self, "sections")
+        return self._sec_parent
 
     @property
     def referring_objects(self):
@@ -313,61 +383,30 @@ class Section(Entity):
 
     @property
     def referring_blocks(self):
-        nf = self.file
-        return list(blk for blk in nf.blocks
-                    if blk.metadata is not None and blk.metadata.id == self.id)
+        return self.file._referring_entities(self.id, "blocks")
 
     @property
     def referring_groups(self):
-        nf = self.file
-        groups = []
-        for blk in nf.blocks:
-            groups.extend(grp for grp in blk.groups
-                          if (grp.metadata is not None and
-                              grp.metadata.id == self.id))
-        return groups
+        return self.file._referring_entities(self.id, "groups")
 
     @property
     def referring_data_arrays(self):
-        nf = self.file
-        data_arrays = []
-        for blk in nf.blocks:
-            data_arrays.extend(da for da in blk.data_arrays
-                               if (da.metadata is not None and
-                                   da.metadata.id == self.id))
-        return data_arrays
+        return self.file._referring_entities(self.id, "data_arrays")
 
     @property
     def referring_tags(self):
-        nf = self.file
-        tags = []
-        for blk in nf.blocks:
-            tags.extend(tg for tg in blk.tags
-                        if (tg.metadata is not None and
-                            tg.metadata.id == self.id))
-        return tags
+        return self.file._referring_entities(self.id, "tags")
 
     @property
     def referring_multi_tags(self):
-        nf = self.file
-        multi_tags = []
-        for blk in nf.blocks:
-            multi_tags.extend(mt for mt in blk.multi_tags
-                              if (mt.metadata is not None and
-                                  mt.metadata.id == self.id))
-        return multi_tags
+        return self.file._referring_entities(self.id, "multi_tags")
 
     @property
     def referring_sources(self):
-        nf = self.file
-        sources = []
-        for blk in nf.blocks:
-            sources.extend(src for src in blk.sources
-                           if (src.metadata is not None and
-                               src.metadata.id == self.id))
-        return sources
-
-    def find_sections(self, filtr=lambda _: True, limit=None):
+        return self.file._referring_entities(self.id, "sources")
+
+    def find_sections(self, filtr=lambda _: True, limit=None, name=None,
+                     type_=None, attrs=None):
         """
         Get all child sections recursively.
         This method traverses the trees of all sections. The traversal is
@@ -380,13 +419,21 @@ class Section(Entity):
         :type filtr:  function
         :param limit: The maximum depth of traversal
         :type limit:  int
+        :param name: Condition on the name: a value, a compiled regular
+                     expression that is searched for, or a function of
+                     the name.
+        :param type_: Condition on the type, see name.
+        :param attrs: Conditions on further HDF5 attributes (e.g.,
+                      definition), see name.
+        :type attrs: dict
 
         :returns: A list containing the matching sections.
         :rtype: list of nixio.Section
         """
         if limit is None:
             limit = maxsize
-        return finders._find_sections(self, filtr, limit)
+        preds = finders._predicates(name, type_, attrs)
+        return finders._find_sections(self, filtr, limit, preds)
 
     def find_related(self, filtr=lambda _: True):
         """
@@ -27,6 +27,8 @@ class Source(Entity):
     def create_new(cls, nixfile, nixparent, h5parent, name, type_):
         newentity = super(Source, cls).create_new(nixfile, nixparent, h5parent,
                                                   name, type_)
+        parent_id = nixparent.id if isinstance(nixparent, Source) else None
+        nixfile._update_parent(newentity, parent_id)
         return newentity
 
     # Source
@@ -97,15 +99,10 @@ class Source(Entity):
         :returns: the parent source
         :rtype: Source or None
         """
-        # for now we need to do a search
-        block = self.parent_block
-        if self in block.sources:
-            return None
-        for s in block.sources:
-            p = s._find_parent_recursive(self.id, False)
-            if p is not None:
-                return p
-        return None
+        if isinstance(self._parent, Source):
+            # accessed through the parent's sources
+            return self._parent
+        return self.file._parent_entity(self, "sources")
 
     @property
     def referring_objects(self):
@@ -129,8 +126,7 @@ class Source(Entity):
         :returns: all DataArrays referring to this source.
         :rtype: list
         """
-        block = self.parent_block
-        return [da for da in block.data_arrays if self in da.sources]
+        return self.file._referring_entities(self.id, "data_arrays")
 
     @property
     def referring_tags(self):
@@ -140,8 +136,7 @@ class Source(Entity):
         :returns: all Tags referring to this source.
         :rtype: list
         """
-        block = self.parent_block
-        return [tg for tg in block.tags if self in tg.sources]
+        return self.file._referring_entities(self.id, "tags")
 
     @property
     def referring_multi_tags(self):
@@ -151,10 +146,10 @@ class Source(Entity):
         :returns: all MultiTags referring to this source.
         :rtype: list
         """
-        block = self.parent_block
-        return [mt for mt in block.multi_tags if self in mt.sources]
+        return self.file._referring_entities(self.id, "multi_tags")
 
-    def find_sources(self, filtr=lambda _: True, limit=None):
+    def find_sources(self, filtr=lambda _: True, limit=None, name=None,
+                     type_=None, attrs=None):
         """
         Get all child sources of this source recursively.
 
@@ -168,13 +163,21 @@ class Source(Entity):
         :type filtr:  function
         :param limit: The maximum depth of traversal
         :type limit:  int
+        :param name: Condition on the name: a value, a compiled regular
+                     expression that is searched for, or a function of
+                     the name.
+        :param type_: Condition on the type, see name.
+        :param attrs: Conditions on further HDF5 attributes (e.g.,
+                      definition), see name.
+        :type attrs: dict
 
         :returns: A list containing the matching sources.
         :rtype: list of nixio.Source
         """
         if limit is None:
             limit = maxsize
-        return finders._find_sources(self, filtr, limit)
+        preds = finders._predicates(name, type_, attrs)
+        return finders._find_sources(self, filtr, limit, preds)
 
     @property
     def sources(self):
@@ -217,8 +220,10 @@ class Source(Entity):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
         self._h5group.create_link(sect, "metadata")
+        self.file._update_reference(self, "metadata", sect.id)
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
             self._h5group.delete("metadata")
+            self.file._update_reference(self, "metadata", None)
@@ -7,6 +7,7 @@
 # LICENSE file in the root of the Project.
 from .source import Source
 from .container import LinkContainer
+from .entity import Entity
 from . import util
 
 
@@ -36,8 +37,16 @@ class SourceLinkContainer(LinkContainer):
         if not hasattr(item, "id"):
             raise TypeError("NIX entity or id string required for append")
 
-        if not self._itemstore._parent.find_sources(filtr=lambda x:
-                                                    x.id == item.id):
+        if not self._itemstore._parent.find_sources(
+                attrs={"entity_id": item.id}):
             raise RuntimeError("This item cannot be appended here.")
 
         self._backend.create_link(item, item.id)
+        self._file._update_reference(self._parent, "sources", item.id)
+
+    def __delitem__(self, item):
+        if not isinstance(item, Entity):
+            item = self[item]
+        super(SourceLinkContainer, self).__delitem__(item)
+        self._file._update_reference(self._parent, "sources", item.id,
+                                     remove=True)
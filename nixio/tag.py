@@ -37,23 +37,71 @@ class FeatureContainer(Container):
         try:
             return Container.__getitem__(self, item)
         except KeyError as exc:
-            # item might be the ID of the referenced data; try it as well
-            for feat in self:
-                if feat.data.id == item or feat.data.name == item:
-                    return feat
-            raise exc
+            # item might be the ID or name of the referenced data
+            link = self._find_by_data(item)
+            if link is None:
+                raise exc
+            return self._inst_item(self._backend.get_by_name(link))
 
     def __contains__(self, item):
         if isinstance(item, Feature):
             item = item.id
         if not Container.__contains__(self, item):
             # check if it contains a Feature whose data matches 'item'
-            for feat in self:
-                if feat.data.id == item or feat.data.name == item:
-                    return True
-            return False
+            return self._find_by_data(item) is not None
         return True
 
+    def _find_by_data(self, item):
+        """
+        Returns the id of the first feature linking the data object with the
+        given id or name, or None.
+        """
+        index, missing = self._data_index()
+        link = index.get(item)
+        if link is not None and "data" not in self._backend.group[link]:
+            # the data object was deleted since the index was built
+            index, missing = self._data_index(rebuild=True)
+            link = index.get(item)
+        if link is None and missing:
+            # a feature without data can not be ruled out as a match
+            raise RuntimeError("Feature.data: Data object not found!")
+        return link
+
+    def _data_index(self, rebuild=False):
+        """
+        Returns a dictionary mapping the ids and names of the linked data
+        objects to the ids of the features, and whether any feature lacks its
+        data object. It is built from the attributes of the link targets,
+        without creating the data objects, kept by the file and rebuilt when
+        features were added or removed since.
+        """
+        features = self._backend
+        if features.group is None:
+            return dict(), False
+        stamp = features.link_stamp()
+        key = features.group.name
+        indexes = self._file._name_indexes
+        cached = indexes.get(key)
+        if not rebuild and cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        index = dict()
+        missing = False
+        for link in features.link_names():
+            data = features.group[link].get("data")
+            if data is None:
+                # features whose data object was deleted are skipped so they
+                # do not hide the features linked after them
+                missing = True
+                continue
+            for attr in ("entity_id", "name"):
+                value = data.attrs.get(attr)
+                if isinstance(value, bytes):
+                    value = value.decode()
+                # the first feature linking the data object is returned
+                index.setdefault(value, link)
+        indexes[key] = (stamp, index, missing)
+        return index, missing
+
 
 class BaseTag(Entity):
     """
@@ -333,16 +381,8 @@ class Tag(BaseTag):
         if len(self.features) == 0:
             raise OutOfBounds("There are no features associated with this tag!")
 
-        try:
-            feat = self.features[featidx]
-        except KeyError:
-            feat = None
-            for feature in self.features:
-                if feature.data.name == featidx or feature.data.id == featidx:
-                    feat = feature
-                    break
-            if feat is None:
-                raise
+        # also looks up features by the name or id of their data
+        feat = self.features[featidx]
         data = feat.data
         if data is None:
             raise UninitializedEntity()
@@ -406,8 +446,10 @@ class Tag(BaseTag):
         if not isinstance(sect, Section):
             raise TypeError("{} is not of type Section".format(sect))
         self._h5group.create_link(sect, "metadata")
+        self.file._update_reference(self, "metadata", sect.id)
 
     @metadata.deleter
     def metadata(self):
         if "metadata" in self._h5group:
             self._h5group.delete("metadata")
+            self.file._update_reference(self, "metadata", None)
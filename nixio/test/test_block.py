@@ -177,6 +177,10 @@ class TestBlock(unittest.TestCase):
         assert len(self.block.find_sources(limit=1)) == 2
         assert len(self.block.find_sources(filtr=lambda x: "level2-p1-s" in x.name)) == 2
         assert len(self.block.find_sources(filtr=lambda x: "level2-p1-s" in x.name, limit=1)) == 0
+        assert len(self.block.find_sources(type_="dummy", limit=1)) == 2
+        level3 = self.block.find_sources(name=lambda n: n.startswith("level3"))
+        assert [src.name for src in level3] == ["level3-p1-s0", "level3-p1-s1"]
+        assert level3[0].parent_source == self.block.sources[0].sources[0]
 
     def test_block_groups(self):
         assert len(self.block.groups) == 0
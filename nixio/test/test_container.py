@@ -73,6 +73,74 @@ class TestContainer(unittest.TestCase):
         self.assertEqual(self.multi_tag,
                          self.group.multi_tags[0])
 
+    def test_slice_getter(self):
+        self.assertEqual([self.dataarray, self.positions],
+                         self.block.data_arrays[:])
+        self.assertEqual([self.positions], self.block.data_arrays[1:])
+        self.assertEqual([self.dataarray], self.block.data_arrays[-2:-1])
+        self.assertEqual([], self.block.data_arrays[5:])
+        self.assertEqual([self.dataarray], self.group.data_arrays[0:1])
+        self.assertEqual([], self.block.sources[:])
+
+    def test_filter(self):
+        self.block.create_data_array("other", "othertype", data=[2])
+        das = self.block.data_arrays
+        self.assertEqual([self.dataarray], das.filter(name="test array"))
+        self.assertEqual([self.dataarray, self.positions],
+                         das.filter(type_="containertest"))
+        self.assertEqual([self.positions],
+                         das.filter(name_regex="pos$", type_="containertest"))
+        self.assertEqual(["other"],
+                         [da.name for da in das.filter(type_="othertype")])
+        self.assertEqual(3, len(das.filter(name=lambda n: n.startswith("t")) +
+                                das.filter(name_regex="^o")))
+        self.assertEqual([], das.filter(name="test array", type_="othertype"))
+
+        self.group.data_arrays.append(self.positions)
+        linked = self.group.data_arrays
+        self.assertEqual([self.positions], linked.filter(name_regex="pos"))
+        self.assertEqual([self.dataarray, self.positions],
+                         linked.filter(type_="containertest"))
+
+    def test_link_container_name_index(self):
+        self.assertIn("test array", self.group.data_arrays)
+        self.assertNotIn("test pos", self.group.data_arrays)
+        self.group.data_arrays.append(self.positions)
+        self.assertEqual(self.positions, self.group.data_arrays["test pos"])
+        del self.group.data_arrays["test array"]
+        self.assertNotIn("test array", self.group.data_arrays)
+        with self.assertRaises(KeyError):
+            _ = self.group.data_arrays["test array"]
+        # links removed through the containing Block are noticed as well
+        del self.block.data_arrays["test pos"]
+        self.assertNotIn("test pos", self.group.data_arrays)
+        self.group.data_arrays.append(self.dataarray)
+        self.assertEqual(self.dataarray, self.group.data_arrays["test array"])
+
+        # the same number of links with the same newest link
+        arrays = [self.block.create_data_array(name, "containertest",
+                                               data=[0])
+                  for name in ("A", "C", "D")]
+        links = self.group.data_arrays
+        links.extend([arrays[0], arrays[1]])
+        self.assertIn("A", links)
+        del links["A"]
+        del links["C"]
+        links.append(arrays[2])
+        links.append(arrays[1])
+        self.assertNotIn("A", links)
+        self.assertEqual(arrays[2], links["D"])
+
+        # an emptied link group restarts the creation order
+        links.delete_many(list(links))
+        self.assertNotIn("D", links)
+        links.extend([arrays[0], arrays[2]])
+        self.assertIn("A", links)
+        links.delete_many(list(links))
+        links.extend([arrays[1], arrays[2]])
+        self.assertNotIn("A", links)
+        self.assertIn("C", links)
+
     def test_file_references(self):
         # add some sources
         source = self.block.create_source("test source", "containertest")
@@ -507,3 +575,69 @@ class TestContainer(unittest.TestCase):
         inhpropnames = [p.name for p in chsecb.inherited_properties()]
         self.assertIs(None, chsecb.link)
         self.assertNotIn("2Prop", inhpropnames)
+
+    def test_delete_links_section_data_frame(self):
+        sec = self.file.create_section("df md", "metadata")
+        coltypes = {"idx": int, "value": float}
+        df_a = self.block.create_data_frame("df a", "frame", col_dict=coltypes)
+        df_b = self.block.create_data_frame("df b", "frame", col_dict=coltypes)
+        # linked before and after the reference index is built
+        df_a.metadata = sec
+        self.assertEqual(sec.referring_data_arrays, [])
+        df_b.metadata = sec
+        self.group.data_frames.append(df_b)
+
+        del self.file.sections[sec.id]
+        self.assertIsNone(df_a.metadata)
+        self.assertIsNone(df_b.metadata)
+        self.assertIsNone(self.group.data_frames["df b"].metadata)
+
+    def test_delete_many(self):
+        arrays = [self.block.create_data_array("da-{}".format(idx), "bulk",
+                                               data=[idx])
+                  for idx in range(10)]
+        for da in arrays[:5]:
+            self.group.data_arrays.append(da)
+            self.tag.references.append(da)
+
+        self.block.data_arrays.delete_many(arrays[:3] + ["da-3", arrays[4].id])
+        for idx in range(5):
+            self.assertNotIn("da-{}".format(idx), self.block.data_arrays)
+            self.assertNotIn(arrays[idx].id, self.group.data_arrays)
+            self.assertNotIn(arrays[idx].id, self.tag.references)
+        self.assertEqual(len(self.block.data_arrays), 7)
+
+        # removing links leaves the linked objects alone
+        self.group.data_arrays.delete_many([self.dataarray])
+        self.assertNotIn(self.dataarray, self.group.data_arrays)
+        self.assertIn(self.dataarray, self.block.data_arrays)
+
+        with self.assertRaises(TypeError):
+            self.block.data_arrays.delete_many([self.tag])
+
+        # sections and sources are removed through the reference index
+        rootsec = self.file.create_section("root", "bulk")
+        subsecs = [rootsec.create_section("sub-{}".format(idx), "bulk")
+                   for idx in range(3)]
+        leaf = subsecs[0].create_section("leaf", "bulk")
+        self.assertEqual(leaf.referring_data_arrays, [])  # builds the index
+        self.dataarray.metadata = leaf
+        self.tag.metadata = subsecs[1]
+        linking = self.file.create_section("linking", "bulk")
+        linking.link = subsecs[0]
+
+        src = self.block.create_source("src", "bulk")
+        child = src.create_source("child", "bulk")
+        self.multi_tag.sources.append(child)
+
+        self.file.delete_entities([subsecs[0].id, subsecs[1].id, src.id])
+        self.assertEqual([sec.name for sec in rootsec.sections], ["sub-2"])
+        self.assertIsNone(self.dataarray.metadata)
+        self.assertIsNone(self.tag.metadata)
+        self.assertIsNone(linking.link)
+        self.assertEqual(len(self.block.sources), 0)
+        self.assertEqual(len(self.multi_tag.sources), 0)
+        self.assertEqual(len(self.file.find_sections(type_="bulk")), 3)
+
+        del self.file.sections["linking"]
+        del self.file.sections["root"]
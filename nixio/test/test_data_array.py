@@ -11,8 +11,9 @@ import time
 import unittest
 import numpy as np
 import nixio as nix
+from nixio import data_array as da_module
 from nixio.data_array import DataSliceMode
-from nixio.exceptions import IncompatibleDimensions
+from nixio.exceptions import IncompatibleDimensions, InvalidUnit
 from .tmp import TempDir
 
 
@@ -579,3 +580,274 @@ class TestDataArray(unittest.TestCase):
         self.array.polynom_coefficients = None
 
         assert self.array[1].shape == (1,)
+
+    def test_data_array_memmap(self):
+        # default layout is chunked
+        with self.assertRaises(ValueError):
+            self.array.as_memmap()
+
+        self.file.contiguous = True
+        data = np.arange(200, dtype=np.int16).reshape(20, 10)
+        da = self.block.create_data_array("contiguous", "signal", data=data)
+        mm = da.as_memmap()
+        assert mm.shape == data.shape
+        assert mm.dtype == data.dtype
+        assert not mm.flags.writeable
+        np.testing.assert_array_equal(mm, data)
+
+        # contiguous arrays have a fixed shape
+        with self.assertRaises(ValueError):
+            da.append(np.zeros((2, 10), dtype=np.int16))
+
+        # arrays with an empty dimension and compressed arrays stay chunked
+        growing = self.block.create_data_array("growing", "signal",
+                                               dtype=np.int16, shape=(0, 10))
+        growing.append(data)
+        with self.assertRaises(ValueError):
+            growing.as_memmap()
+        compressed = self.block.create_data_array(
+            "compressed", "signal", data=data,
+            compression=nix.Compression.DeflateNormal
+        )
+        with self.assertRaises(ValueError):
+            compressed.as_memmap()
+
+        # no storage allocated before the first write
+        empty = self.block.create_data_array("empty", "signal",
+                                             dtype=np.int16, shape=(10,))
+        with self.assertRaises(RuntimeError):
+            empty.as_memmap()
+
+        # calibrated data can not be returned raw
+        da.expansion_origin = 1.0
+        with self.assertRaises(ValueError):
+            da.as_memmap()
+        da.expansion_origin = None
+        da.polynom_coefficients = (0.0, 2.0)
+        with self.assertRaises(ValueError):
+            da.as_memmap()
+        da.polynom_coefficients = None
+        self.file.contiguous = False
+
+        # reopened file maps the same data
+        self.file.close()
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadWrite)
+        self.block = self.file.blocks[0]
+        mm = self.block.data_arrays["contiguous"].as_memmap()
+        np.testing.assert_array_equal(mm, data)
+
+    def test_data_array_direct_selections(self):
+        data = np.arange(60, dtype=np.int16).reshape(6, 10)
+        da = self.block.create_data_array("direct", "signal", data=data)
+
+        dout = np.zeros((3, 10))
+        da.read_direct(dout, source_sel=np.s_[2:4, :], dest_sel=np.s_[1:3, :])
+        np.testing.assert_array_equal(dout[0], np.zeros(10))
+        np.testing.assert_array_equal(dout[1:], data[2:4])
+
+        dout = np.zeros(10, dtype=np.int16)
+        da.read_direct(dout, source_sel=np.s_[5, :])
+        np.testing.assert_array_equal(dout, data[5])
+
+        newdata = np.full((2, 4), -1, dtype=np.int16)
+        da.write_direct(newdata, source_sel=np.s_[0, :],
+                        dest_sel=np.s_[0, 3:7])
+        data[0, 3:7] = -1
+        np.testing.assert_array_equal(da[:], data)
+
+        # calibration is applied in place
+        da.expansion_origin = 1.0
+        da.polynom_coefficients = (0.5, 2.0)
+        expected = 0.5 + 2.0 * (data.astype(float) - 1.0)
+        dout = np.empty(data.shape)
+        da.read_direct(dout)
+        np.testing.assert_almost_equal(dout, expected)
+        np.testing.assert_almost_equal(dout, da[:])
+
+        dout = np.zeros((2, 10), dtype=np.float32)
+        da.read_direct(dout, source_sel=np.s_[4:6, :])
+        np.testing.assert_almost_equal(dout, expected[4:6], decimal=4)
+
+        dout = np.zeros(3)
+        da.read_direct(dout, source_sel=np.s_[1, 2:3], dest_sel=np.s_[1])
+        np.testing.assert_almost_equal(dout, [0, expected[1, 2], 0])
+
+        da.polynom_coefficients = (0.0, 1.0, 0.5)
+        expected = data - 1.0 + 0.5 * (data - 1.0) ** 2
+        dout = np.empty(data.shape)
+        da.read_direct(dout)
+        np.testing.assert_almost_equal(dout, expected)
+
+        # calibrated values do not fit into integer buffers
+        with self.assertRaises(TypeError):
+            da.read_direct(np.empty(data.shape, dtype=np.int16))
+
+    def test_data_array_read(self):
+        data = np.arange(-500, 500, dtype=np.int16).reshape(100, 10)
+        da = self.block.create_data_array("calib", "signal", data=data)
+
+        dout = da.read()
+        assert dout.dtype == np.int16
+        np.testing.assert_array_equal(dout, data)
+        assert da.read(dtype=np.float32).dtype == np.float32
+
+        da.polynom_coefficients = (0.25, 0.5)
+        da.expansion_origin = 2.0
+        expected = 0.25 + 0.5 * (data - 2.0)
+        dout = da.read()
+        assert dout.dtype == np.float64
+        np.testing.assert_almost_equal(dout, expected)
+        np.testing.assert_almost_equal(da[:], expected)
+
+        dout = da.read(np.s_[10:50:3, 2], dtype=np.float32)
+        assert dout.dtype == np.float32
+        np.testing.assert_almost_equal(dout, expected[10:50:3, 2], decimal=5)
+
+        out = np.zeros((5, 10), dtype=np.float32)
+        res = da.read(np.s_[-5:], out=out)
+        assert res is out
+        np.testing.assert_almost_equal(out, expected[-5:], decimal=5)
+        with self.assertRaises(ValueError):
+            da.read(np.s_[:4], out=out)
+        with self.assertRaises(TypeError):
+            da.read(dtype=np.int32)
+
+        # process the data in many small blocks
+        blocksize = da_module.READ_BLOCK_SIZE
+        da_module.READ_BLOCK_SIZE = 25
+        try:
+            np.testing.assert_almost_equal(da.read(dtype=np.float32),
+                                           expected, decimal=5)
+            np.testing.assert_almost_equal(da[3:97:2, 1:9], expected[3:97:2, 1:9])
+        finally:
+            da_module.READ_BLOCK_SIZE = blocksize
+
+        # single values and advanced indexing
+        np.testing.assert_almost_equal(da[7, 3], [expected[7, 3]])
+        np.testing.assert_almost_equal(da[..., 3], expected[..., 3])
+        np.testing.assert_almost_equal(da.read([1, 5]), expected[[1, 5]])
+
+        # the calibration follows changes, also through other objects
+        da.polynom_coefficients = None
+        np.testing.assert_almost_equal(da[:], data - 2.0)
+        da.expansion_origin = None
+        np.testing.assert_array_equal(da[:], data)
+        self.block.data_arrays[da.name].polynom_coefficients = (0, 2)
+        np.testing.assert_almost_equal(da[:3], data[:3] * 2)
+
+    def test_data_array_read_unit(self):
+        data = np.arange(-500, 500, dtype=np.int16).reshape(100, 10)
+        da = self.block.create_data_array("scaled", "signal", data=data)
+        with self.assertRaises(InvalidUnit):
+            da.read(unit="V")
+        da.unit = "mV"
+        assert da.read(unit="mV").dtype == np.int16
+        np.testing.assert_almost_equal(da.read(unit="V"), data * 1e-3)
+        np.testing.assert_almost_equal(da.read(np.s_[5, 2:4], unit="uV"),
+                                       data[5, 2:4] * 1e3)
+        with self.assertRaises(InvalidUnit):
+            da.read(unit="s")
+
+        da.polynom_coefficients = (0.25, 0.5, 0.1)
+        da.expansion_origin = 2.0
+        xvals = data - 2.0
+        expected = (0.25 + 0.5 * xvals + 0.1 * xvals ** 2) * 1e-3
+        out = np.empty(data.shape, dtype=np.float32)
+        res = da.read(out=out, unit="V")
+        assert res is out
+        np.testing.assert_allclose(out, expected, rtol=1e-6)
+        np.testing.assert_allclose(da.read([1, 5], unit="V"), expected[[1, 5]])
+        da.polynom_coefficients = None
+        np.testing.assert_allclose(da.read(unit="V"), xvals * 1e-3)
+
+        view = da.get_slice((10, 2), (20, 4))
+        np.testing.assert_allclose(view.read(unit="V"), xvals[10:30, 2:6] * 1e-3)
+        np.testing.assert_allclose(view.read(np.s_[1:3, -1], unit="V"),
+                                   xvals[11:13, 5] * 1e-3)
+
+    def test_data_array_quantize(self):
+        data = np.sin(np.linspace(0, 10, 1000)) * 0.08 - 0.01
+        da = self.block.create_data_array("quantized", "signal", data=data,
+                                          quantize=(np.int16, 1e-5))
+        assert da.dtype == np.int16
+        assert da.polynom_coefficients[1] == 1e-5
+        assert da.expansion_origin == 0.0
+        assert da.quantization_error <= 0.5e-5 + 1e-12
+        np.testing.assert_allclose(da[:], data, atol=0.5e-5 + 1e-12)
+
+        # resolution chosen from the data range
+        da = self.block.create_data_array("autoquantized", "signal", data=data,
+                                          quantize=(np.uint8, None))
+        assert da.dtype == np.uint8
+        raw = da._h5group.group["data"][:]
+        assert raw.min() == 0 and raw.max() == 255
+        np.testing.assert_allclose(da[:], data, atol=da.quantization_error)
+
+        assert self.array.quantization_error is None
+
+        with self.assertRaises(ValueError):
+            self.block.create_data_array("toocoarse", "signal", data=data,
+                                         quantize=(np.int8, 1e-5))
+        with self.assertRaises(ValueError):
+            self.block.create_data_array("noint", "signal", dtype=np.int32,
+                                         data=data, quantize=(np.int16, 1e-5))
+        with self.assertRaises(ValueError):
+            self.block.create_data_array("nodata", "signal", shape=(10,),
+                                         quantize=(np.int16, 1e-5))
+        with self.assertRaises(TypeError):
+            self.block.create_data_array("nofloat", "signal", data=data,
+                                         quantize=(np.float32, 1e-5))
+        with self.assertRaises(ValueError):
+            self.block.create_data_array("nan", "signal", data=[1.0, np.nan],
+                                         quantize=(np.int16, 1e-5))
+
+    def test_data_array_cached_metadata(self):
+        da = self.array
+        assert da.shape == (100,)
+        assert da.dtype == np.float64
+        handle = da._dataset()
+        assert da._dataset() is handle
+
+        da.append(np.zeros(10))
+        assert da.shape == (110,)
+        da.data_extent = (50,)
+        assert da.shape == (50,)
+        assert len(da[:]) == 50
+
+        assert len(da.dimensions) == 0
+        da.append_sampled_dimension(0.1)
+        assert len(da.dimensions) == 1
+        dims = list(da.dimensions)
+        assert [d.dimension_type for d in dims] == [nix.DimensionType.Sample]
+        da.delete_dimensions()
+        assert len(da.dimensions) == 0
+        da.append_set_dimension()
+        assert da.dimensions[0].dimension_type == nix.DimensionType.Set
+
+        # changes made through another object of the same DataArray
+        other = self.block.data_arrays[da.name]
+        other.append(np.ones(5))
+        assert da.shape == (55,)
+        assert len(da[:]) == 55
+        other.append_range_dimension([1, 2, 3])
+        assert len(da.dimensions) == 2
+        assert da.dimensions[1].dimension_type == nix.DimensionType.Range
+        da.data_extent = (50,)
+        assert other.shape == (50,)
+        assert other.dtype == np.float64
+
+        # the addresses of deleted datasets may be reused by new ones
+        tmp = self.block.create_data_array("tmp", "signal", data=np.zeros(7))
+        assert tmp.shape == (7,)
+        del self.block.data_arrays["tmp"]
+        tmp = self.block.create_data_array("tmp", "signal", data=np.zeros(3))
+        assert tmp.shape == (3,)
+
+        # handle is refreshed after reopening the file
+        daid = da.id
+        self.file.close()
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadWrite)
+        self.block = self.file.blocks[0]
+        da = self.block.data_arrays[daid]
+        assert da.shape == (50,)
+        assert da._dataset() is not handle
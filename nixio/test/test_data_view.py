@@ -10,6 +10,7 @@ import os
 import unittest
 import numpy as np
 import nixio as nix
+from nixio.data_view import DataView
 from .tmp import TempDir
 
 
@@ -188,3 +189,28 @@ class TestDataView(unittest.TestCase):
         npeq(dv[..., 0, 0], da[5:10, 6:11, 7:12, 8, 9])
         npeq(dv[1:3, 0, ...], da[6:8, 6, 7:12, 8:13, 9:14])
         npeq(dv[1:3, :, ...], da[6:8, 6:11, 7:12, 8:13, 9:14])
+
+    def test_data_view_direct_selections(self):
+        da = self.file.blocks[0].data_arrays[0]
+        dv = da.get_slice((10, 3), extents=(5, 8))
+
+        dout = np.empty((5, 8))
+        dv.read_direct(dout)
+        np.testing.assert_almost_equal(dout, self.data[10:15, 3:11])
+
+        dout = np.zeros((4, 8))
+        dv.read_direct(dout, source_sel=np.s_[1:3, :], dest_sel=np.s_[2:4, :])
+        np.testing.assert_almost_equal(dout[2:], self.data[11:13, 3:11])
+        np.testing.assert_almost_equal(dout[:2], np.zeros((2, 8)))
+
+        with self.assertRaises(nix.exceptions.OutOfBounds):
+            dv.read_direct(dout[0], source_sel=np.s_[7, :])
+
+        newdata = np.ones((2, 8))
+        dv.write_direct(newdata, dest_sel=np.s_[3:5, :])
+        np.testing.assert_almost_equal(da[13:15, 3:11], newdata)
+        np.testing.assert_almost_equal(da[12, 3:11], self.data[12, 3:11])
+
+        invalid = DataView(da, None)
+        with self.assertRaises(nix.exceptions.InvalidSlice):
+            invalid.read_direct(dout)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2014, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in section and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+import argparse
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+import nixio as nix
+from nixio.cmd import explore
+from .tmp import TempDir
+
+
+class TestExplore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TempDir("exploretest")
+        self.testfilename = os.path.join(self.tmpdir.path, "exploretest.nix")
+        self.file = nix.File.open(self.testfilename, nix.FileMode.Overwrite)
+        self.block = self.file.create_block("test block", "recordingsession")
+
+    def tearDown(self):
+        self.file.close()
+        self.tmpdir.cleanup()
+
+    def test_format_rows(self):
+        rows = explore.format_rows("%.1f   %.1f %.1f\n", np.array([0.0, 1.0]),
+                                   np.array([[1.0, 2.0], [3.0, 4.0]]))
+        self.assertEqual(rows, "0.0   1.0 2.0\n1.0   3.0 4.0\n")
+        # columns of different types are formatted value by value
+        rows = explore.format_rows("%s   %.2f\n", np.array(["a", "b"]),
+                                   np.array([0.5, 1.25]))
+        self.assertEqual(rows, "a   0.50\nb   1.25\n")
+
+    def test_tick_reader(self):
+        da = self.block.create_data_array("ticks", "test", data=np.zeros((4, 3, 2)))
+        sdim = da.append_sampled_dimension(0.5, offset=1.0)
+        rdim = da.append_range_dimension([0.1, 0.2, 0.4])
+        setdim = da.append_set_dimension()
+
+        ticks = explore.tick_reader(sdim, 4)
+        np.testing.assert_array_equal(ticks(1, 3), [1.5, 2.0])
+        ticks = explore.tick_reader(rdim, 3)
+        np.testing.assert_array_equal(ticks(0, 2), [0.1, 0.2])
+        ticks = explore.tick_reader(setdim, 2)
+        np.testing.assert_array_equal(ticks(0, 2), [0.0, 1.0])
+        # ticks that do not match the extent can not be dumped
+        self.assertIsNone(explore.tick_reader(rdim, 4))
+        setdim.labels = ["a", "b", "c"]
+        self.assertIsNone(explore.tick_reader(setdim, 2))
+
+    def test_dump_binary(self):
+        data = np.arange(12, dtype=np.int16).reshape(6, 2)
+        da = self.block.create_data_array("raw", "test", data=data)
+        outfile = io.BytesIO()
+        explore.dump_binary(da, outfile, "raw")
+        self.assertEqual(outfile.getvalue(), data.tobytes())
+        outfile = io.BytesIO()
+        explore.dump_binary(da, outfile, "npy")
+        outfile.seek(0)
+        result = np.load(outfile)
+        self.assertEqual(result.dtype, np.int16)
+        np.testing.assert_array_equal(result, data)
+
+        # calibrated data are dumped as double
+        da.polynom_coefficients = (0.5, 0.25)
+        outfile = io.BytesIO()
+        explore.dump_binary(da, outfile, "npy")
+        outfile.seek(0)
+        result = np.load(outfile)
+        self.assertEqual(result.dtype, np.float64)
+        np.testing.assert_array_equal(result, data * 0.25 + 0.5)
+        outfile = io.BytesIO()
+        explore.dump_binary(da, outfile, "raw")
+        self.assertEqual(outfile.getvalue(), (data * 0.25 + 0.5).tobytes())
+
+    def make_files(self, count):
+        filenames = []
+        for idx in range(count):
+            filename = os.path.join(self.tmpdir.path, "scan-{}.nix".format(idx))
+            nf = nix.File.open(filename, nix.FileMode.Overwrite)
+            blk = nf.create_block("block-{}".format(idx), "recordingsession")
+            blk.create_data_array("data", "signal", data=np.arange(idx + 1))
+            sec = nf.create_section("session-{}".format(idx), "recording")
+            sec["subject"] = "mouse {}".format(idx)
+            nf.close()
+            filenames.append(filename)
+        return filenames
+
+    @staticmethod
+    def run_command(*argv):
+        parser = argparse.ArgumentParser()
+        explore.create_subcmd_parsers(parser)
+        arguments = parser.parse_args(argv)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            explore.main(arguments)
+        return output.getvalue()
+
+    def test_result_cache(self):
+        filename = self.make_files(1)[0]
+        cache = explore.ResultCache(os.path.join(self.tmpdir.path, "cache", "explore.sqlite"))
+        fingerprint = explore.ResultCache.fingerprint(filename)
+        self.assertIsNone(cache.get(fingerprint, "query"))
+        cache.put(fingerprint, "query", "output")
+        self.assertEqual(cache.get(fingerprint, "query"), "output")
+        self.assertIsNone(cache.get(fingerprint, "other query"))
+
+        # results of files modified since are not used
+        nf = nix.File.open(filename, nix.FileMode.ReadWrite)
+        nf.create_block("new block", "recordingsession")
+        nf.close()
+        self.assertIsNone(cache.get(explore.ResultCache.fingerprint(filename), "query"))
+        cache.close()
+
+    def test_scan_cache(self):
+        filenames = self.make_files(2)
+        cache_path = os.path.join(self.tmpdir.path, "explore.sqlite")
+        argv = ["file", "-vv", "--cache", cache_path] + filenames
+        output = self.run_command(*argv)
+        self.assertIn("scan-0.nix", output)
+        self.assertEqual(output, self.run_command("file", "-vv", *filenames))
+
+        # a hit returns the stored output without scanning the file again
+        parser = argparse.ArgumentParser()
+        explore.create_subcmd_parsers(parser)
+        query = explore.query_key(explore.disp_file_info, parser.parse_args(argv))
+        cache = explore.ResultCache(cache_path)
+        cache.put(explore.ResultCache.fingerprint(filenames[0]), query, "cached\n")
+        cache.close()
+        output = self.run_command(*argv)
+        self.assertTrue(output.startswith("cached\n"))
+
+        # a miss after the file was modified scans it again
+        nf = nix.File.open(filenames[0], nix.FileMode.ReadWrite)
+        nf.create_block("new block", "recordingsession")
+        nf.close()
+        output = self.run_command(*argv)
+        self.assertNotIn("cached", output)
+        self.assertIn("new block", output)
+
+    def test_scan_jobs(self):
+        filenames = self.make_files(3)
+        for argv in (["file", "-vvv"], ["metadata", "-p", "subject"]):
+            serial = self.run_command(*(argv + filenames))
+            self.assertIn("scan-2.nix", serial)
+            parallel = self.run_command(*(argv + ["--jobs", "3"] + filenames))
+            self.assertEqual(serial, parallel)
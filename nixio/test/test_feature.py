@@ -77,6 +77,44 @@ class TestFeatures(unittest.TestCase):
         self.feature_1.data = new_data_ref
         assert self.feature_1.data == new_data_ref
 
+    def test_feature_lookup_by_data(self):
+        features = self.stimuli_tag.features
+        self.assertEqual(self.feature_1, features["stimulus movie 1"])
+        self.assertEqual(self.feature_2, features[self.movie2.id])
+        self.assertIn("stimulus movie 2", features)
+        self.assertNotIn("output", features)
+        with self.assertRaises(KeyError):
+            _ = features["output"]
+
+        # the index follows new, deleted and relinked features
+        feature_3 = self.stimuli_tag.create_feature(self.signal,
+                                                    nix.LinkType.Untagged)
+        self.assertEqual(feature_3, features["output"])
+        del features[self.feature_1.id]
+        self.assertNotIn("stimulus movie 1", features)
+        feature_3.data = self.movie1
+        self.assertNotIn("output", features)
+        self.assertEqual(feature_3, features["stimulus movie 1"])
+        tag = self.block.tags["stimuli used"]
+        self.assertEqual(feature_3, tag.features[self.movie1.id])
+
+    def test_feature_lookup_missing_data(self):
+        features = self.stimuli_tag.features
+        self.assertIn("stimulus movie 2", features)
+        # deleting a linked data object leaves a feature without data
+        del self.block.data_arrays[self.movie1.id]
+        signal_feature = self.stimuli_tag.create_feature(self.signal,
+                                                         nix.LinkType.Untagged)
+        self.assertIn("stimulus movie 2", features)
+        self.assertEqual(self.feature_2, features[self.movie2.id])
+        self.assertEqual(signal_feature, features["output"])
+        # names matching none of the others can not be told apart from the
+        # feature without data
+        with self.assertRaises(RuntimeError):
+            _ = "stimulus movie 1" in features
+        with self.assertRaises(RuntimeError):
+            _ = features["stimulus movie 1"]
+
     def test_feature_dataframe(self):
         coltypes = OrderedDict(
             idx=int,
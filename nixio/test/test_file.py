@@ -111,6 +111,200 @@ class TestFile(unittest.TestCase):
                                                            x.name,
                                            limit=1)) == 0)
 
+    def test_metadata_table(self):
+        session = self.file.create_section("session", "recording")
+        trials = session.create_section("trials", "collection")
+        for idx in range(4):
+            trial = trials.create_section("trial-{}".format(idx), "trial")
+            trial["duration"] = 0.5 * idx
+            trial["outcome"] = "hit" if idx % 2 else "miss"
+            if idx:
+                trial["stimulus"] = [idx, idx + 1] if idx == 3 else idx
+        session["duration"] = 100.0
+
+        table = self.file.metadata_table("trial", ["duration", "outcome",
+                                                   "stimulus", "missing"])
+        self.assertEqual(list(table),
+                         ["section_id", "section_name", "duration",
+                          "outcome", "stimulus", "missing"])
+        names = list(table["section_name"])
+        self.assertEqual(sorted(names),
+                         ["trial-{}".format(idx) for idx in range(4)])
+        order = [int(name[-1]) for name in names]
+        np.testing.assert_almost_equal(table["duration"],
+                                       [0.5 * idx for idx in order])
+        self.assertEqual(table["duration"].dtype, np.float64)
+        self.assertEqual(table["stimulus"].dtype, object)
+        self.assertEqual(table["stimulus"][order.index(0)], None)
+        self.assertEqual(table["stimulus"][order.index(3)], (3, 4))
+        self.assertTrue(all(val is None for val in table["missing"]))
+
+        table = self.file.metadata_table()
+        self.assertEqual(len(table["section_id"]), 6)
+        self.assertEqual(set(table), {"section_id", "section_name",
+                                      "duration", "outcome", "stimulus"})
+
+        block = self.file.create_block("analysis", "analysis")
+        df = self.file.metadata_table("trial", ["duration", "outcome"],
+                                      block=block, name="trials")
+        self.assertEqual(df.shape, (4,))
+        self.assertEqual(sorted(df.read_columns(name=["outcome"])),
+                         ["hit", "hit", "miss", "miss"])
+        with self.assertRaises(ValueError):
+            self.file.metadata_table("trial", ["stimulus"], block=block)
+
+        # fixed length strings, as written by other HDF5 tools
+        session.create_property("label", "left")
+        h5props = session._h5group.group["properties"]
+        attrs = dict(h5props["label"].attrs)
+        del h5props["label"]
+        h5props.create_dataset("label", data=np.array([b"left"], dtype="S4"))
+        h5props["label"].attrs.update(attrs)
+        self.assertEqual(session.props["label"].values, ("left",))
+        table = self.file.metadata_table("recording", ["label"])
+        self.assertEqual(list(table["label"]), ["left"])
+
+    def test_search_metadata(self):
+        session = self.file.create_section("Session", "recording")
+        subject = session.create_section("subject", "animal")
+        subject["species"] = "Mus musculus"
+        subject["age"] = 12
+        session["experimenter"] = ["Alice", "Bob"]
+
+        secs = self.file.search_metadata(type_="ANIMAL")
+        self.assertEqual([sec.id for sec in secs], [subject.id])
+        self.assertEqual(secs[0].parent, session)
+        self.assertEqual(self.file.search_metadata(name="session",
+                                                   case_sensitive=True), [])
+        self.assertEqual(len(self.file.search_metadata(name="sess",
+                                                       full_match=True)), 0)
+        props = self.file.search_metadata(value="bob", kind="properties")
+        self.assertEqual([prop.name for prop in props], ["experimenter"])
+        props = self.file.search_metadata(name="E", type_="animal",
+                                          kind="properties")
+        self.assertEqual(sorted(prop.name for prop in props),
+                         ["age", "species"])
+        self.assertEqual(props[0]._parent, subject)
+        props = self.file.search_metadata(value="12", full_match=True,
+                                          kind="properties")
+        self.assertEqual(props[0].values, (12,))
+
+        # changes made through the file update the rows of the changed
+        # Sections only
+        index = self.file._metadata_index
+        calls = []
+        rebuild, update_sections = index.rebuild, index.update_sections
+        index.rebuild = lambda: calls.append(("rebuild", rebuild()))
+        index.update_sections = lambda changes: calls.append(
+            (sorted(changes.items()), update_sections(changes)))
+        self.file.search_metadata(name="age", kind="properties")
+        self.assertEqual(calls, [])
+        subject["weight"] = 20.5
+        props = self.file.search_metadata(name="weight", kind="properties")
+        self.assertEqual(len(props), 1)
+        subject["weight"] = 21.5
+        props = self.file.search_metadata(value="21.5", kind="properties")
+        self.assertEqual(len(props), 1)
+        subject.type = "mouse"
+        self.assertEqual(len(self.file.search_metadata(type_="mouse")), 1)
+        del subject.props["weight"]
+        props = self.file.search_metadata(name="weight", kind="properties")
+        self.assertEqual(len(props), 0)
+        subject_path = subject._h5group.group.name
+        self.assertEqual(calls, [([(subject_path, False)], None)] * 4)
+        self.file.search_metadata(name="weight", kind="properties")
+        self.assertEqual(len(calls), 4)
+
+        # new, copied and deleted subtrees
+        device = subject.create_section("device", "hardware")
+        device["serial"] = "X-1"
+        self.file.copy_section(session, name="Session copy", keep_id=False)
+        secs = self.file.search_metadata(type_="hardware")
+        self.assertEqual(sorted(sec.name for sec in secs), ["device"] * 2)
+        del session.sections["subject"]
+        props = self.file.search_metadata(value="x-1", kind="properties")
+        self.assertEqual(len(props), 1)
+        self.assertNotEqual(props[0]._parent, device)
+        self.assertEqual(self.file.search_metadata(name="session copy"),
+                         [self.file.sections["Session copy"]])
+        self.assertNotIn("rebuild", [call[0] for call in calls])
+        rows = dict()
+        for table in ("sections", "properties", "vals"):
+            query = "SELECT * FROM {}".format(table)
+            rows[table] = sorted(index._db.execute(query).fetchall())
+        rebuild()
+        for table in ("sections", "properties", "vals"):
+            query = "SELECT * FROM {}".format(table)
+            self.assertEqual(rows[table],
+                             sorted(index._db.execute(query).fetchall()))
+        self.file.close()
+
+        # byte strings are indexed as text
+        with h5py.File(self.testfilename, "a") as h5file:
+            h5props = h5file["metadata/Session/properties"]
+            attrs = dict(h5props["experimenter"].attrs)
+            del h5props["experimenter"]
+            h5props.create_dataset("experimenter",
+                                   data=np.array([b"Carol"], dtype="S5"))
+            h5props["experimenter"].attrs.update(attrs)
+
+        index_path = os.path.join(self.tmpdir.path, "filetest.nix.nixidx")
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadOnly)
+        secs = self.file.search_metadata(type_="mouse",
+                                         index_path=index_path)
+        self.assertEqual(len(secs), 1)
+        self.assertTrue(os.path.exists(index_path))
+        index = self.file._metadata_index
+        self.assertTrue(index.is_current())
+        props = self.file.search_metadata(value="carol", full_match=True,
+                                          kind="properties",
+                                          index_path=index_path)
+        self.assertEqual([prop.name for prop in props], ["experimenter"])
+
+    def test_search_metadata_buffered(self):
+        sec = self.file.create_section("trials", "experiment")
+        prop = sec.create_property("count", [1])
+        for val in (2, 3):
+            prop.extend_values(val, buffered=True)
+        props = self.file.search_metadata(value="0", kind="properties")
+        self.assertEqual(props, [])
+        props = self.file.search_metadata(value="3", kind="properties")
+        self.assertEqual([prop.name for prop in props], ["count"])
+
+        # copies do not contain the space reserved for appends
+        prop.extend_values(4, buffered=True)
+        copy = self.file.copy_section(sec, name="copy")
+        self.assertEqual(copy.props["count"]._h5dataset.shape, (4,))
+        self.assertEqual(copy["count"], [1, 2, 3, 4])
+        prop.extend_values(5, buffered=True)
+        other = self.file.create_section("other", "experiment")
+        other.create_property(copy_from=prop)
+        self.assertEqual(other.props["count"]._h5dataset.shape, (5,))
+
+    def test_trusted_ids(self):
+        blockid = self.file.create_block("trusted", "test").id
+        assert nix.util.is_uuid(blockid)
+        assert nix.util.is_uuid(blockid.upper())
+        assert nix.util.is_uuid("{" + blockid.replace("-", "") + "}")
+        assert not nix.util.is_uuid(blockid[:-1] + "x")
+        self.file.close()
+
+        with h5py.File(self.testfilename, "a") as h5file:
+            h5file["data/trusted"].attrs["entity_id"] = "not a uuid"
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadOnly)
+        with self.assertRaises(ValueError):
+            _ = self.file.blocks["trusted"]
+        self.file.close()
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadOnly,
+                                  trusted=True)
+        assert self.file.blocks["trusted"].id == "not a uuid"
+        self.file.close()
+        # ids are always validated in writable files
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadWrite,
+                                  trusted=True)
+        with self.assertRaises(ValueError):
+            _ = self.file.blocks["trusted"]
+
     def test_order_tracking(self):
         blknames = []
         for idx in range(10):
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2024, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+import os
+import subprocess
+import sys
+import unittest
+
+import nixio as nix
+
+
+class TestImport(unittest.TestCase):
+
+    def test_lazy_import(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        code = "import sys, nixio; print('h5py' in sys.modules, 'nixio.file' in sys.modules)"
+        env = dict(os.environ, PYTHONPATH=root)
+        out = subprocess.check_output([sys.executable, "-c", code], env=env, text=True)
+        assert out.split() == ["False", "False"]
+
+    def test_public_names(self):
+        for name in nix.__all__:
+            assert getattr(nix, name) is not None
+            assert name in dir(nix)
+        assert nix.File is nix.file.File
+        assert nix.util.is_uuid(nix.util.create_id())
+        with self.assertRaises(AttributeError):
+            _ = nix.NotAName
+        with self.assertRaises(AttributeError):
+            _ = nix.not_a_module
@@ -184,6 +184,123 @@ class TestProperties(unittest.TestCase):
         number_extend = (1, 1.2)
         self.assertRaises(TypeError, self.prop.extend_values, number_extend)
 
+    def test_extend_values_buffered(self):
+        for idx in range(1, 100):
+            self.prop.extend_values(idx, buffered=True)
+        assert self.prop.values == tuple(range(100))
+        assert self.prop._h5dataset.shape[0] > 100
+        self.prop.extend_values([100, 101])
+        assert self.prop._h5dataset.shape == (102,)
+
+        for val in ["a", "b", "c"]:
+            self.prop_s.extend_values(val, buffered=True)
+        assert self.section["test str"] == ["a", "b", "c"]
+        self.file.flush()
+        assert self.prop_s._h5dataset.shape == (3,)
+
+        self.other.extend_values([1, 2], buffered=True)
+        self.other.extend_values([3], buffered=True)
+        self.other.flush()
+        assert self.other._h5dataset.shape == (3,)
+        assert self.other.values == (1, 2, 3)
+
+        # copies keep the id of the Property but have their own buffers
+        copysec = self.file.create_section("copy section", "recordingsession")
+        copy = copysec.create_property(copy_from=self.other)
+        assert copy.id == self.other.id
+        for idx in range(4, 10):
+            self.other.extend_values(idx, buffered=True)
+        copy.extend_values([4, 5], buffered=True)
+        assert self.other.values == tuple(range(1, 10))
+        assert copy.values == (1, 2, 3, 4, 5)
+        self.file.flush()
+        assert self.other._h5dataset.shape == (9,)
+        assert copy._h5dataset.shape == (5,)
+        del self.file.sections[copysec.id]
+
+    def test_compact_properties(self):
+        fname = os.path.join(self.tmpdir.path, "compacttest.nix")
+        nf = nix.File.open(fname, nix.FileMode.Overwrite,
+                           compact_properties=True)
+        sec = nf.create_section("trials", "experiment")
+        prop = sec.create_property("count", [10])
+        prop.unit = "s"
+        prop.definition = "number of trials"
+        assert prop._h5dataset.is_compact
+        assert not prop._h5dataset.is_contiguous
+        prop.values = [11]
+        assert prop._h5dataset.is_compact
+        assert sec["count"] == 11
+
+        propid = prop.id
+        prop.extend_values([12, 13])
+        assert not prop._h5dataset.is_compact
+        assert prop.values == (11, 12, 13)
+        assert prop.id == propid
+        assert prop.unit == "s"
+        assert prop.definition == "number of trials"
+
+        strprop = sec.create_property("labels", ["a", "b"])
+        assert strprop._h5dataset.is_compact
+        strprop.delete_values()
+        assert strprop.values == ()
+        # the strings are stored outside the object header, but their
+        # references still count
+        manyprop = sec.create_property("many", ["xxx"] * 5000)
+        assert not manyprop._h5dataset.is_compact
+        assert len(manyprop.values) == 5000
+
+        # resizing keeps the order of the properties
+        order = sec.create_section("order", "experiment")
+        for name in ("a", "b", "c"):
+            order.create_property(name, [1])
+        order.props["a"].extend_values([2])
+        order.props["b"].values = [1, 2, 3]
+        assert [p.name for p in order.props] == ["a", "b", "c"]
+        assert order.props[0].values == (1, 2)
+        assert order.props[1].values == (1, 2, 3)
+        nf.close()
+
+        nf = nix.File.open(fname, nix.FileMode.ReadOnly)
+        sec = nf.sections["trials"]
+        assert sec["count"] == [11, 12, 13]
+        assert sec.props["count"].unit == "s"
+        assert sec.props["labels"].values == ()
+        nf.close()
+
+    def test_values_cache(self):
+        fname = os.path.join(self.tmpdir.path, "cachetest.nix")
+        nf = nix.File.open(fname, nix.FileMode.Overwrite,
+                           cache_property_values=True)
+        sec = nf.create_section("trials", "experiment")
+        sec["count"] = 10
+        sec["labels"] = ["a", "b"]
+        assert sec["count"] == 10
+        assert sec.props["count"].values is sec.props["count"].values
+        assert sec["labels"] == ["a", "b"]
+
+        prop = sec.props["count"]
+        prop.values = [11, 12]
+        assert sec["count"] == [11, 12]
+        prop.extend_values([13])
+        assert sec.props["count"].values == (11, 12, 13)
+        prop.delete_values()
+        assert sec.props["count"].values == ()
+
+        del sec.props["labels"]
+        sec.create_property("labels", ["c"])
+        assert sec["labels"] == "c"
+
+        # copies keep the id of the Property but have their own values
+        copy = nf.create_section("copy", "experiment")
+        copy.create_property(copy_from=sec.props["labels"])
+        assert copy.props["labels"].id == sec.props["labels"].id
+        assert copy["labels"] == "c"
+        copy.props["labels"].values = ["d"]
+        assert copy["labels"] == "d"
+        assert sec["labels"] == "c"
+        nf.close()
+
     def test_unicode_values(self):
         sec = self.section
         unistrings = {
@@ -7,6 +7,7 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 import os
+import re
 import time
 import unittest
 import nixio as nix
@@ -152,6 +153,23 @@ class TestSections(unittest.TestCase):
         assert len(self.section.find_related()) == 3
         assert len(self.section.sections[0].find_related()) == 5
 
+        # predicates on the raw attributes
+        level2 = self.section.find_sections(name=re.compile("^level2-p1"))
+        assert [sec.name for sec in level2] == ["level2-p1-s0", "level2-p1-s1"]
+        assert level2[0].parent == self.section.sections[0]
+        assert len(self.section.find_sections(name="level3-p1-s1")) == 1
+        assert len(self.section.find_sections(type_="dummy")) == 8
+        assert len(self.section.find_sections(type_="dummy", limit=1)) == 2
+        assert len(self.section.find_sections(
+            type_="dummy", filtr=lambda x: x.name.endswith("s0"))) == 4
+        assert len(self.section.find_sections(
+            name=lambda n: n.startswith("level3"))) == 2
+        target = self.section.sections[1].sections[1]
+        assert self.section.find_sections(
+            attrs={"entity_id": target.id}) == [target]
+        assert len(self.file.find_sections(type_="dummy")) == 8
+        assert self.file.find_sections(attrs={"definition": "x"}) == []
+
     def test_section_properties(self):
         assert len(self.section) == 0
 
@@ -234,6 +252,16 @@ class TestSections(unittest.TestCase):
         # indirect access parent check
         self.assertEqual(block.groups["group"].metadata.parent, self.section)
 
+        # sections created after the parent lookup index was built
+        grandchild = child.create_section("grandchild", "sect")
+        block.metadata = grandchild
+        self.assertEqual(block.metadata.parent, child)
+        self.assertEqual(block.metadata.parent.parent, self.section)
+        self.other.link = grandchild
+        self.assertEqual(self.other.link.parent, child)
+        self.assertEqual([s.id for s in block.metadata.find_related()],
+                         [child.id, grandchild.id])
+
     def test_inverse_search(self):
         block = self.file.create_block("a block", "block with metadata")
         block.metadata = self.section
@@ -281,6 +309,72 @@ class TestSections(unittest.TestCase):
         self.assertEqual(len(self.section.referring_sources), 0)
         self.assertEqual(self.other.referring_sources[0].id, src.id)
 
+    def test_inverse_search_updates(self):
+        block = self.file.create_block("a block", "block with metadata")
+        da = block.create_data_array("foo", "data_array", data=range(10))
+        src = block.create_source("sauce", "stype")
+        child = src.create_source("child sauce", "stype")
+        grp = block.create_group("grp", "group")
+        tag = block.create_tag("tago", "tagtype", [1, 1])
+        grp.tags.append(tag)
+
+        # index is built on first use
+        self.assertEqual(self.section.referring_objects, [])
+
+        da.metadata = self.section
+        child.metadata = self.section
+        tag.metadata = self.other
+        self.assertEqual(self.section.referring_data_arrays, [da])
+        self.assertEqual(self.section.referring_sources, [child])
+        self.assertEqual(self.other.referring_tags, [tag])
+
+        da.metadata = self.other
+        self.assertEqual(self.section.referring_data_arrays, [])
+        self.assertEqual(self.other.referring_data_arrays, [da])
+        del da.metadata
+        self.assertEqual(self.other.referring_data_arrays, [])
+
+        # referrer found through a Group link container, then unlinked
+        del grp.tags[tag.id]
+        self.assertEqual(self.other.referring_tags, [tag])
+        del block.tags[tag.id]
+        self.assertEqual(self.other.referring_tags, [])
+
+        secid, otherid, childid = self.section.id, self.other.id, child.id
+        self.file.close()
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadWrite)
+        self.section = self.file.sections[secid]
+        self.other = self.file.sections[otherid]
+        self.assertEqual([s.id for s in self.section.referring_sources],
+                         [childid])
+        self.assertEqual(self.section.referring_sources[0].name, "child sauce")
+
+    def test_inverse_search_copies(self):
+        # copies that keep the ids of the originals
+        section = self.file.create_section("copied", "metadata")
+        block = self.file.create_block("b2", "block with metadata")
+        block.metadata = section
+        src = block.create_source("sauce", "stype")
+        child = src.create_source("child sauce", "stype")
+        da = block.create_data_array("foo", "data_array", data=range(10))
+        da.sources.append(child)
+        self.assertEqual(section.referring_blocks, [block])
+
+        copy = self.file.create_block("b3", copy_from=block,
+                                      keep_copy_id=True)
+        self.assertEqual(copy.id, block.id)
+        self.assertEqual(sorted(b.name for b in section.referring_blocks),
+                         ["b2", "b3"])
+        for blk in (block, copy):
+            parent = blk.data_arrays["foo"].sources[0].parent_source
+            self.assertEqual(parent.name, "sauce")
+            self.assertTrue(parent._h5group.group.name.startswith(
+                "/data/{}/".format(blk.name)))
+
+        del self.file.sections[section.id]
+        self.assertIsNone(self.file.blocks["b2"].metadata)
+        self.assertIsNone(self.file.blocks["b3"].metadata)
+
     def test_section_link(self):
         self.section.create_property("PropOnSection", "value")
 
@@ -356,3 +450,86 @@ class TestSections(unittest.TestCase):
         time.sleep(1)  # wait for time to change
         section.repository = "repo"
         self.assertEqual(sectime, section.updated_at)
+
+    def test_import_export_dict(self):
+        tree = {
+            "session": {
+                "type": "recording",
+                "definition": "a recording session",
+                "properties": {
+                    "date": "2024-01-01",
+                    "trials": [1, 2, 3],
+                    "gain": {"values": 2.5, "unit": "mV",
+                             "definition": "amplifier gain"},
+                    "empty": {"values": [], "dtype": "int64"},
+                },
+                "sections": {
+                    "subject": {
+                        "type": "animal",
+                        "properties": {"species": "mouse"},
+                        "sections": {"cage": {"type": "housing"}}
+                    }
+                }
+            }
+        }
+        sections = self.file.import_metadata(tree)
+        assert len(sections) == 1
+        session = self.file.sections["session"]
+        assert session.type == "recording"
+        assert session.definition == "a recording session"
+        assert session["date"] == "2024-01-01"
+        assert session["trials"] == [1, 2, 3]
+        assert session.props["gain"].unit == "mV"
+        assert session.props["empty"].values == ()
+        assert session.props["empty"].data_type == nix.DataType.Int64
+        subject = session.sections["subject"]
+        assert subject["species"] == "mouse"
+        assert subject.parent == session
+        assert subject.sections["cage"].type == "housing"
+        assert session.created_at == subject.sections["cage"].created_at
+
+        exported = session.export_dict()
+        assert exported["id"] == session.id
+        assert exported["properties"]["trials"]["values"] == [1, 2, 3]
+        assert exported["properties"]["gain"] == {
+            "id": session.props["gain"].id, "values": [2.5], "unit": "mV",
+            "definition": "amplifier gain"
+        }
+        assert "cage" in exported["sections"]["subject"]["sections"]
+        assert session.export_dict(depth=0)["sections"] == {}
+        shallow = session.export_dict(depth=1)
+        assert shallow["sections"]["subject"]["sections"] == {}
+
+        with self.assertRaises(nix.exceptions.DuplicateName):
+            self.file.import_metadata({"session": {}})
+        with self.assertRaises(TypeError):
+            self.file.import_metadata({"bad": {"properties": {"x": [1, "a"]}}})
+        assert "bad" not in self.file.sections
+        # partial trees are removed through the reference index
+        assert self.section.referring_blocks == []
+        with self.assertRaises(TypeError):
+            self.file.import_metadata({"bad": {
+                "sections": {"child": {}},
+                "properties": {"x": {"values": 1, "odml_type": "text"}}
+            }})
+        assert "bad" not in self.file.sections
+        bad = self.file.import_metadata({"bad": {"sections": {"child": {}}}})
+        assert self.file.find_sections(name="child")[0].parent == bad[0]
+
+        # optional attributes are written with the import time
+        sec = self.file.import_metadata({"attrs": {"properties": {
+            "x": {"values": [1.5], "uncertainty": 1, "unit": "mV",
+                  "odml_type": "float"}
+        }}})[0]
+        prop = sec.props["x"]
+        assert prop.uncertainty == 1.0
+        assert prop.odml_type == nix.OdmlType.Float
+        assert prop.updated_at == sec.created_at
+        with self.assertRaises(TypeError):
+            self.file.import_metadata({"badunit": {"properties": {
+                "x": {"values": 1, "unit": 1}}}})
+
+        del self.file.sections["session"]
+        self.file.import_metadata({"session": exported})
+        session = self.file.sections["session"]
+        assert session.export_dict() == exported
@@ -147,6 +147,19 @@ class TestSources(unittest.TestCase):
         self.assertEqual(len(self.other.referring_multi_tags), 0)
         self.assertEqual(self.source.referring_multi_tags[0].id, mtag.id)
 
+    def test_inverse_search_updates(self):
+        self.assertEqual(self.source.referring_data_arrays, [])
+        self.array.sources.append(self.source)
+        self.assertEqual(self.source.referring_data_arrays, [self.array])
+        del self.array.sources[self.source.id]
+        self.assertEqual(self.source.referring_data_arrays, [])
+
+        other = self.block.create_data_array("other", "data_array", data=[1])
+        other.sources.append(self.source)
+        self.assertEqual(self.source.referring_data_arrays, [other])
+        del self.block.data_arrays[other.id]
+        self.assertEqual(self.source.referring_data_arrays, [])
+
     def test_deep_linking(self):
         lvl2 = self.third.create_source("lvl2", "source-test")
         lvl3 = lvl2.create_source("lvl3", "source-test")
@@ -207,6 +220,18 @@ class TestSources(unittest.TestCase):
         self.assertEqual(leaf1b.parent_source, leaf1)
         self.assertEqual(leaf2a.parent_source, leaf2)
 
+        # sources accessed through links have no parent object attached
+        self.array.sources.append(leaf1a)
+        self.array.sources.append(root)
+        self.assertEqual(self.array.sources[leaf1a.id].parent_source, leaf1)
+        self.assertIsNone(self.array.sources[root.id].parent_source)
+        leaf1c = self.array.sources[leaf1a.id].parent_source.create_source(
+            "leaf1c", "test")
+        self.assertEqual(self.array.sources[leaf1a.id].parent_source.id,
+                         leaf1.id)
+        self.array.sources.append(leaf1c)
+        self.assertEqual(self.array.sources[leaf1c.id].parent_source, leaf1)
+
         with self.assertRaises(ValueError):
             leaf2._find_parent_recursive(leaf2a.name)
         self.assertEqual(leaf2._find_parent_recursive(leaf2a.name, False), leaf2)
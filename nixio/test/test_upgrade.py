@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2014, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in section and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+import argparse
+import io
+import os
+import shutil
+import unittest
+from contextlib import redirect_stdout
+import h5py
+import numpy as np
+import nixio as nix
+from nixio.cmd import upgrade
+from .tmp import TempDir
+
+
+class TestUpgrade(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = TempDir("upgradetest")
+        self.testfilename = os.path.join(self.tmpdir.path, "upgradetest.nix")
+        nf = nix.File.open(self.testfilename, nix.FileMode.Overwrite)
+        blk = nf.create_block("block", "recordingsession")
+        da = blk.create_data_array("times", "spikes", data=[0.1, 0.5, 1.2])
+        da.append_range_dimension([0.1, 0.5, 1.2])
+        self.daid = da.id
+        sec = nf.create_section("session", "recording")
+        sec.create_property("duration", [1.5, 2.5])
+        sec.create_property("subject", ["mouse"])
+        nf.close()
+        self.make_old_format()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_old_format(self):
+        # files written before version 1.1.1 have no id, compound Property
+        # values and range dimensions aliasing their DataArray
+        vlen = h5py.string_dtype()
+        oldtype = np.dtype([("value", float), ("uncertainty", float),
+                            ("reference", vlen), ("filename", vlen),
+                            ("encoder", vlen), ("checksum", vlen)])
+        with h5py.File(self.testfilename, mode="a") as hfile:
+            hfile.attrs["version"] = (1, 0, 0)
+            del hfile.attrs["id"]
+            props = hfile["metadata/session/properties"]
+            attrs = dict(props["duration"].attrs)
+            del props["duration"]
+            olddata = np.array([(1.5, 0.1, "doi", "", "", ""),
+                                (2.5, 0.1, "doi", "", "", "")], dtype=oldtype)
+            props.create_dataset("duration", data=olddata)
+            props["duration"].attrs.update(attrs)
+            da = hfile["data/block/data_arrays/times"]
+            dim = da["dimensions/1"]
+            del dim["ticks"]
+            dim[self.daid] = da
+
+    def test_process_tasks(self):
+        tasks, fileversion, _ = upgrade.collect_tasks(self.testfilename)
+        self.assertEqual(fileversion, "1.0.0")
+        self.assertEqual(len(tasks), 4)
+        upgrade.process_tasks(self.testfilename, tasks)
+        self.assertEqual(upgrade.get_file_version(self.testfilename),
+                         nix.file.HDF_FF_VERSION)
+        self.assertEqual(upgrade.collect_tasks(self.testfilename)[0], [])
+
+        nf = nix.File.open(self.testfilename, nix.FileMode.ReadOnly)
+        try:
+            self.assertTrue(nix.util.is_uuid(nf.id))
+            sec = nf.sections["session"]
+            duration = sec.props["duration"]
+            self.assertEqual(duration.values, (1.5, 2.5))
+            self.assertEqual(duration.uncertainty, 0.1)
+            self.assertEqual(sec.props["duration.reference"].values,
+                             ("doi", "doi"))
+            self.assertNotIn("duration.filename", sec.props)
+            self.assertEqual(sec.props["subject"].values, ("mouse",))
+            dim = nf.blocks["block"].data_arrays["times"].dimensions[0]
+            self.assertEqual(dim.dimension_type, nix.DimensionType.Range)
+            self.assertTrue(dim.has_link)
+            self.assertEqual(dim.ticks, (0.1, 0.5, 1.2))
+            self.assertFalse(nf.validate()["errors"])
+        finally:
+            nf.close()
+
+    def test_main_errors(self):
+        # a Property with compound values lacking the extra fields can not
+        # be upgraded
+        broken = os.path.join(self.tmpdir.path, "broken.nix")
+        good = os.path.join(self.tmpdir.path, "good.nix")
+        outputs = []
+        for jobs in (1, 2):
+            shutil.copyfile(self.testfilename, broken)
+            with h5py.File(broken, mode="a") as hfile:
+                props = hfile["metadata/session/properties"]
+                del props["duration"]
+                props.create_dataset("duration", data=np.array(
+                    [(1.5,)], dtype=[("value", float)]))
+            shutil.copyfile(self.testfilename, good)
+            arguments = argparse.Namespace(file=[broken, good], force=True,
+                                           jobs=jobs)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                upgrade.main(arguments)
+            lines = output.getvalue().splitlines()
+            self.assertIn("Processing {} done".format(good), lines)
+            self.assertTrue(any(line.startswith(
+                "Processing {} failed: ".format(broken)) for line in lines))
+            self.assertEqual(upgrade.get_file_version(good),
+                             nix.file.HDF_FF_VERSION)
+            outputs.append(lines)
+        self.assertEqual(outputs[0], outputs[1])
@@ -7,6 +7,10 @@
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
 import unittest
+
+import numpy as np
+
+from nixio.exceptions import InvalidUnit
 from nixio.util import names, units
 
 
@@ -85,6 +89,21 @@ class TestUtil(unittest.TestCase):
 
         assert units.scaling(base_unit, scalable_1) == 1e-03
         assert units.scaling(base_unit, scalable_2) == 1e06
+        assert units.scaling(scalable_1, scalable_2) == 1e09
+        assert units.scaling("ms^2", "s^2") == 1e-06
+        with self.assertRaises(InvalidUnit):
+            units.scaling(base_unit, "g")
+
+    def test_unit_convert(self):
+        values = np.arange(6.0).reshape(3, 2)
+        np.testing.assert_allclose(units.convert(values, "mV", "V"),
+                                   values * 1e-3)
+        np.testing.assert_allclose(units.convert(values, ["ms", "V"],
+                                                 ["s", "mV"]),
+                                   values * [1e-3, 1e3])
+        assert units.convert(2, "kHz", "Hz") == 2000
+        with self.assertRaises(ValueError):
+            units.convert(values, ["ms"], ["s", "V"])
 
     def test_unit_split(self):
         unit_1 = 'kV'
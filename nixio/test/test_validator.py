@@ -463,6 +463,60 @@ class TestValidate (unittest.TestCase):
         res = self.file.validate()
         assert VW.OffsetNoUnit.format(2) in res["warnings"][da]
 
+    def test_parallel_validation(self):
+        da = self.file.blocks[1].data_arrays["data-2d"]
+        da.dimensions[1].unit = "sillyamps"
+        tag = self.file.blocks[0].tags["tag"]
+        tag.units = ("", "", "sillyamps")
+        src = self.file.blocks[1].sources[0].sources[0]
+        src._h5group.set_attr("type", None)
+        def summary(results):
+            return {kind: sorted((type(obj).__name__, obj.id, msgs)
+                                 for obj, msgs in results[kind].items())
+                    for kind in ("errors", "warnings")}
+
+        serial = summary(self.file.validate())
+        self.file.close()
+
+        self.file = nix.File.open(self.testfilename, nix.FileMode.ReadOnly)
+        res = self.file.validate(jobs=2)
+        self.assertEqual(summary(res), serial)
+        src = self.file.blocks[1].sources[0].sources[0]
+        assert VE.NoType in res["errors"][src]
+
+    def test_incremental_validation(self):
+        da = self.file.blocks[1].data_arrays["data-2d"]
+        da.dimensions[1].unit = "sillyamps"
+        stamp = da.updated_at
+        res = self.file.validate(since=stamp + 1)
+        assert not res["errors"]
+
+        da.force_updated_at(stamp + 2)
+        res = self.file.validate(since=stamp + 1)
+        self.assertEqual(list(res["errors"]), [da])
+        res = self.file.validate(since=stamp - 1)
+        assert da in res["errors"]
+        # objects updated in the second of the last validation are checked
+        res = self.file.validate(since=stamp + 2)
+        self.assertEqual(list(res["errors"]), [da])
+
+    def test_incremental_validation_features(self):
+        blk = self.file.blocks[0]
+        tag = blk.create_tag("tag-feature", "validation-test.tag", [0])
+        feat = tag.create_feature(blk.data_arrays["data-1d"],
+                                  nix.LinkType.Untagged)
+        stamp = max(tag.updated_at, feat.updated_at) + 10
+        checked = []
+
+        def report(obj, _errors, _warnings):
+            checked.append(obj)
+
+        nix.validator.check_block_tree(blk, report, since=stamp)
+        self.assertNotIn(tag, checked)
+        feat._h5group.set_attr("updated_at", nix.util.time_to_str(stamp))
+        nix.validator.check_block_tree(blk, report, since=stamp)
+        self.assertEqual(checked, [tag])
+
     @staticmethod
     def print_all_results(res):
         print("Errors")
@@ -6,73 +6,150 @@
 # Redistribution and use in source and binary forms, with or without
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
+import re
+from collections import deque
+
+import h5py
 
 import nixio
+from ..hdf5.h5group import H5Group
+
 
+_PATTERN_TYPE = type(re.compile(""))
 
-class Cont:
+
+class _Node:
     """
-    Simple container for an element an a level
+    A group visited during a search. The entity is only created when the
+    node or one of its descendants matches.
     """
 
-    def __init__(self, elem, level):
-        self.elem = elem
+    __slots__ = ("parent", "container", "name", "level", "entity")
+
+    def __init__(self, parent, container, name, level, entity=None):
+        self.parent = parent
+        self.container = container
+        self.name = name
         self.level = level
+        self.entity = entity
 
 
-def _find_sources(with_sources, filtr, limit):
-    """
-    Find a list of matching sources recursively.
-    For internal use.
+def _predicates(name=None, type_=None, attrs=None):
     """
+    Collects the attribute predicates of a search in a dictionary mapping
+    attribute names to conditions.
 
-    fifo = []
-    result = []
-    level = 0
+    :param name: Condition on the name of the entity.
+    :param type_: Condition on the type of the entity.
+    :param attrs: Conditions on further attributes of the entity, e.g.,
+                  ``{"definition": re.compile("electrode")}``.
+    :type attrs: dict
 
-    if isinstance(with_sources, nixio.source.Source):
-        fifo.append(Cont(with_sources, level))
-    else:
-        level += 1
-        fifo += [Cont(e, level) for e in with_sources.sources]
+    :returns: The predicates or None if there are no conditions.
+    :rtype: dict
+    """
+    preds = dict(attrs or {})
+    if name is not None:
+        preds["name"] = name
+    if type_ is not None:
+        preds["type"] = type_
+    return preds or None
 
-    while len(fifo) > 0:
-        child = fifo.pop(0)
 
-        level = child.level + 1
-        if level <= limit:
-            fifo += [Cont(e, level) for e in child.elem.sources]
+def _attr_matches(value, condition):
+    if isinstance(value, bytes):
+        value = value.decode()
+    if isinstance(condition, _PATTERN_TYPE):
+        return isinstance(value, str) and condition.search(value) is not None
+    if callable(condition):
+        return value is not None and bool(condition(value))
+    return value == condition
 
-        if filtr(child.elem):
-            result.append(child.elem)
 
-    return result
+def _matches(h5obj, preds):
+    if not preds:
+        return True
+    attrs = h5obj.attrs
+    return all(_attr_matches(attrs.get(key), cond)
+               for key, cond in preds.items())
 
 
-def _find_sections(with_sections, filtr, limit):
+def _find_entities(start, itemclass, container, filtr, limit, preds):
     """
-    Find a list of matching sections recursively.
+    Breadth first search through the HDF5 groups of a Section or Source tree.
+
+    The attribute predicates are evaluated on the raw HDF5 attributes;
+    entities are only created for groups that match them (and their
+    ancestors, which are needed as parents).
     For internal use.
     """
+    nixfile = start if isinstance(start, nixio.File) else start.file
+
+    def entity(node):
+        if node.entity is None:
+            parent = entity(node.parent)
+            h5group = H5Group(node.container, node.name)
+            node.entity = itemclass(nixfile, parent, h5group)
+        return node.entity
+
+    def children(node, h5obj, cname=container):
+        h5cont = h5obj.get(cname)
+        if not isinstance(h5cont, h5py.Group):
+            return []
+        return [(_Node(node, h5cont, name, node.level + 1), obj)
+                for name, obj in h5cont.items()]
+
+    root = _Node(None, None, None, 0, start)
+    if isinstance(start, itemclass):
+        fifo = deque([(root, start._h5group.group)])
+    elif isinstance(start, nixio.File):
+        # root sections are stored in the metadata group
+        fifo = deque(children(root, start._h5group.group, "metadata"))
+    else:
+        fifo = deque(children(root, start._h5group.group))
 
-    fifo = []
     result = []
-    level = 0
+    while fifo:
+        node, h5obj = fifo.popleft()
+        if node.level + 1 <= limit:
+            fifo.extend(children(node, h5obj))
+        if _matches(h5obj, preds) and filtr(entity(node)):
+            result.append(entity(node))
+    return result
 
-    if isinstance(with_sections, nixio.Section):
-        fifo.append(Cont(with_sections, level))
-    else:
-        level += 1
-        fifo += [Cont(e, level) for e in with_sections.sections]
 
-    while len(fifo) > 0:
-        child = fifo.pop(0)
+def _find_sources(with_sources, filtr, limit, preds=None):
+    """
+    Find a list of matching sources recursively.
+    For internal use.
+    """
+    return _find_entities(with_sources, nixio.source.Source, "sources",
+                          filtr, limit, preds)
+
 
-        level = child.level + 1
-        if level <= limit:
-            fifo += [Cont(e, level) for e in child.elem.sections]
+def _find_sections(with_sections, filtr, limit, preds=None):
+    """
+    Find a list of matching sections recursively.
+    For internal use.
+    """
+    return _find_entities(with_sections, nixio.Section, "sections",
+                          filtr, limit, preds)
 
-        if filtr(child.elem):
-            result.append(child.elem)
 
-    return result
+def _section_groups(h5metadata, preds=None):
+    """
+    Breadth first iteration over the HDF5 groups of all Sections below the
+    metadata root that match the attribute predicates, without creating
+    Section entities.
+    For internal use.
+    """
+    fifo = deque(obj for obj in h5metadata.values()
+                 if isinstance(obj, h5py.Group))
+    while fifo:
+        h5obj = fifo.popleft()
+        children = h5obj.get("sections")
+        if isinstance(children, h5py.Group):
+            fifo.extend(obj for obj in children.values()
+                        if isinstance(obj, h5py.Group))
+        if _matches(h5obj, preds):
+            yield h5obj
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# Copyright © 2024, German Neuroinformatics Node (G-Node)
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted under the terms of the BSD License. See
+# LICENSE file in the root of the Project.
+import os
+import sqlite3
+
+import h5py
+
+from . import find as finders
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sections (
+    path TEXT PRIMARY KEY, name TEXT, type TEXT
+);
+CREATE TABLE IF NOT EXISTS properties (
+    path TEXT PRIMARY KEY, name TEXT, section TEXT
+);
+CREATE TABLE IF NOT EXISTS vals (property TEXT, value TEXT);
+CREATE INDEX IF NOT EXISTS sections_name ON sections (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS sections_type ON sections (type COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS properties_name
+    ON properties (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS vals_property ON vals (property);
+"""
+
+
+def _condition(column, pattern, case_sensitive, full_match):
+    """
+    Returns an SQL condition and its parameter for matching the column
+    against the pattern.
+    """
+    if full_match:
+        if case_sensitive:
+            return "{} = ?".format(column), pattern
+        return "{} = ? COLLATE NOCASE".format(column), pattern
+    if case_sensitive:
+        return "instr({}, ?) > 0".format(column), pattern
+    return "instr(lower({}), ?) > 0".format(column), pattern.lower()
+
+
+class MetadataIndex:
+    """
+    Search index for the metadata of a NIX file, stored in an SQLite
+    database.
+
+    The index maps the names and types of all Sections and the names and
+    values of all Properties to their HDF5 paths. It is either kept in memory
+    or stored in a sidecar file next to the NIX file, together with a
+    fingerprint of the file (id, size and modification time). When a stored
+    index is opened for a file that has not changed since it was built, it
+    is used as is; otherwise it is rebuilt. Only files that changed are
+    therefore indexed again when searching a collection of files
+    repeatedly. Changes made through the File that owns the index are
+    applied to the rows of the changed Sections only (see
+    update_sections).
+
+    :param nixfile: The file to index.
+    :type nixfile: nixio.File
+    :param path: The path of the SQLite database or None for an index kept
+                 in memory.
+    :type path: str
+    """
+
+    def __init__(self, nixfile, path=None):
+        self._file = nixfile
+        self.path = path
+        self._db = sqlite3.connect(":memory:" if path is None else path)
+        self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def sidecar_path(filename):
+        """
+        Returns the default path of the stored index of a NIX file.
+        """
+        return "{}.nixidx".format(filename)
+
+    def _fingerprint(self):
+        stat = os.stat(self._file._h5file.filename)
+        return "{}:{}:{}".format(self._file.id, stat.st_size,
+                                 stat.st_mtime_ns)
+
+    def is_current(self):
+        """
+        True if the index was built for the current state of the file.
+        """
+        row = self._db.execute("SELECT value FROM info "
+                               "WHERE key = 'fingerprint'").fetchone()
+        return row is not None and row[0] == self._fingerprint()
+
+    def update(self, force=False):
+        """
+        Rebuilds the index if the file changed since it was built.
+
+        :param force: Rebuild the index even if the file seems unchanged.
+        :type force: bool
+        """
+        if force or not self.is_current():
+            self.rebuild()
+
+    def _section_rows(self, h5sec, properties, values):
+        # returns the row of a Section and adds the rows of its Properties
+        # and their values to the lists
+        nixfile = self._file
+        attrs = h5sec.attrs
+        h5props = h5sec.get("properties")
+        for pname in h5props if h5props is not None else ():
+            path = "{}/{}".format(h5props.name, pname)
+            properties.append((path, pname, h5sec.name))
+            pvalues = nixfile._raw_property_values(h5props, pname)
+            values.extend((path, str(_decode(val)))
+                          for val in pvalues or ())
+        return (h5sec.name, _decode(attrs.get("name")),
+                _decode(attrs.get("type")))
+
+    def rebuild(self):
+        """
+        Indexes the metadata of the file in a single pass over its HDF5
+        groups.
+        """
+        sections, properties, values = list(), list(), list()
+        for h5sec in finders._section_groups(self._file._metadata.group):
+            sections.append(self._section_rows(h5sec, properties, values))
+
+        with self._db:
+            for table in ("sections", "properties", "vals"):
+                self._db.execute("DELETE FROM {}".format(table))
+            self._db.executemany("INSERT INTO sections VALUES (?, ?, ?)",
+                                 sections)
+            self._db.executemany("INSERT INTO properties VALUES (?, ?, ?)",
+                                 properties)
+            self._db.executemany("INSERT INTO vals VALUES (?, ?)", values)
+            self._db.execute("INSERT OR REPLACE INTO info "
+                             "VALUES ('fingerprint', ?)",
+                             (self._fingerprint(),))
+
+    def update_sections(self, changes):
+        """
+        Updates the rows of changed Sections and their Properties without
+        traversing the rest of the metadata tree. Rows of Sections and
+        Properties that still exist keep their position in the search
+        results, new ones are added at the end.
+
+        :param changes: Maps the HDF5 paths of the changed Sections to True
+                        if their subsections changed as well. Sections that
+                        no longer exist are removed with their subsections.
+        :type changes: dict
+        """
+        h5file = self._file._h5file
+        with self._db:
+            for path, subtree in changes.items():
+                h5sec = h5file.get(path)
+                if not isinstance(h5sec, h5py.Group):
+                    self._delete_sections(path)
+                    continue
+                if subtree:
+                    self._delete_sections(path, keep_root=True)
+                self._update_section(h5sec)
+                if subtree and isinstance(h5sec.get("sections"), h5py.Group):
+                    for h5child in finders._section_groups(h5sec["sections"]):
+                        self._update_section(h5child)
+
+    def _update_section(self, h5sec):
+        properties, values = list(), list()
+        row = self._section_rows(h5sec, properties, values)
+        db = self._db
+        # update existing rows in place to keep their order
+        db.execute("INSERT OR IGNORE INTO sections VALUES (?, ?, ?)", row)
+        db.execute("UPDATE sections SET name = ?, type = ? WHERE path = ?",
+                   row[1:] + row[:1])
+        current = set(prop[0] for prop in properties)
+        for (path,) in db.execute("SELECT path FROM properties "
+                                  "WHERE section = ?", row[:1]).fetchall():
+            if path not in current:
+                db.execute("DELETE FROM properties WHERE path = ?", (path,))
+            db.execute("DELETE FROM vals WHERE property = ?", (path,))
+        db.executemany("INSERT OR IGNORE INTO properties VALUES (?, ?, ?)",
+                       properties)
+        db.executemany("INSERT INTO vals VALUES (?, ?)", values)
+
+    def _delete_sections(self, path, keep_root=False):
+        # removes the rows of the Section at path (unless keep_root) and of
+        # all Sections below it
+        prefix = path + "/"
+        match = "substr({}, 1, ?) = ?"
+        params = (len(prefix), prefix)
+        sections = match.format("path")
+        if not keep_root:
+            sections = "(path = ? OR {})".format(sections)
+            params = (path,) + params
+        owners = "SELECT path FROM sections WHERE " + sections
+        self._db.execute("DELETE FROM vals WHERE property IN (SELECT path "
+                         "FROM properties WHERE section IN ({}))".format(owners),
+                         params)
+        self._db.execute("DELETE FROM properties WHERE section IN "
+                         "({})".format(owners), params)
+        self._db.execute("DELETE FROM sections WHERE " + sections, params)
+
+    def sections(self, name=None, type_=None, case_sensitive=False,
+                 full_match=False):
+        """
+        Returns the HDF5 paths of the Sections matching the name and type
+        patterns.
+
+        :rtype: list of str
+        """
+        conditions = list()
+        if name is not None:
+            conditions.append(_condition("name", name, case_sensitive,
+                                         full_match))
+        if type_ is not None:
+            conditions.append(_condition("type", type_, case_sensitive,
+                                         full_match))
+        return self._select("SELECT path FROM sections", conditions)
+
+    def properties(self, name=None, value=None, section_type=None,
+                   case_sensitive=False, full_match=False):
+        """
+        Returns the HDF5 paths of the Properties matching the name and value
+        patterns, optionally only within Sections matching section_type.
+
+        :rtype: list of str
+        """
+        conditions = list()
+        if name is not None:
+            conditions.append(_condition("name", name, case_sensitive,
+                                         full_match))
+        if value is not None:
+            cond, param = _condition("value", value, case_sensitive,
+                                     full_match)
+            conditions.append(("path IN (SELECT property FROM vals "
+                               "WHERE {})".format(cond), param))
+        if section_type is not None:
+            cond, param = _condition("type", section_type, case_sensitive,
+                                     full_match)
+            conditions.append(("section IN (SELECT path FROM sections "
+                               "WHERE {})".format(cond), param))
+        return self._select("SELECT path FROM properties", conditions)
+
+    def _select(self, query, conditions):
+        if conditions:
+            query += " WHERE " + " AND ".join(cond for cond, _ in conditions)
+        query += " ORDER BY rowid"
+        params = [param for _, param in conditions]
+        return [row[0] for row in self._db.execute(query, params)]
+
+    def close(self):
+        self._db.close()
+
+
+def _decode(attr):
+    return attr.decode() if isinstance(attr, bytes) else attr
@@ -8,10 +8,14 @@
 # LICENSE file in the root of the Project.
 
 import re
+from functools import lru_cache
 try:
     from collections.abc import Sequence
 except ImportError:
     from collections import Sequence
+
+import numpy as np
+
 from ..exceptions import InvalidUnit
 
 
@@ -43,6 +47,22 @@ PREFIX_FACTORS = {"y": 1.0e-24,
                   "Z": 1.0e21,
                   "Y": 1.0e24}
 
+# compiled unit patterns
+_ATOMIC = "{prefix}?{unit}{power}?".format(prefix=PREFIXES, unit=UNITS,
+                                          power=POWER)
+ATOMIC_RE = re.compile("^{}$".format(_ATOMIC))
+COMPOUND_RE = re.compile("({atomic}(\\*|/))+{atomic}".format(atomic=_ATOMIC))
+_PREFIX_GROUP = "(?P<prefix>{})".format(PREFIXES)
+_UNIT_GROUP = "(?P<unit>{})".format(UNITS)
+_POWER_GROUP = "(?P<power>{})".format(POWER)
+PREFIX_UNIT_POWER_RE = re.compile(_PREFIX_GROUP + _UNIT_GROUP + _POWER_GROUP)
+PREFIX_UNIT_RE = re.compile(_PREFIX_GROUP + _UNIT_GROUP)
+UNIT_POWER_RE = re.compile(_UNIT_GROUP + _POWER_GROUP)
+OPT_PREFIX_UNIT_POWER_RE = re.compile(PREFIXES + "?" + UNITS + POWER + "?")
+
+# number of parsed units and unit pairs kept in memory
+UNIT_CACHE_SIZE = 1024
+
 
 def sanitizer(unit):
     """
@@ -84,12 +104,7 @@ def is_atomic(unit):
     :returns: True if unit is atomic, False otherwise.
     :rtype: bool
     """
-    atomic_unit = re.compile(
-        "^{prefix}?{unit}{power}?$".format(prefix=PREFIXES,
-                                           unit=UNITS,
-                                           power=POWER)
-    )
-    return atomic_unit.match(unit)
+    return ATOMIC_RE.match(unit)
 
 
 def is_compound(unit):
@@ -102,13 +117,7 @@ def is_compound(unit):
               False otherwise.
     :rtype: bool
     """
-    atomic_unit = "{prefix}?{unit}{power}?".format(
-        prefix=PREFIXES, unit=UNITS, power=POWER
-    )
-    compound_unit = re.compile(
-        "({atomic}(\\*|/))+{atomic}".format(atomic=atomic_unit)
-    )
-    return unit and compound_unit.search(unit)
+    return unit and COMPOUND_RE.search(unit)
 
 
 def scalable(units_a, units_b):
@@ -133,20 +142,27 @@ def scalable(units_a, units_b):
                 return False
         return True
 
-    if not (is_si(units_a) and is_si(units_b)):
+    return _scalable_units(units_a, units_b)
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def _scalable_units(unit_a, unit_b):
+    if not (is_si(unit_a) and is_si(unit_b)):
         return False
 
-    _, a_unit, a_power = split(units_a)
-    _, b_unit, b_power = split(units_b)
+    _, a_unit, a_power = split(unit_a)
+    _, b_unit, b_power = split(unit_b)
     if a_unit != b_unit or a_power != b_power:
         return False
 
     return True
 
 
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
 def scaling(origin, destination):
     """
-    Returns the scaling factor to convert from one unit to another.
+    Returns the scaling factor to convert from one unit to another. Factors
+    are cached for the most recently used unit pairs.
 
     :param origin: The original unit string.
     :param destination: The destination unit string.
@@ -171,7 +187,7 @@ def scaling(origin, destination):
         scale = PREFIX_FACTORS[org_prefix]
     elif not org_prefix and dest_prefix:
         scale = 1.0 / PREFIX_FACTORS[dest_prefix]
-    elif not org_prefix and not dest_prefix:
+    elif org_prefix and dest_prefix:
         scale = PREFIX_FACTORS[org_prefix] / PREFIX_FACTORS[dest_prefix]
 
     if org_power:
@@ -181,39 +197,57 @@ def scaling(origin, destination):
     return scale
 
 
+def convert(values, origin, destination):
+    """
+    Converts values from one unit to another. The values can be numbers or
+    arrays of any shape. If lists of units are given, they apply to the
+    values along the last axis (e.g., the columns of a 2D array).
+
+    :param values: The values to convert.
+    :param origin: The original unit string or a list of unit strings.
+    :param destination: The destination unit string or a list of unit
+                        strings.
+
+    :returns: The converted values.
+    :rtype: numpy.ndarray
+    """
+    if isinstance(origin, str) and isinstance(destination, str):
+        factors = scaling(origin, destination)
+    else:
+        if len(origin) != len(destination):
+            raise ValueError("The lists of origin and destination units "
+                             "must have the same length.")
+        factors = np.array([scaling(org, dest)
+                            for org, dest in zip(origin, destination)])
+    return np.asarray(values) * factors
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
 def split(combined_unit):
     """
     Splits a unit string into magnitude prefix, the base unit, and the power.
+    The results are cached for the most recently used units.
 
     :param combined_unit: The unit string.
 
     :returns: A tuple of prefix, base unit, and power.
     :rtype: tuple
     """
-    prefix_re = "(?P<prefix>{})".format(PREFIXES)
-    unit_re = "(?P<unit>{})".format(UNITS)
-    power_re = "(?P<power>{})".format(POWER)
-    pup = re.compile(prefix_re + unit_re + power_re)
-    prefix_matcher = re.compile(prefix_re + unit_re)
-    unit_matcher = re.compile(unit_re + power_re)
-    # u = re.compile(unit_re)
-    # p = re.compile(prefix_re)
-
-    match = pup.match(combined_unit)
+    match = PREFIX_UNIT_POWER_RE.match(combined_unit)
     if match:
         prefix = match.group("prefix")
         unit = match.group("unit")
         power = match.group("power")[1:]
         return prefix, unit, power
 
-    match = unit_matcher.match(combined_unit)
+    match = UNIT_POWER_RE.match(combined_unit)
     if match:
         prefix = ""
         unit = match.group("unit")
         power = match.group("power")[1:]
         return prefix, unit, power
 
-    match = prefix_matcher.match(combined_unit)
+    match = PREFIX_UNIT_RE.match(combined_unit)
     if match:
         prefix = match.group("prefix")
         unit = match.group("unit")
@@ -246,8 +280,7 @@ def split_compound(compound_unit):
     :returns: A tuple containing the atomic units.
     :rtype: tuple
     """
-    opt_pup = re.compile(PREFIXES + "?" + UNITS + POWER + "?")
-    match = opt_pup.match(compound_unit)
+    match = OPT_PREFIX_UNIT_POWER_RE.match(compound_unit)
     sep = ""
     atomic_units = []
     while match and (match.end() < len(match.string)):
@@ -259,7 +292,7 @@ def split_compound(compound_unit):
         else:
             atomic_units.append(unit)
         sep = suffix[0]
-        match = opt_pup.match(suffix[1:])
+        match = OPT_PREFIX_UNIT_POWER_RE.match(suffix[1:])
     unit = match.group(0)
     if sep == "/":
         atomic_units.append(invert_power(unit))
@@ -6,6 +6,8 @@
 # Redistribution and use in source and binary forms, with or without
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
+import re
+
 import numpy as np
 
 import h5py
@@ -17,6 +19,10 @@ from . import names
 
 vlen_str_dtype = h5py.string_dtype(encoding='utf-8', length=None)
 
+# canonical form of a UUID, as created by create_id
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+                      r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
 
 def create_id():
     """
@@ -29,6 +35,13 @@ def create_id():
 
 
 def is_uuid(id_str):
+    if isinstance(id_str, str):
+        if _UUID_RE.fullmatch(id_str):
+            return True
+        if len(id_str) < 32:
+            # too short for any notation of a UUID, e.g. an entity name
+            return False
+    # other notations accepted by UUID (e.g., without hyphens or in braces)
     try:
         UUID(str(id_str))
         return True
@@ -133,6 +146,79 @@ def check_attr_type(value, type_):
 
 
 def apply_polynomial(coefficients, origin, data):
-    data[:] = data[:] - origin
-    if coefficients:
-        data[:] = np.polynomial.polynomial.polyval(data, coefficients)
+    """
+    Applies the calibration polynomial defined by ``coefficients`` and the
+    expansion ``origin`` to ``data`` in place. ``data`` must be a floating
+    point array.
+
+    :param coefficients: The polynomial coefficients, lowest order first
+    :param origin: The expansion origin
+    :param data: The array to calibrate
+    """
+    if origin:
+        np.subtract(data, origin, out=data)
+    if not len(coefficients):
+        return
+    if len(coefficients) <= 2:
+        # linear calibration, no temporaries needed
+        if len(coefficients) == 2:
+            np.multiply(data, coefficients[1], out=data)
+        else:
+            data[...] = 0.0
+        if coefficients[0]:
+            np.add(data, coefficients[0], out=data)
+        return
+    # Horner's scheme with a single copy of the input
+    xvals = data.copy()
+    data[...] = coefficients[-1]
+    for coeff in coefficients[-2::-1]:
+        np.multiply(data, xvals, out=data)
+        np.add(data, coeff, out=data)
+
+
+def quantize(data, dtype, resolution=None):
+    """
+    Quantizes floating point data to integers of the given type such that
+    ``data ~ offset + resolution * result``. The integer range of ``dtype`` is
+    centred on the range of the data.
+
+    :param data: The floating point data to quantize
+    :param dtype: The integer type of the quantized data
+    :param resolution: The value of one integer step. If None, the
+                       resolution is chosen such that the data range spans
+                       the full integer range.
+
+    :returns: A tuple of the quantized data, the offset, the resolution and
+              the maximum absolute quantization error.
+    :rtype: tuple
+    """
+    data = np.asarray(data, dtype=np.float64)
+    dtype = np.dtype(dtype)
+    if dtype.kind not in "iu":
+        raise TypeError("Quantized data must be stored as integers, "
+                        "not {}".format(dtype))
+    if not np.all(np.isfinite(data)):
+        raise ValueError("Cannot quantize data containing NaN or infinite "
+                         "values")
+    info = np.iinfo(dtype)
+    imin, imax = float(info.min), float(info.max)
+    low, high = (data.min(), data.max()) if data.size else (0.0, 0.0)
+    if resolution is None:
+        resolution = (high - low) / (imax - imin)
+        if resolution == 0:
+            resolution = 1.0
+    elif resolution <= 0:
+        raise ValueError("Quantization resolution must be positive")
+    resolution = float(resolution)
+
+    offset = float((high + low) / 2 - resolution * (imax + imin) / 2)
+    quantized = np.rint((data - offset) / resolution)
+    if data.size and (quantized.min() < imin or quantized.max() > imax):
+        raise ValueError("Data range [{}, {}] cannot be represented as {} "
+                         "with resolution {}".format(low, high, dtype,
+                                                     resolution))
+    quantized = quantized.astype(dtype)
+    error = 0.0
+    if data.size:
+        error = float(np.max(np.abs(offset + resolution * quantized - data)))
+    return quantized, offset, resolution, error
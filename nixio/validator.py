@@ -6,6 +6,8 @@
 # Redistribution and use in source and binary forms, with or without
 # modification, are permitted under the terms of the BSD License. See
 # LICENSE file in the root of the Project.
+import numpy as np
+
 from .util import units
 from .dimension_type import DimensionType
 
@@ -91,11 +93,177 @@ class ValidationWarning:
     NoUnit = "unit is not set"
 
 
-def check_file(nixfile):
+class CheckCache:
+    """
+    Data shared between the checks of a single validation run: the shapes
+    and dimension units of DataArrays, which are needed again for every Tag
+    and MultiTag referencing them, and the results of unit checks.
+    """
+
+    def __init__(self):
+        self._arrays = dict()
+        self._units = dict()
+
+    def array_info(self, data_array):
+        """
+        Returns the number of data dimensions and the dimension units (see
+        get_dim_units) of a DataArray.
+        """
+        info = self._arrays.get(data_array.id)
+        if info is None:
+            info = (len(data_array.shape), get_dim_units(data_array))
+            self._arrays[data_array.id] = info
+        return info
+
+    def set_dim_units(self, data_array, dim_units):
+        self._arrays[data_array.id] = (len(data_array.shape), dim_units)
+
+    def unit_check(self, func, *args):
+        """
+        Returns func(*args) for one of the unit checks, computing it only
+        once per run.
+        """
+        key = (func,) + args
+        if key not in self._units:
+            self._units[key] = func(*args)
+        return self._units[key]
+
+
+def _updated_since(entity, since):
+    # timestamps have a resolution of one second, so objects updated in the
+    # second of the last validation are checked again
+    return since is None or entity.updated_at >= since
+
+
+def check_block_tree(block, report, cache=None, since=None):
+    """
+    Validate a Block and all contained Groups, DataArrays, Tags, MultiTags
+    and Sources and pass the errors and warnings of each object to report.
+
+    :param block: The Block to check.
+    :param report: Function called as report(obj, errors, warnings) for
+                   each checked object.
+    :param cache: The CheckCache of the validation run.
+    :param since: If given, only objects updated at or after this time
+                  (POSIX time) are checked. Tags and MultiTags are also
+                  checked if one of their references or features was
+                  updated. Changes of dimensions do not update the
+                  timestamp of their DataArray and are only found by a full
+                  validation.
+    """
+    if cache is None:
+        cache = CheckCache()
+    if _updated_since(block, since):
+        report(block, *check_block(block))
+
+    # Groups
+    for group in block.groups:
+        if _updated_since(group, since):
+            report(group, *check_group(group))
+
+    # DataArrays
+    updated_arrays = set()
+    for da in block.data_arrays:
+        if _updated_since(da, since):
+            updated_arrays.add(da.id)
+            report(da, *check_data_array(da, cache))
+
+    def feature_updated(feat):
+        if _updated_since(feat, since):
+            return True
+        try:
+            return feat.data.id in updated_arrays
+        except RuntimeError:
+            # features without data are checked with their tag
+            return True
+
+    def tag_updated(tag):
+        return (_updated_since(tag, since) or
+                any(ref.id in updated_arrays for ref in tag.references) or
+                any(feature_updated(feat) for feat in tag.features))
+
+    # Tags
+    for tag in block.tags:
+        if tag_updated(tag):
+            report(tag, *check_tag(tag, cache))
+
+    # MultiTags
+    for mtag in block.multi_tags:
+        if tag_updated(mtag):
+            report(mtag, *check_multi_tag(mtag, cache))
+
+    # Sources
+    def traverse_sources(sources):
+        # for recursively checking a source tree
+        for source in sources:
+            if _updated_since(source, since):
+                report(source, *check_source(source))
+            traverse_sources(source.sources)
+
+    traverse_sources(block.sources)
+
+
+def _check_block_file(filename, block_name, since):
+    # worker for parallel validation; entities can not be passed between
+    # processes, so the results are returned by HDF5 path
+    from .file import File, FileMode
+    results = {"errors": dict(), "warnings": dict()}
+
+    def report(obj, errors, warnings):
+        path = obj._h5group.group.name
+        if errors:
+            results["errors"][path] = errors
+        if warnings:
+            results["warnings"][path] = warnings
+
+    nixfile = File.open(filename, FileMode.ReadOnly)
+    try:
+        check_block_tree(nixfile.blocks[block_name], report, since=since)
+    finally:
+        nixfile.close()
+    return results
+
+
+def entity_at(nixfile, path):
+    """
+    Returns the Block, Group, DataArray, Tag, MultiTag, Source or Section
+    stored at the given HDF5 path of the file.
+    """
+    from .block import Block
+    from .data_array import DataArray
+    from .group import Group
+    from .multi_tag import MultiTag
+    from .section import Section
+    from .source import Source
+    from .tag import Tag
+    from .hdf5.h5group import H5Group
+
+    h5group = H5Group.create_from_h5obj(nixfile._h5file[path])
+    parts = path.strip("/").split("/")
+    if parts[0] == "metadata":
+        return Section(nixfile, None, h5group)
+    if len(parts) == 2:
+        return Block(nixfile, nixfile, h5group)
+    classes = {"groups": Group, "data_arrays": DataArray, "tags": Tag,
+               "multi_tags": MultiTag, "sources": Source}
+    block = nixfile.blocks[parts[1]]
+    return classes[parts[-2]](nixfile, block, h5group)
+
+
+def check_file(nixfile, jobs=1, since=None):
     """
     Validate a NIX file and all contained objects and return all errors and
     warnings for each individual object.
 
+    :param jobs: The number of worker processes. With more than one job, the
+                 Blocks of a file opened read-only are validated in parallel,
+                 each worker opening the file on its own.
+    :type jobs: int
+    :param since: If given, only validate objects that were updated at or
+                  after this time (POSIX time), e.g., the time of the previous
+                  validation. The file itself is always checked.
+    :type since: int
+
     :returns: A nested dictionary of errors and warnings. Each subdictionary
     is indexed by the object with values describing the error or warning.
     :rtype: Dictionary
@@ -120,49 +288,38 @@ def check_file(nixfile):
         if warnings:
             results["warnings"][obj] = warnings
 
-    # Sources
-    def traverse_sources(sources):
-        # for recursively checking a source tree
-        for source in sources:
-            src_errors, src_warnings = check_source(source)
-            update_results(source, src_errors, src_warnings)
-            traverse_sources(source.sources)
+    # Blocks
+    from .file import FileMode
+    block_names = [block.name for block in nixfile.blocks]
+    if (jobs > 1 and len(block_names) > 1 and
+            nixfile.mode == FileMode.ReadOnly):
+        # imported here, it is only needed for parallel validation
+        from concurrent.futures import ProcessPoolExecutor
+        filename = nixfile._h5file.filename
+        with ProcessPoolExecutor(min(jobs, len(block_names))) as pool:
+            futures = [pool.submit(_check_block_file, filename, name, since)
+                       for name in block_names]
+            for future in futures:
+                for kind, paths in future.result().items():
+                    for path, messages in paths.items():
+                        results[kind][entity_at(nixfile, path)] = messages
+    else:
+        cache = CheckCache()
+        for block in nixfile.blocks:
+            check_block_tree(block, update_results, cache, since)
 
     # Sections
+    def section_updated(section):
+        return (_updated_since(section, since) or
+                any(_updated_since(prop, since) for prop in section.props))
+
     def traverse_sections(sections):
         # for recursively checking a metadata tree
         for section in sections:
-            sec_errors, sec_warnings = check_section(section)
-            update_results(section, sec_errors, sec_warnings)
+            if section_updated(section):
+                update_results(section, *check_section(section))
             traverse_sections(section.sections)
 
-    # Blocks
-    for block in nixfile.blocks:
-        blk_errors, blk_warnings = check_block(block)
-        update_results(block, blk_errors, blk_warnings)
-
-        # Groups
-        for group in block.groups:
-            grp_errors, grp_warnings = check_group(group)
-            update_results(group, grp_errors, grp_warnings)
-
-        # DataArrays
-        for da in block.data_arrays:
-            da_errors, da_warnings = check_data_array(da)
-            update_results(da, da_errors, da_warnings)
-
-        # Tags
-        for tag in block.tags:
-            tag_errors, tag_warnings = check_tag(tag)
-            update_results(tag, tag_errors, tag_warnings)
-
-        # MultiTags
-        for mtag in block.multi_tags:
-            mtag_errors, mtag_warnings = check_multi_tag(mtag)
-            update_results(mtag, mtag_errors, mtag_warnings)
-
-        traverse_sources(block.sources)
-
     traverse_sections(nixfile.sections)
 
     return results
@@ -190,24 +347,32 @@ def check_group(group):
     return errors, list()
 
 
-def check_data_array(da):
+def check_data_array(da, cache=None):
     """
     Validate a DataArray and its Dimensions and return all errors and warnings.
     Errors and warnings about Dimension objects are included in the DataArray
     errors and warnings lists.
 
+    :param cache: The CheckCache of the validation run, which receives the
+                  dimension units of the DataArray for later Tag checks.
+
     :returns: A list of 'errors' and a list of 'warnings'
     """
+    if cache is None:
+        cache = CheckCache()
     errors = check_entity(da)
     warnings = list()
 
     if not da.data_type:
         errors.append(ValidationError.NoDataType)
 
-    if len(da.dimensions) != len(da.shape):
+    dimensions = list(da.dimensions)
+    shape = da.shape
+    if len(dimensions) != len(shape):
         errors.append(ValidationError.DimensionMismatch)
 
-    if da.unit and not units.is_si(da.unit):
+    unit = da.unit
+    if unit and not cache.unit_check(units.is_si, unit):
         warnings.append(ValidationWarning.InvalidUnit)
 
     if da.polynom_coefficients and not da.expansion_origin:
@@ -215,34 +380,47 @@ def check_data_array(da):
     elif da.expansion_origin and not da.polynom_coefficients:
         warnings.append(ValidationWarning.NoPolynomialCoefficients)
 
-    for idx, (dim, datalen) in enumerate(zip(da.dimensions, da.shape), 1):
+    dim_units = list()
+    for idx, dim in enumerate(dimensions, 1):
+        dimtype = dim.dimension_type
+        if dimtype in (DimensionType.Range, DimensionType.Sample):
+            dim_units.append(dim.unit or "")
+        elif dimtype == DimensionType.Set:
+            dim_units.append("")
+        if idx > len(shape):
+            continue
+        datalen = shape[idx - 1]
         if not dim.index or dim.index <= 0:
             errors.append(ValidationError.InvalidDimensionIndex.format(idx))
         elif dim.index != idx:
             errors.append(
                 ValidationError.IncorrectDimensionIndex.format(idx, dim.index)
             )
-        if dim.dimension_type == DimensionType.Range:
-            if dim.ticks is not None and len(dim.ticks) != datalen:
+        if dimtype == DimensionType.Range:
+            ticks = dim.ticks
+            if ticks is not None and len(ticks) != datalen:
                 # if ticks is None or empty, it will be reported by the
                 # dimension check function
                 errors.append(
                     ValidationError.RangeDimTicksMismatch.format(idx)
                 )
-            dim_errors, dim_warnings = check_range_dimension(dim, idx)
-        elif dim.dimension_type == DimensionType.Sample:
-            dim_errors, dim_warnings = check_sampled_dimension(dim, idx)
-        elif dim.dimension_type == DimensionType.Set:
+            dim_errors, dim_warnings = check_range_dimension(dim, idx, ticks,
+                                                             cache)
+        elif dimtype == DimensionType.Sample:
+            dim_errors, dim_warnings = check_sampled_dimension(dim, idx,
+                                                               cache)
+        elif dimtype == DimensionType.Set:
             if dim.labels and len(dim.labels) != datalen:
                 # empty labels is allowed
                 errors.append(ValidationError.SetDimLabelsMismatch.format(idx))
             dim_errors, dim_warnings = check_set_dimension()
         errors.extend(dim_errors)
         warnings.extend(dim_warnings)
+    cache.set_dim_units(da, dim_units)
     return errors, warnings
 
 
-def check_tag(tag):
+def check_tag(tag, cache=None):
     """
     Validate a Tag and its Features and return all errors and warnings.
     Errors and warnings about Features are included in the Tag errors and
@@ -255,30 +433,36 @@ def check_tag(tag):
 
     :returns: A list of 'errors' and a list of 'warnings'
     """
+    if cache is None:
+        cache = CheckCache()
     errors = check_entity(tag)
     warnings = list()
 
-    if not tag.position:
+    position = tag.position
+    tag_units = tag.units
+    if not position:
         errors.append(ValidationError.NoPosition)
-    if tag.references:
-        posdim = len(tag.position)
-        if any(posdim != len(da.shape) for da in tag.references):
+    refs_info = [cache.array_info(da) for da in tag.references]
+    if refs_info:
+        posdim = len(position)
+        if any(posdim != ndim for ndim, _ in refs_info):
             errors.append(ValidationError.PositionDimensionMismatch)
-        if tag.extent:
-            extlen = len(tag.extent)
+        extent = tag.extent
+        if extent:
+            extlen = len(extent)
             if extlen != posdim:
                 errors.append(ValidationError.PositionExtentMismatch)
-            if any(extlen != len(da.shape) for da in tag.references):
+            if any(extlen != ndim for ndim, _ in refs_info):
                 errors.append(ValidationError.ExtentDimensionMismatch)
 
-        refs_units = [get_dim_units(da) for da in tag.references]
-        if any(len(ru) != len(tag.units) for ru in refs_units):
+        refs_units = [ru for _, ru in refs_info]
+        if any(len(ru) != len(tag_units) for ru in refs_units):
             errors.append(ValidationError.ReferenceUnitsMismatch)
 
-        if not tag_units_match_refs_units(tag.units, refs_units):
+        if not tag_units_match_refs_units(tag_units, refs_units, cache):
             errors.append(ValidationError.ReferenceUnitsIncompatible)
 
-    if any(not units.is_si(u) for u in tag.units if u):
+    if any(not cache.unit_check(units.is_si, u) for u in tag_units if u):
         errors.append(ValidationError.InvalidUnit)
 
     for idx, feat in enumerate(tag.features):
@@ -288,7 +472,7 @@ def check_tag(tag):
     return errors, warnings
 
 
-def check_multi_tag(mtag):
+def check_multi_tag(mtag, cache=None):
     """
     Validate a MultiTag and its Features and return all errors and warnings.
     Errors and warnings about Features are included in the MultiTag errors and
@@ -301,37 +485,43 @@ def check_multi_tag(mtag):
 
     :returns: A list of 'errors' and a list of 'warnings'
     """
+    if cache is None:
+        cache = CheckCache()
     errors = check_entity(mtag)
     warnings = list()
 
-    if not mtag.positions:
+    positions = mtag.positions
+    mtag_units = mtag.units
+    if not positions:
         errors.append(ValidationError.NoPositions)
-    if mtag.references:
-        if len(mtag.positions.shape) == 1:
+    refs_info = [cache.array_info(da) for da in mtag.references]
+    if refs_info:
+        if len(positions.shape) == 1:
             posdim = 1
         else:
-            posdim = mtag.positions.shape[1]
+            posdim = positions.shape[1]
         # New error for len(mtag.positions.shape) > 2
-        if any(posdim != len(da.shape) for da in mtag.references):
+        if any(posdim != ndim for ndim, _ in refs_info):
             errors.append(ValidationError.PositionsDimensionMismatch)
-        if mtag.extents:
-            if mtag.positions.shape != mtag.extents.shape:
+        extents = mtag.extents
+        if extents:
+            if positions.shape != extents.shape:
                 errors.append(ValidationError.PositionsExtentsMismatch)
-            if len(mtag.extents.shape) == 1:
+            if len(extents.shape) == 1:
                 extdim = 1
             else:
-                extdim = mtag.extents.shape[1]
-            if any(extdim != len(da.shape) for da in mtag.references):
+                extdim = extents.shape[1]
+            if any(extdim != ndim for ndim, _ in refs_info):
                 errors.append(ValidationError.ExtentsDimensionMismatch)
 
-        refs_units = [get_dim_units(da) for da in mtag.references]
-        if any(len(ru) != len(mtag.units) for ru in refs_units):
+        refs_units = [ru for _, ru in refs_info]
+        if any(len(ru) != len(mtag_units) for ru in refs_units):
             errors.append(ValidationError.ReferenceUnitsMismatch)
 
-        if not tag_units_match_refs_units(mtag.units, refs_units):
+        if not tag_units_match_refs_units(mtag_units, refs_units, cache):
             errors.append(ValidationError.ReferenceUnitsIncompatible)
 
-    if any(not units.is_si(u) for u in mtag.units if u):
+    if any(not cache.unit_check(units.is_si, u) for u in mtag_units if u):
         errors.append(ValidationError.InvalidUnit)
 
     for idx, feat in enumerate(mtag.features):
@@ -406,21 +596,28 @@ def check_source(source):
     return errors, list()
 
 
-def check_range_dimension(dim, idx):
+def check_range_dimension(dim, idx, ticks=None, cache=None):
     """
     Validate a RangeDimension and return all errors and warnings.
 
+    :param ticks: The ticks of the dimension, if they have been read already.
+
     :returns: A list of 'errors' and a list of 'warnings'
     """
+    if cache is None:
+        cache = CheckCache()
     errors = list()
     warnings = list()
 
-    if not dim.ticks:
+    if ticks is None:
+        ticks = dim.ticks
+    if not ticks:
         errors.append(ValidationError.NoTicks.format(idx))
-    elif not all(ti < tj for ti, tj in zip(dim.ticks[:-1], dim.ticks[1:])):
+    elif not np.all(np.diff(ticks) > 0):
         errors.append(ValidationError.UnsortedTicks.format(idx))
 
-    if dim.unit and not units.is_atomic(dim.unit):
+    unit = dim.unit
+    if unit and not cache.unit_check(units.is_atomic, unit):
         errors.append(ValidationError.InvalidDimensionUnit.format(idx))
     return errors, warnings
 
@@ -434,22 +631,26 @@ def check_set_dimension():
     return list(), list()
 
 
-def check_sampled_dimension(dim, idx):
+def check_sampled_dimension(dim, idx, cache=None):
     """
     Validate a SampledDimension and return all errors and warnings.
 
     :returns: A list of 'errors' and a list of 'warnings'
     """
+    if cache is None:
+        cache = CheckCache()
     errors = list()
     warnings = list()
 
-    if not dim.sampling_interval:
+    interval = dim.sampling_interval
+    if not interval:
         errors.append(ValidationError.NoSamplingInterval.format(idx))
-    elif dim.sampling_interval < 0:
+    elif interval < 0:
         errors.append(ValidationError.InvalidSamplingInterval.format(idx))
 
-    if dim.unit:
-        if not units.is_atomic(dim.unit):
+    unit = dim.unit
+    if unit:
+        if not cache.unit_check(units.is_atomic, unit):
             errors.append(ValidationError.InvalidDimensionUnit.format(idx))
     else:
         if dim.offset:
@@ -487,11 +688,13 @@ def get_dim_units(data_array):
     return unit_list
 
 
-def tag_units_match_refs_units(tag_units, refs_units):
+def tag_units_match_refs_units(tag_units, refs_units, cache=None):
+    if cache is None:
+        cache = CheckCache()
     for ref_units in refs_units:
         for tag_unit, ref_unit in zip(tag_units, ref_units):
             if tag_unit == "" and ref_unit == "":
                 continue
-            if not units.scalable(tag_unit, ref_unit):
+            if not cache.unit_check(units.scalable, tag_unit, ref_unit):
                 return False
     return True
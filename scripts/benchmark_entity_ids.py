@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Time the instantiation of entities (100k by default) with the previous id
+validation through uuid.UUID, the current validation and in a trusted
+read-only file, where ids are not validated.
+
+Usage: python scripts/benchmark_entity_ids.py [number of entities]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from unittest import mock
+from uuid import UUID
+
+import nixio
+from nixio.util import util
+
+
+def uuid_is_uuid(id_str):
+    try:
+        UUID(str(id_str))
+        return True
+    except ValueError:
+        return False
+
+
+def make_file(path, count):
+    nf = nixio.File.open(path, nixio.FileMode.Overwrite)
+    blk = nf.create_block("bench", "benchmark")
+    for idx in range(count):
+        blk.create_group("group-{}".format(idx), "benchmark")
+    nf.close()
+
+
+def instantiate(path, total, trusted=False):
+    nf = nixio.File.open(path, nixio.FileMode.ReadOnly, trusted=trusted)
+    blk = nf.blocks[0]
+    h5groups = [group._h5group for group in blk.groups]
+    reps = total // len(h5groups)
+
+    def run():
+        for _ in range(reps):
+            for h5group in h5groups:
+                nixio.Group(nf, blk, h5group)
+
+    elapsed = min(timeit.repeat(run, number=1, repeat=3))
+    nf.close()
+    return elapsed
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bench.nix")
+        make_file(path, 1000)
+        with mock.patch.object(util, "is_uuid", uuid_is_uuid):
+            uuid = instantiate(path, total)
+        regex = instantiate(path, total)
+        trusted = instantiate(path, total, trusted=True)
+    print("instantiating {} entities".format(total))
+    print("  uuid.UUID validation: {:8.3f} s".format(uuid))
+    print("  regex validation:     {:8.3f} s".format(regex))
+    print("  trusted (no checks):  {:8.3f} s".format(trusted))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Measure the import time of the nixio package and the start up time of the
+nixio command line tool with `python -X importtime` and fail if the median
+exceeds the given threshold. Also checks that `import nixio` does not load
+h5py or the NIX entity modules.
+
+Usage: python scripts/benchmark_import.py [threshold in ms] [repetitions]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# modules that must only be loaded when NIX objects are used
+LAZY_MODULES = ("h5py", "nixio.file", "nixio.validator", "nixio.cmd.upgrade")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importtime(code):
+    """
+    Runs the code in a new interpreter and returns the cumulative import
+    times (in microseconds) of all imported modules and the total time spent
+    in imports.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          env=env, capture_output=True, text=True, check=True)
+    times = dict()
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            times[match.group(3)] = int(match.group(1))
+            if len(match.group(2)) == 1:
+                # top level import
+                total += int(match.group(1))
+    return times, total
+
+
+def median_ms(values):
+    return statistics.median(values) / 1000
+
+
+def main():
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    reps = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    loaded = [mod for mod in importtime("import nixio")[0] if mod in LAZY_MODULES]
+    package = median_ms([importtime("import nixio")[0]["nixio"] for _ in range(reps)])
+    # all imports made by the command line tool for --help, minus the imports
+    # of the interpreter start up
+    baseline = median_ms([importtime("pass")[1] for _ in range(reps)])
+    cli = median_ms([importtime("import sys; sys.argv = ['nixio', '--help']\n"
+                                "from nixio.cmd import main\n"
+                                "try:\n    main.main()\nexcept SystemExit:\n    pass")[1]
+                     for _ in range(reps)]) - baseline
+    print("median import time ({} runs)".format(reps))
+    print("  import nixio:          {:8.1f} ms".format(package))
+    print("  nixio --help:          {:8.1f} ms".format(cli))
+
+    failed = False
+    if loaded:
+        print("FAIL: import nixio loads {}".format(", ".join(loaded)))
+        failed = True
+    for name, value in (("nixio", package), ("nixio --help", cli)):
+        if value > threshold:
+            print("FAIL: imports of {} take longer than {} ms".format(name, threshold))
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Count the HDF5 (h5py) function calls made by Tag.tagged_data with and without
+the DataArray caches of the dataset handle, data extent and dtype.
+
+Usage: python scripts/benchmark_tagged_data.py [repetitions]
+"""
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+import nixio
+from nixio.data_array import DataArray
+from nixio.data_set import DataSet
+
+
+def make_file(path):
+    nf = nixio.File.open(path, nixio.FileMode.Overwrite)
+    blk = nf.create_block("bench", "benchmark")
+    da = blk.create_data_array("signal", "signal", data=np.random.random((1000, 8)))
+    da.append_sampled_dimension(0.001, label="time", unit="s")
+    da.append_set_dimension()
+    tag = blk.create_tag("tag", "event", position=[0.1, 0])
+    tag.extent = [0.2, 8]
+    tag.references.append(da)
+    return nf, tag
+
+
+def h5py_calls(tag, reps):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for _ in range(reps):
+        tag.tagged_data("signal")[:]
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+    return sum(stat[1] for func, stat in stats.stats.items()
+               if "h5py" in func[0])
+
+
+def main():
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as tmpdir:
+        nf, tag = make_file(os.path.join(tmpdir, "bench.nix"))
+        cached = h5py_calls(tag, reps)
+        with mock.patch.multiple(DataArray, _dataset=DataSet._dataset,
+                                 data_extent=DataSet.data_extent,
+                                 dtype=DataSet.dtype):
+            uncached = h5py_calls(tag, reps)
+        nf.close()
+    print("h5py calls per tagged_data")
+    print("  uncached: {:8.1f}".format(uncached / reps))
+    print("  cached:   {:8.1f}".format(cached / reps))
+
+
+if __name__ == "__main__":
+    main()